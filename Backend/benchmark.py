@@ -0,0 +1,393 @@
+"""
+API Load Test & Latency Benchmark
+=================================
+Drives user (and catalog) flows with configurable concurrency and reports
+p50/p95/p99 latency and throughput per route. Non-2xx responses count as
+errors, and latency and throughput cover successful requests only.
+
+Runs either against a live server (--url) or in-process against the ASGI
+app with an in-memory MongoDB stand-in (--in-process, needs the optional
+`mongomock-motor` package). Results can be saved as JSON and compared
+with a previous run to catch regressions.
+
+Examples:
+    python benchmark.py --in-process --concurrency 20 --duration 30
+    python benchmark.py --url http://localhost:8000 --output results.json
+    python benchmark.py --in-process --baseline results.json --max-regression 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+# ============================================================
+# RESULT RECORDING
+# ============================================================
+
+
+class Recorder:
+    """
+    Collects status codes per route, and latency samples of the successful
+    (2xx) requests only: a fast 429 or 5xx is an error, not a faster run
+    """
+
+    def __init__(self):
+        self.recording = False
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        # Non-2xx responses and transport failures
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(
+        self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs
+    ) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            if self.recording:
+                self.errors[route] += 1
+            return None
+        elapsed = time.perf_counter() - started
+        if self.recording:
+            self.statuses[route][response.status_code] += 1
+            if response.is_success:
+                self.latencies[route].append(elapsed)
+            else:
+                self.errors[route] += 1
+        return response
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, duration: float) -> dict:
+    routes = {}
+    for route in sorted(set(recorder.latencies) | set(recorder.errors)):
+        # Rates and percentiles cover successful requests only
+        samples = sorted(recorder.latencies.get(route, []))
+        errors = recorder.errors.get(route, 0)
+        requests = len(samples) + errors
+        routes[route] = {
+            "requests": requests,
+            "errors": errors,
+            "error_rate": errors / requests if requests else 0.0,
+            "statuses": {
+                str(code): count for code, count in recorder.statuses[route].items()
+            },
+            "throughput_rps": len(samples) / duration if duration else 0.0,
+            "p50_ms": percentile(samples, 0.50) * 1000,
+            "p95_ms": percentile(samples, 0.95) * 1000,
+            "p99_ms": percentile(samples, 0.99) * 1000,
+            "max_ms": (samples[-1] * 1000) if samples else 0.0,
+        }
+    return routes
+
+
+# ============================================================
+# SCENARIOS
+# ============================================================
+
+Scenario = Callable[[httpx.AsyncClient, Recorder], Awaitable[None]]
+
+
+async def user_flow(client: httpx.AsyncClient, recorder: Recorder) -> None:
+    """register -> login -> me -> update profile"""
+    email = f"bench_{uuid.uuid4().hex}@example.com"
+    password = "BenchPassword123!"
+    await recorder.request(
+        client,
+        "POST /users/register",
+        "POST",
+        "/users/register",
+        json={
+            "email": email,
+            "password": password,
+            "first_name": "Bench",
+            "last_name": "User",
+            "mobile_number": "9876543210",
+        },
+    )
+    response = await recorder.request(
+        client,
+        "POST /users/login",
+        "POST",
+        "/users/login",
+        json={"email": email, "password": password},
+    )
+    if response is None or response.status_code != 200:
+        return
+
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    await recorder.request(client, "GET /users/me", "GET", "/users/me", headers=headers)
+    await recorder.request(
+        client,
+        "PUT /users/me",
+        "PUT",
+        "/users/me",
+        headers=headers,
+        json={"first_name": "Benched"},
+    )
+
+
+async def catalog_flow(client: httpx.AsyncClient, recorder: Recorder) -> None:
+    """Read-heavy browsing: movie listing and schedule search"""
+    await recorder.request(
+        client,
+        "GET /movies/",
+        "GET",
+        "/movies/",
+        params={"status": "NOW_SHOWING"},
+    )
+    await recorder.request(
+        client,
+        "GET /showtimes/search",
+        "GET",
+        "/showtimes/search",
+        params={"city": "Pune"},
+    )
+
+
+# Add booking flows here as their endpoints land
+SCENARIOS: Dict[str, Scenario] = {
+    "user": user_flow,
+    "catalog": catalog_flow,
+}
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+
+async def run_workers(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    scenarios: List[Scenario],
+    concurrency: int,
+    seconds: float,
+) -> None:
+    deadline = time.perf_counter() + seconds
+
+    async def worker(worker_id: int):
+        turn = worker_id
+        while time.perf_counter() < deadline:
+            await scenarios[turn % len(scenarios)](client, recorder)
+            turn += 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+
+def setup_in_process_app():
+    """Point the app at an in-memory MongoDB stand-in, return the ASGI app"""
+    try:
+        import mongomock
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        sys.exit("--in-process needs mongomock-motor: pip install mongomock-motor")
+
+    from odmantic import AIOEngine
+    from core.apis.api import app
+    from core.database.database import db_instance
+    from commons.rate_limit import RateLimitMiddleware
+
+    # mongomock has no sessions; ODMantic only uses them for ordering
+    mongomock.ignore_feature("session")
+
+    class _NoSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def end_session(self):
+            pass
+
+    client = AsyncMongoMockClient()
+
+    async def start_session(*args, **kwargs):
+        return _NoSession()
+
+    client.start_session = start_session
+    db_instance.client = client
+    db_instance.engine = AIOEngine(client=client, database="benchmark")
+    db_instance.catalog_engine = db_instance.engine
+
+    # All workers share one client address, so the auth rate limiter would
+    # turn the run into a measurement of 429s; rebuild the stack without it
+    for middleware in app.user_middleware:
+        if middleware.cls is RateLimitMiddleware:
+            middleware.kwargs["enabled"] = False
+    app.middleware_stack = None
+    return app
+
+
+async def run(args) -> dict:
+    scenarios = [SCENARIOS[name] for name in args.scenarios]
+    if args.in_process:
+        app = setup_in_process_app()
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://benchmark"
+    else:
+        transport = None
+        base_url = args.url
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url=base_url,
+        limits=limits,
+        timeout=args.timeout,
+        follow_redirects=True,
+    ) as client:
+        recorder = Recorder()
+        if args.warmup > 0:
+            print(f"Warming up for {args.warmup}s...")
+            await run_workers(
+                client, recorder, scenarios, args.concurrency, args.warmup
+            )
+
+        print(f"Measuring for {args.duration}s with {args.concurrency} workers...")
+        recorder.recording = True
+        started = time.perf_counter()
+        await run_workers(client, recorder, scenarios, args.concurrency, args.duration)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "target": "in-process" if args.in_process else args.url,
+        "scenarios": args.scenarios,
+        "concurrency": args.concurrency,
+        "duration_seconds": elapsed,
+        "routes": summarize(recorder, elapsed),
+    }
+
+
+# ============================================================
+# REPORTING
+# ============================================================
+
+
+def print_report(results: dict) -> None:
+    print("=" * 104)
+    print(
+        f"{'ROUTE':28} {'REQS':>7} {'ERR':>5} {'ERR%':>7} {'RPS':>9} "
+        f"{'P50 ms':>9} {'P95 ms':>9} {'P99 ms':>9} {'MAX ms':>9}"
+    )
+    print("-" * 104)
+    for route, stats in results["routes"].items():
+        print(
+            f"{route:28} {stats['requests']:>7} {stats['errors']:>5} "
+            f"{stats['error_rate']:>7.1%} "
+            f"{stats['throughput_rps']:>9.1f} {stats['p50_ms']:>9.2f} "
+            f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}"
+        )
+    print("=" * 104)
+
+
+def compare(
+    results: dict,
+    baseline: dict,
+    max_regression: float,
+    max_error_increase: float = 0.01,
+) -> bool:
+    """
+    Print p95/throughput/error rate deltas; False if any route regressed too
+    much, got more errors, or is no longer reached at all
+    """
+    ok = True
+    print(f"\nComparison with baseline from {baseline.get('timestamp', '?')}:")
+    base_routes = baseline.get("routes", {})
+    for route in sorted(set(results["routes"]) | set(base_routes)):
+        stats = results["routes"].get(route)
+        base = base_routes.get(route)
+        if stats is None:
+            ok = False
+            print(f"  {route:28} not reached  REGRESSION")
+            continue
+
+        error_change = stats["error_rate"] - (base or {}).get("error_rate", 0.0)
+        errors_regressed = error_change > max_error_increase
+        if not base or not base["p95_ms"] or not base["throughput_rps"]:
+            ok = ok and not errors_regressed
+            print(
+                f"  {route:28} (no baseline)  err {error_change:+7.1%}"
+                f"{'  REGRESSION' if errors_regressed else ''}"
+            )
+            continue
+
+        p95_change = stats["p95_ms"] / base["p95_ms"] - 1
+        rps_change = stats["throughput_rps"] / base["throughput_rps"] - 1
+        regressed = (
+            p95_change > max_regression
+            or rps_change < -max_regression
+            or errors_regressed
+        )
+        ok = ok and not regressed
+        print(
+            f"  {route:28} p95 {p95_change:+7.1%}  rps {rps_change:+7.1%}"
+            f"  err {error_change:+7.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default="http://localhost:8000")
+    target.add_argument("--in-process", action="store_true")
+    parser.add_argument(
+        "--scenarios", nargs="+", default=["user"], choices=sorted(SCENARIOS)
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.10,
+        help="allowed p95/throughput change vs baseline (0.10 = 10%%)",
+    )
+    parser.add_argument(
+        "--max-error-increase",
+        type=float,
+        default=0.01,
+        help="allowed rise of the error rate vs baseline (0.01 = 1 point)",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if not compare(
+            results, baseline, args.max_regression, args.max_error_increase
+        ):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,16 @@ Handles JWT token generation, validation, and user authentication.
 You can replace this code with your own authentication implementation.
 """
 
+import hashlib
+import hmac
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, Header, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # ============================================================
@@ -19,6 +24,9 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 SECRET_KEY = "your-super-secret-key-change-this-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+# Shared secret the payment gateway sends with its callbacks
+PAYMENT_WEBHOOK_SECRET = os.getenv("PAYMENT_WEBHOOK_SECRET")
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -42,6 +50,75 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# ============================================================
+# VERIFIED TOKEN CACHE
+# ============================================================
+
+
+class TokenCache:
+    """
+    Bounded LRU of already verified JWT payloads.
+
+    Keyed by the SHA-256 digest of the token so raw tokens are never kept
+    in memory. Entries are dropped once the token's `exp` has passed, so a
+    cached token is never accepted for longer than jwt.decode would.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        payload, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(payload)
+
+    def put(self, token: str, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or self.max_size <= 0:
+            return  # tokens without an expiry are not cached
+
+        key = self._key(token)
+        self._entries[key] = (dict(payload), expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache()
+
+
 # ============================================================
 # JWT TOKEN UTILITIES
 # ============================================================
@@ -75,6 +152,8 @@ def decode_token(token: str) -> dict:
     """
     Decode and validate a JWT token
 
+    Already verified tokens are served from `token_cache` until they expire.
+
     Args:
         token: JWT token string
 
@@ -84,9 +163,12 @@ def decode_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -94,6 +176,9 @@ def decode_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    token_cache.put(token, payload)
+    return payload
+
 
 # ============================================================
 # AUTHENTICATION DEPENDENCIES
@@ -136,6 +221,43 @@ def require_admin(user: dict = Depends(get_current_user)) -> dict:
     return user
 
 
+def require_theater_owner(user: dict = Depends(get_current_user)) -> dict:
+    """
+    Dependency to require a theater owner (or admin) role
+
+    Usage in routes:
+        @router.post("/schedule")
+        async def schedule(user: dict = Depends(require_theater_owner)):
+            return {"owner": user}
+    """
+    if str(user.get("role", "")).upper() not in ("THEATER_OWNER", "ADMIN"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Theater owner access required",
+        )
+    return user
+
+
+def require_webhook_secret(x_webhook_secret: Optional[str] = Header(None)) -> None:
+    """
+    Dependency to authenticate payment gateway callbacks
+
+    Usage in routes:
+        @router.post("/callback", dependencies=[Depends(require_webhook_secret)])
+    """
+    if not PAYMENT_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Payment webhooks are not configured",
+        )
+    if not x_webhook_secret or not hmac.compare_digest(
+        x_webhook_secret, PAYMENT_WEBHOOK_SECRET
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid webhook secret"
+        )
+
+
 # ============================================================
 # HELPER FUNCTIONS
 # ============================================================
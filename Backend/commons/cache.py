@@ -0,0 +1,132 @@
+"""
+Cache Module
+============
+Size-bounded LRU cache with per-entry TTL and hit/miss metrics.
+
+`get_or_load` collapses concurrent misses for the same key into a single
+loader call, so a cold key under load only hits MongoDB once.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache whose entries also expire `ttl_seconds` after being stored"""
+
+    def __init__(self, name: str, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Future] = {}
+        # Bumped on every invalidation so in-flight loads don't store stale data
+        self._generation = 0
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        self._generation += 1
+        self._loading.pop(key, None)
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._loading.clear()
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        none_ttl_seconds: Optional[float] = None,
+    ) -> Any:
+        """
+        Return the cached value, or load, cache and return it
+
+        A None result (nothing found) is kept for `none_ttl_seconds` when
+        given, instead of the cache's TTL.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Another request is already loading this key, wait for its result
+        pending = self._loading.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+            # The loading request was cancelled, not this one: load it here
+            return await self.get_or_load(key, loader, none_ttl_seconds)
+
+        generation = self._generation
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            # Waiters must never hang, hand them the error or the cancellation
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+
+        if generation == self._generation:
+            self.set(key, value, none_ttl_seconds if value is None else None)
+        future.set_result(value)
+        return value
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
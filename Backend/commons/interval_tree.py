@@ -0,0 +1,114 @@
+"""
+Interval Tree Module
+====================
+Augmented AVL tree of half-open intervals [start, end).
+
+Nodes are ordered by start and carry the largest end in their subtree, so
+finding every interval that overlaps a query skips whole subtrees that end
+before it begins. Insert and overlap checks are O(log n) (+ number of hits).
+"""
+
+from typing import Any, Generic, List, Optional, TypeVar
+
+K = TypeVar("K")
+
+
+class _Node:
+    __slots__ = ("start", "end", "value", "max_end", "height", "left", "right")
+
+    def __init__(self, start, end, value):
+        self.start = start
+        self.end = end
+        self.value = value
+        self.max_end = end
+        self.height = 1
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+
+def _height(node: Optional[_Node]) -> int:
+    return node.height if node else 0
+
+
+def _update(node: _Node) -> None:
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.max_end = node.end
+    if node.left and node.left.max_end > node.max_end:
+        node.max_end = node.left.max_end
+    if node.right and node.right.max_end > node.max_end:
+        node.max_end = node.right.max_end
+
+
+def _rotate_right(node: _Node) -> _Node:
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _rotate_left(node: _Node) -> _Node:
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _balance(node: _Node) -> _Node:
+    _update(node)
+    skew = _height(node.left) - _height(node.right)
+    if skew > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if skew < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
+
+
+class IntervalTree(Generic[K]):
+    """Set of [start, end) intervals, each carrying a value"""
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, start: K, end: K, value: Any = None) -> None:
+        if not start < end:
+            raise ValueError("Interval start must be before its end")
+        self._root = self._insert(self._root, _Node(start, end, value))
+        self._size += 1
+
+    def _insert(self, node: Optional[_Node], new: _Node) -> _Node:
+        if node is None:
+            return new
+        if new.start < node.start:
+            node.left = self._insert(node.left, new)
+        else:
+            node.right = self._insert(node.right, new)
+        return _balance(node)
+
+    def overlaps(self, start: K, end: K) -> List[Any]:
+        """Values of every interval overlapping [start, end), by start"""
+        found: List[Any] = []
+        self._search(self._root, start, end, found)
+        return found
+
+    def _search(self, node: Optional[_Node], start, end, found: List[Any]) -> None:
+        # Nothing in this subtree ends after the query starts
+        if node is None or node.max_end <= start:
+            return
+        self._search(node.left, start, end, found)
+        if node.start < end:
+            if node.end > start:
+                found.append(node.value)
+            # Right subtree starts later still, only worth it if we're not past end
+            self._search(node.right, start, end, found)
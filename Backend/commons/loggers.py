@@ -1,35 +1,128 @@
+"""
+Logging Module
+==============
+Non-blocking logging shared by every module.
+
+Loggers only push records onto an in-memory queue (QueueHandler). A single
+background QueueListener thread formats them and writes to the rotating
+file, so disk I/O never runs on the event loop.
+
+Configuration (environment variables):
+    APP_ENV:              "production" defaults the level to INFO, else DEBUG
+    LOG_LEVEL:            explicit level, overrides APP_ENV (e.g. WARNING)
+    LOG_DIR:              directory for log files (default: logs)
+    LOG_ROTATION:         "size" (default) or "time"
+    LOG_MAX_BYTES:        size-based rotation threshold (default: 10 MB)
+    LOG_ROTATE_WHEN:      time-based rotation interval (default: midnight)
+    LOG_BACKUP_COUNT:     rotated files to keep (default: 5)
+    LOG_INFO_SAMPLE_RATE: fraction of INFO records kept, 0.0-1.0 (default: 1.0)
+"""
+
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import random
+import threading
+
+APP_ENV = os.getenv("APP_ENV", "development")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO" if APP_ENV == "production" else "DEBUG")
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
+
+LOG_FORMAT = (
+    "[pid=%(process)s] - [%(asctime)s] - [%(name)s] - [%(levelname)s] - [%(message)s]"
+)
+
+
+class InfoSamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO records; other levels always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.INFO or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
 
 
 def get_file_handler(
-    log_name: str, mode: int, formatter: logging.Formatter, save_path: str = "logs"
+    log_name: str, mode: int, formatter: logging.Formatter, save_path: str = LOG_DIR
 ):
     os.makedirs(save_path, exist_ok=True)
-    # file logs
-    file_handler = logging.FileHandler(
-        filename=os.path.join(save_path, log_name), mode="a"
-    )
+    filename = os.path.join(save_path, log_name)
+    # file logs, rotated by time or size
+    if LOG_ROTATION == "time":
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            filename=filename, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT
+        )
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename=filename,
+            mode="a",
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+        )
     file_handler.setLevel(mode)
     file_handler.setFormatter(formatter)
     return file_handler
 
 
-def config_logger(logger: logging.Logger, debug_mode: bool = True):
-    formatter = logging.Formatter(
-        "[pid=%(process)s] - [%(asctime)s] - [%(name)s] - [%(levelname)s] - [%(message)s]"
-    )
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(formatter)
+class _Pipeline:
+    # Shared queue, the handler loggers write to, and the writer thread
+    queue_handler: logging.handlers.QueueHandler | None = None
+    listener: logging.handlers.QueueListener | None = None
+    lock = threading.Lock()
 
-    debug_logger = get_file_handler(
-        log_name="debug.log", mode=logging.DEBUG, formatter=formatter
-    )
 
-    logger.addHandler(debug_logger)
+_pipeline = _Pipeline()
+
+
+def _get_queue_handler() -> logging.handlers.QueueHandler:
+    # Build the pipeline once per process, on first use
+    with _pipeline.lock:
+        if _pipeline.queue_handler is None:
+            formatter = logging.Formatter(LOG_FORMAT)
+            debug_logger = get_file_handler(
+                log_name="debug.log", mode=logging.DEBUG, formatter=formatter
+            )
+
+            log_queue = queue.SimpleQueue()
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.addFilter(InfoSamplingFilter(LOG_INFO_SAMPLE_RATE))
+
+            _pipeline.listener = logging.handlers.QueueListener(
+                log_queue, debug_logger, respect_handler_level=True
+            )
+            _pipeline.listener.start()
+            _pipeline.queue_handler = queue_handler
+            atexit.register(stop_logging)
+    return _pipeline.queue_handler
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    with _pipeline.lock:
+        if _pipeline.listener is not None:
+            _pipeline.listener.stop()
+            _pipeline.listener = None
+            _pipeline.queue_handler = None
+
+
+def config_logger(logger: logging.Logger, debug_mode: bool = True):
+    queue_handler = _get_queue_handler()
+    # Attach the handler only once, however many times logger() is called
+    if queue_handler not in logger.handlers:
+        logger.addHandler(queue_handler)
 
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LOG_LEVEL)
     return logger
 
 
@@ -0,0 +1,354 @@
+"""
+Metrics Module
+==============
+Request and database instrumentation, exported in Prometheus text format.
+
+    http_requests_in_flight                         gauge
+    http_request_duration_seconds{route,method}     histogram
+    http_responses_total{route,method,status}       counter
+    mongodb_command_duration_seconds{collection,command}  histogram
+    mongodb_command_failures_total{collection,command}    counter
+    mongodb_pool_wait_seconds                       histogram
+
+Each label combination gets its series the first time it is seen; after
+that a request only does a tuple lookup, a bisect into the pre-allocated
+bucket list and a few integer increments. Route labels are path templates
+("/bookings/{booking_id}"), never raw paths, so cardinality stays bounded.
+
+MongoDB listeners run on PyMongo's threads, so the database metrics are
+updated under a lock; HTTP metrics are only touched on the event loop.
+
+Other components (caches, worker pools, background services) are exported
+as gauges named <component>_<field> through register_collector.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.routing import compile_path
+
+# Upper bounds (seconds), +Inf is implicit
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 2.0)
+
+# Route label for requests that matched no route (kept out of the route space)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """One histogram series with fixed buckets (counts are non-cumulative)"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: tuple) -> str:
+    return ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class HistogramFamily:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...], bounds):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.bounds = tuple(bounds)
+        self._series: Dict[tuple, Histogram] = {}
+        self._bound_labels = [_format(bound) for bound in self.bounds] + ["+Inf"]
+
+    def series(self, *values) -> Histogram:
+        histogram = self._series.get(values)
+        if histogram is None:
+            histogram = self._series.setdefault(values, Histogram(self.bounds))
+        return histogram
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        for values, histogram in list(self._series.items()):
+            labels = _labels(self.labels, values)
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self._bound_labels, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}'
+                )
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {_format(histogram.sum)}")
+            lines.append(f"{self.name}_count{suffix} {histogram.count}")
+
+
+class CounterFamily:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: Dict[tuple, int] = {}
+
+    def inc(self, *values) -> None:
+        self.values[values] = self.values.get(values, 0) + 1
+
+    def render(self, lines: List[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} counter")
+        for values, count in list(self.values.items()):
+            lines.append(f"{self.name}{{{_labels(self.labels, values)}}} {count}")
+
+
+class Metrics:
+    def __init__(self):
+        self.http_in_flight = 0
+        self.http_duration = HistogramFamily(
+            "http_request_duration_seconds",
+            "HTTP request latency by route template",
+            ("route", "method"),
+            HTTP_BUCKETS,
+        )
+        self.http_responses = CounterFamily(
+            "http_responses_total",
+            "HTTP responses by route template and status code",
+            ("route", "method", "status"),
+        )
+
+        self.db_lock = threading.Lock()
+        self.db_duration = HistogramFamily(
+            "mongodb_command_duration_seconds",
+            "MongoDB command round-trip time",
+            ("collection", "command"),
+            DB_BUCKETS,
+        )
+        self.db_failures = CounterFamily(
+            "mongodb_command_failures_total",
+            "MongoDB commands that returned an error",
+            ("collection", "command"),
+        )
+        self.pool_wait = HistogramFamily(
+            "mongodb_pool_wait_seconds",
+            "Time spent waiting for a pooled connection",
+            (),
+            POOL_WAIT_BUCKETS,
+        )
+
+        self._collectors: Dict[str, Callable[[], dict]] = {}
+
+    def preallocate_routes(self, paths: dict) -> None:
+        """Create latency series up front, from OpenAPI `paths`"""
+        for path, operations in paths.items():
+            for method in operations:
+                self.http_duration.series(path, method.upper())
+
+    def register_collector(self, component: str, collect: Callable[[], dict]):
+        """Export the numeric fields of collect() as <component>_<field> gauges"""
+        self._collectors[component] = collect
+
+    def render(self) -> str:
+        lines = [
+            "# HELP http_requests_in_flight HTTP requests being served",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.http_in_flight}",
+        ]
+        self.http_duration.render(lines)
+        self.http_responses.render(lines)
+        with self.db_lock:
+            self.db_duration.render(lines)
+            self.db_failures.render(lines)
+            self.pool_wait.render(lines)
+
+        for component, collect in self._collectors.items():
+            for field, value in collect().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{component}_{field}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request"""
+
+    def __init__(self, app, registry: Optional[Metrics] = None):
+        self.app = app
+        self.metrics = registry or metrics
+        # id(route) -> full path template, see _route_template (routes live
+        # as long as the app, so their ids are stable)
+        self._templates: Dict[int, str] = {}
+        # (path regex, template, methods) of the app, see _resolve_template
+        self._patterns: Optional[List[tuple]] = None
+
+    def _route_template(self, scope) -> str:
+        """
+        Full path template of the matched route. Routes of included routers
+        may only know their path below the router prefix, so the prefix is
+        taken from the request path once per route and cached.
+        """
+        route = scope.get("route")
+        template = self._templates.get(id(route))
+        if template is not None:
+            return template
+        path = getattr(route, "path", None)
+        if path is None:
+            return self._resolve_template(scope)
+
+        depth = len([part for part in path.split("/") if part])
+        segments = scope["path"].rstrip("/").split("/")
+        prefix = "/".join(segments[: len(segments) - depth])
+        template = prefix + path
+        self._templates[id(route)] = template
+        return template
+
+    def _resolve_template(self, scope) -> str:
+        """
+        Template for a request answered before routing, e.g. throttled by the
+        rate limiter: matched against the app's OpenAPI paths, the same
+        templates preallocate_routes uses
+        """
+        app = scope.get("app")
+        if app is None or not hasattr(app, "openapi"):
+            return UNMATCHED_ROUTE
+        if self._patterns is None:
+            self._patterns = [
+                (compile_path(path)[0], path, {method.upper() for method in ops})
+                for path, ops in app.openapi()["paths"].items()
+            ]
+
+        template = UNMATCHED_ROUTE
+        for regex, path, methods in self._patterns:
+            if regex.match(scope["path"]):
+                if scope["method"] in methods:
+                    return path
+                # Keep looking for an exact method match, like the router
+                if template is UNMATCHED_ROUTE:
+                    template = path
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metrics = self.metrics
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.http_in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.http_in_flight -= 1
+            path = self._route_template(scope)
+            method = scope["method"]
+            metrics.http_duration.series(path, method).observe(elapsed)
+            metrics.http_responses.inc(path, method, status_code)
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Per collection/command MongoDB timings"""
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        # request id -> (collection, command) while a command is running
+        self._running: Dict[Tuple[int, int], Tuple[str, str]] = {}
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = ""
+        self._running[(event.request_id, event.operation_id)] = (
+            collection,
+            event.command_name,
+        )
+
+    def _finish(self, event, failed: bool):
+        labels = self._running.pop((event.request_id, event.operation_id), None)
+        if labels is None:
+            return
+        with self.metrics.db_lock:
+            self.metrics.db_duration.series(*labels).observe(
+                event.duration_micros / 1e6
+            )
+            if failed:
+                self.metrics.db_failures.inc(*labels)
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Connection check-out wait times (only check-outs are recorded)"""
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self._histogram = metrics.pool_wait.series()
+
+    def connection_checked_out(self, event):
+        with self.metrics.db_lock:
+            self._histogram.observe(event.duration)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+# Shared registry for the API process
+metrics = Metrics()
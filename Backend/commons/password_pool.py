@@ -0,0 +1,139 @@
+"""
+Password Worker Pool
+====================
+Runs bcrypt hashing and verification outside the event loop.
+
+bcrypt costs ~100-300 ms of CPU per call. Running it inside an async
+handler stalls every other request on the worker, so password work is
+submitted to a bounded thread or process pool instead. When the pool and
+its queue are full, requests fail fast with 503 instead of piling up.
+
+Configuration (environment variables):
+    PASSWORD_POOL_KIND:      "thread" (default) or "process"
+    PASSWORD_POOL_WORKERS:   number of workers (default: min(4, CPU count))
+    PASSWORD_POOL_MAX_QUEUE: jobs allowed to wait for a worker (default: 64)
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+
+from commons.auth import get_password_hash, verify_password
+
+PASSWORD_POOL_KIND = os.getenv("PASSWORD_POOL_KIND", "thread")
+PASSWORD_POOL_WORKERS = int(
+    os.getenv("PASSWORD_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_POOL_MAX_QUEUE = int(os.getenv("PASSWORD_POOL_MAX_QUEUE", "64"))
+
+
+class PasswordWorkerPool:
+    """
+    Bounded executor for password hashing.
+
+    At most `workers + max_queue` jobs are accepted at a time; anything
+    beyond that is rejected with HTTP 503 and a Retry-After header.
+    """
+
+    def __init__(
+        self,
+        kind: str = PASSWORD_POOL_KIND,
+        workers: int = PASSWORD_POOL_WORKERS,
+        max_queue: int = PASSWORD_POOL_MAX_QUEUE,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password pool kind: {kind}")
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+
+        # Metrics
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.submitted_total = 0
+        self.completed_total = 0
+        self.rejected_total = 0
+        self.busy_seconds_total = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing this module never spawns workers
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password"
+                )
+        return self._executor
+
+    async def run(self, func: Callable, *args):
+        """
+        Run a password function in the pool
+
+        Raises:
+            HTTPException: 503 if the pool is saturated
+        """
+        if self.in_flight >= self.capacity:
+            self.rejected_total += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again",
+                headers={"Retry-After": "1"},
+            )
+
+        self.in_flight += 1
+        self.submitted_total += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed_total += 1
+            self.busy_seconds_total += time.perf_counter() - started
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def metrics(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "submitted_total": self.submitted_total,
+            "completed_total": self.completed_total,
+            "rejected_total": self.rejected_total,
+            "avg_seconds": (
+                self.busy_seconds_total / self.completed_total
+                if self.completed_total
+                else 0.0
+            ),
+        }
+
+
+# Shared pool used by the user flows
+password_pool = PasswordWorkerPool()
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the worker pool"""
+    return await password_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash in the worker pool"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
@@ -0,0 +1,354 @@
+"""
+Rate Limit Module
+=================
+Token-bucket throttling for the authentication endpoints.
+
+Login, registration and password reset requests cost a bcrypt hash or a
+database write each, so a credential-stuffing burst can saturate every
+worker. RateLimitMiddleware checks two buckets before the request reaches
+its route (and so before any hashing):
+
+    per client IP:          RATE_LIMIT_IP_PER_MINUTE, bursts of RATE_LIMIT_IP_BURST
+    per email (from body):  RATE_LIMIT_EMAIL_PER_MINUTE, bursts of
+                            RATE_LIMIT_EMAIL_BURST
+
+and answers 429 with a Retry-After header when either is empty. Email
+buckets are kept per endpoint, so failed logins don't block a password
+reset. Auth payloads are tiny, so a body over MAX_INSPECTED_BODY is
+answered 413 instead of skipping the email check (padding the JSON must
+not dodge the per-email bucket). Throttled and refused requests are
+exported as `rate_limit_*` gauges.
+
+Buckets live in a pluggable backend:
+    memory: per-process, sharded dictionaries with LRU eviction. Every
+            operation is synchronous on the event loop, so no locks are
+            needed; shards keep eviction cheap and bounded.
+    mongo:  shared by all workers, one atomic find_one_and_update per check
+            (see MongoRateLimitBackend).
+
+Configuration (environment variables):
+    RATE_LIMIT_ENABLED:          "false" disables throttling (default: true)
+    RATE_LIMIT_BACKEND:          "memory" (default) or "mongo"
+    RATE_LIMIT_IP_PER_MINUTE:    sustained requests per IP (default: 30)
+    RATE_LIMIT_IP_BURST:         bucket size per IP (default: 10)
+    RATE_LIMIT_EMAIL_PER_MINUTE: sustained requests per email (default: 5)
+    RATE_LIMIT_EMAIL_BURST:      bucket size per email (default: 5)
+    RATE_LIMIT_TRUST_FORWARDED:  use X-Forwarded-For as the client IP, only
+                                 behind a proxy that sets it (default: false)
+    RATE_LIMIT_MAX_KEYS:         buckets kept in memory (default: 100000)
+    RATE_LIMIT_SHARDS:           memory backend shards (default: 16)
+"""
+
+import json
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from commons.loggers import logger
+from commons.metrics import metrics
+
+logging = logger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("RATE_LIMIT_IP_PER_MINUTE", "30"))
+RATE_LIMIT_IP_BURST = float(os.getenv("RATE_LIMIT_IP_BURST", "10"))
+RATE_LIMIT_EMAIL_PER_MINUTE = float(os.getenv("RATE_LIMIT_EMAIL_PER_MINUTE", "5"))
+RATE_LIMIT_EMAIL_BURST = float(os.getenv("RATE_LIMIT_EMAIL_BURST", "5"))
+RATE_LIMIT_TRUST_FORWARDED = (
+    os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false").lower() == "true"
+)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_SHARDS = int(os.getenv("RATE_LIMIT_SHARDS", "16"))
+
+# Larger bodies on the throttled paths are refused with a 413
+MAX_INSPECTED_BODY = 64 * 1024
+
+
+class Bucket:
+    """Token bucket settings: `burst` tokens, refilled at `rate` per second"""
+
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, per_minute: float, burst: float):
+        self.rate = per_minute / 60
+        self.burst = burst
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets"""
+
+    @abstractmethod
+    async def take(self, key: str, bucket: Bucket, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from the bucket at `key`
+
+        Returns:
+            0 when allowed, otherwise the seconds until enough tokens refill
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(
+        self, max_keys: int = RATE_LIMIT_MAX_KEYS, shards: int = RATE_LIMIT_SHARDS
+    ):
+        self.shard_size = max(1, max_keys // shards)
+        # key -> (tokens, updated at); least recently used first
+        self._shards: List[OrderedDict] = [OrderedDict() for _ in range(shards)]
+        self.evictions = 0
+
+    def take_now(
+        self, key: str, bucket: Bucket, cost: float = 1.0, now: Optional[float] = None
+    ) -> float:
+        now = time.monotonic() if now is None else now
+        shard = self._shards[hash(key) % len(self._shards)]
+        state = shard.get(key)
+        if state is None:
+            tokens = bucket.burst
+            if len(shard) >= self.shard_size:
+                shard.popitem(last=False)
+                self.evictions += 1
+        else:
+            tokens = min(bucket.burst, state[0] + (now - state[1]) * bucket.rate)
+            shard.move_to_end(key)
+
+        if tokens >= cost:
+            shard[key] = (tokens - cost, now)
+            return 0.0
+        shard[key] = (tokens, now)
+        return (cost - tokens) / bucket.rate
+
+    async def take(self, key: str, bucket: Bucket, cost: float = 1.0) -> float:
+        return self.take_now(key, bucket, cost)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
+class MongoRateLimitBackend(RateLimitBackend):
+    """
+    Buckets shared by every worker, one document per key.
+
+    Refill, check and debit happen in a single pipeline update, so
+    concurrent workers never double-spend a token. Idle buckets are removed
+    by a TTL index once they would be full again.
+    """
+
+    def __init__(self, collection: Callable):
+        # Called on use, the database connects after the app is built
+        self._collection = collection
+        self._indexed = False
+
+    async def take(self, key: str, bucket: Bucket, cost: float = 1.0) -> float:
+        collection = self._collection()
+        if not self._indexed:
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+            self._indexed = True
+
+        now = datetime.utcnow()
+        elapsed = {"$divide": [{"$subtract": [now, "$updated_at"]}, 1000]}
+        doc = await collection.find_one_and_update(
+            {"_id": key},
+            [
+                {
+                    "$set": {
+                        "tokens": {
+                            "$cond": [
+                                {"$eq": [{"$type": "$tokens"}, "missing"]},
+                                bucket.burst,
+                                {
+                                    "$min": [
+                                        bucket.burst,
+                                        {
+                                            "$add": [
+                                                "$tokens",
+                                                {"$multiply": [elapsed, bucket.rate]},
+                                            ]
+                                        },
+                                    ]
+                                },
+                            ]
+                        }
+                    }
+                },
+                {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+                {
+                    "$set": {
+                        "tokens": {
+                            "$cond": [
+                                "$allowed",
+                                {"$subtract": ["$tokens", cost]},
+                                "$tokens",
+                            ]
+                        },
+                        "updated_at": now,
+                        "expires_at": now
+                        + timedelta(seconds=bucket.burst / bucket.rate),
+                    }
+                },
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc["allowed"]:
+            return 0.0
+        return (cost - doc["tokens"]) / bucket.rate
+
+
+def _client_ip(scope: dict) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _email(body: bytes) -> Optional[str]:
+    try:
+        email = json.loads(body).get("email")
+    except (ValueError, AttributeError):
+        return None
+    if not isinstance(email, str) or not email:
+        return None
+    return email.strip().lower()
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware throttling POSTs to the given paths
+
+    Args:
+        paths: path -> bucket name (email buckets are kept per name)
+    """
+
+    def __init__(
+        self,
+        app,
+        paths: Dict[str, str],
+        backend: RateLimitBackend,
+        ip_bucket: Optional[Bucket] = None,
+        email_bucket: Optional[Bucket] = None,
+        enabled: bool = RATE_LIMIT_ENABLED,
+    ):
+        self.app = app
+        self.paths = paths
+        self.backend = backend
+        self.ip_bucket = ip_bucket or Bucket(
+            RATE_LIMIT_IP_PER_MINUTE, RATE_LIMIT_IP_BURST
+        )
+        self.email_bucket = email_bucket or Bucket(
+            RATE_LIMIT_EMAIL_PER_MINUTE, RATE_LIMIT_EMAIL_BURST
+        )
+        self.enabled = enabled
+
+        # Metrics
+        self.limited_total = 0
+        self.too_large_total = 0
+        metrics.register_collector("rate_limit", self.metrics)
+
+    async def __call__(self, scope, receive, send):
+        name = None
+        if self.enabled and scope["type"] == "http" and scope["method"] == "POST":
+            name = self.paths.get(scope["path"].rstrip("/"))
+        if name is None:
+            return await self.app(scope, receive, send)
+
+        wait = await self._check(f"ip:{_client_ip(scope)}", self.ip_bucket)
+        if wait:
+            return await self._reject(send, wait)
+
+        # Buffer the body to find the email, then hand it on unchanged
+        body, messages = await self._read_body(scope, receive)
+        if body is None:
+            self.too_large_total += 1
+            return await self._respond(send, 413, "Request body too large")
+        email = _email(body)
+        if email:
+            wait = await self._check(f"{name}:email:{email}", self.email_bucket)
+            if wait:
+                return await self._reject(send, wait)
+
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+    async def _check(self, key: str, bucket: Bucket) -> float:
+        try:
+            return await self.backend.take(key, bucket)
+        except Exception as e:
+            # A broken shared store must not lock everyone out
+            logging.warning(f"Rate limit backend failed, allowing request: {e}")
+            return 0.0
+
+    async def _read_body(self, scope, receive) -> Tuple[Optional[bytes], List[dict]]:
+        """(body or None if too large, messages to replay)"""
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit():
+                if int(value) > MAX_INSPECTED_BODY:
+                    return None, []
+        messages, chunks, size = [], [], 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                # Client went away, the route sees the disconnect
+                return b"", messages
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > MAX_INSPECTED_BODY:
+                return None, messages
+            if not message.get("more_body", False):
+                return b"".join(chunks), messages
+
+    async def _reject(self, send, wait: float) -> None:
+        self.limited_total += 1
+        retry_after = str(max(1, math.ceil(wait)))
+        await self._respond(
+            send,
+            429,
+            "Too many requests, please try again later",
+            [(b"retry-after", retry_after.encode())],
+        )
+
+    async def _respond(
+        self, send, status: int, detail: str, headers: Optional[list] = None
+    ) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json"), *(headers or [])],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": json.dumps({"detail": detail}).encode(),
+            }
+        )
+
+    def metrics(self) -> dict:
+        return {
+            "limited_total": self.limited_total,
+            "too_large_total": self.too_large_total,
+        }
+
+
+def create_backend(collection: Optional[Callable] = None) -> RateLimitBackend:
+    """Backend named by RATE_LIMIT_BACKEND ("mongo" needs a collection getter)"""
+    if RATE_LIMIT_BACKEND == "mongo":
+        if collection is None:
+            raise ValueError("The mongo rate limit backend needs a collection")
+        return MongoRateLimitBackend(collection)
+    return MemoryRateLimitBackend()
@@ -0,0 +1,22 @@
+"""
+Responses Module
+================
+JSON response rendered with orjson.
+
+Handlers that already hold plain data (e.g. documents projected straight
+from MongoDB) return this instead of going through response_model
+validation and serialization. orjson encodes datetimes and enums natively,
+so the payload is built and encoded in a single pass.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
@@ -2,20 +2,69 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.apis.routers.user_router import user_router
-from core.database.database import connect_to_mongo, close_mongo_connection
+from core.apis.routers.health_router import health_router
+from core.apis.routers.showtime_router import showtime_router
+from core.apis.routers.movie_router import movie_router
+from core.apis.routers.booking_router import booking_router
+from core.apis.routers.payment_router import payment_router
+from core.apis.routers.metrics_router import metrics_router
+from core.apis.routers.import_router import import_router
+from core.apis.routers.report_router import report_router
+from core.database.database import (
+    connect_to_mongo,
+    close_mongo_connection,
+    get_engine,
+)
+from core.database.indexes import ensure_indexes
+from core.services.hold_expiry import hold_expiry_scheduler
+from core.services.schedule_index import schedule_index
+from core.services.payment_confirmation import payment_confirmation_pipeline
+from core.services.revenue_rollup import revenue_rollups
+from commons.password_pool import password_pool
+from commons.metrics import MetricsMiddleware, metrics
+from commons.rate_limit import RateLimitMiddleware, create_backend
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Connect to MongoDB
+    # Startup: Connect to MongoDB (raises, aborting startup, if unreachable)
     await connect_to_mongo()
+    # Startup: Create declared indexes and report drift
+    await ensure_indexes(get_engine())
+    # Startup: Restore pending seat holds and start expiring them
+    await hold_expiry_scheduler.start()
+    # Startup: Build the city/date schedule index and follow catalog changes
+    await schedule_index.start()
+    # Startup: Group payment callbacks into bulk confirmations
+    await payment_confirmation_pipeline.start()
+    # Startup: Reconcile the owners' revenue rollups in the background
+    await revenue_rollups.start()
+    # Startup: Allocate latency histograms for every documented route
+    metrics.preallocate_routes(app.openapi()["paths"])
     yield
-    # Shutdown: Close connection
+    # Shutdown: Stop background tasks, then close connection
+    await revenue_rollups.stop()
+    await payment_confirmation_pipeline.stop()
+    await schedule_index.stop()
+    await hold_expiry_scheduler.stop()
+    password_pool.shutdown()
     await close_mongo_connection()
 
 
 app = FastAPI(title="Movie Ticket System API", lifespan=lifespan)
 
+# Rate limiting - Throttle auth endpoints per IP and per email before hashing
+app.add_middleware(
+    RateLimitMiddleware,
+    paths={
+        "/users/login": "login",
+        "/users/register": "register",
+        "/users/forgot-password": "forgot-password",
+        "/users/reset-password": "reset-password",
+    },
+    backend=create_backend(lambda: get_engine().database["rate_limits"]),
+)
+
 # CORS middleware - Allow frontend to connect
 app.add_middleware(
     CORSMiddleware,
@@ -25,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics middleware - Outermost, so throttled and CORS responses are counted
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/")
 def read_root():
@@ -33,3 +85,27 @@ def read_root():
 
 # User Routes - Register, Login, Forgot Password, Reset Password
 app.include_router(user_router, prefix="/users", tags=["Users"])
+
+# Movie Routes - Catalog listing (cached) and admin management
+app.include_router(movie_router, prefix="/movies", tags=["Movies"])
+
+# Showtime Routes - Schedule search, live seat maps and bulk scheduling
+app.include_router(showtime_router, prefix="/showtimes", tags=["Showtimes"])
+
+# Booking Routes - Seat holds and payments (Idempotency-Key aware)
+app.include_router(booking_router, prefix="/bookings", tags=["Bookings"])
+
+# Payment Routes - Gateway callbacks, confirmed in bulk
+app.include_router(payment_router, prefix="/payments", tags=["Payments"])
+
+# Import Routes - Streaming CSV/JSONL catalog import (Admin)
+app.include_router(import_router, prefix="/admin/import", tags=["Import"])
+
+# Report Routes - Occupancy and revenue for theater owners (precomputed rollups)
+app.include_router(report_router, prefix="/reports", tags=["Reports"])
+
+# Health Routes - Liveness and readiness probes
+app.include_router(health_router, prefix="/health", tags=["Health"])
+
+# Metrics Routes - Prometheus scrape endpoint
+app.include_router(metrics_router, tags=["Metrics"])
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, Header, status
+from typing import Optional
+
+from core.apis.schemas.requests.booking_schema import BookingCreate, PaymentCreate
+from core.apis.schemas.responses.user_responses import (
+    BookingResponse,
+    TransactionResponse,
+)
+from core.controller.booking_controller import BookingController
+from core.services.idempotency import idempotency_store
+from commons.auth import get_current_user
+
+
+booking_router = APIRouter()
+booking_controller = BookingController()
+
+
+@booking_router.post(
+    "/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_booking(
+    booking_data: BookingCreate,
+    idempotency_key: Optional[str] = Header(None),
+    current_user_token: dict = Depends(get_current_user),
+):
+    """Endpoint to hold seats (retry-safe with an Idempotency-Key header)"""
+    user_id = current_user_token.get("sub")
+    return await idempotency_store.run(
+        scope=f"{user_id}:POST /bookings",
+        key=idempotency_key,
+        payload=booking_data,
+        action=lambda: booking_controller.create_booking(user_id, booking_data),
+        response_model=BookingResponse,
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@booking_router.get("/{booking_id}", response_model=BookingResponse)
+async def get_booking(
+    booking_id: str, current_user_token: dict = Depends(get_current_user)
+):
+    """Endpoint to get one of the current user's bookings"""
+    user_id = current_user_token.get("sub")
+    return await booking_controller.get_booking(user_id, booking_id)
+
+
+@booking_router.post("/{booking_id}/cancel", response_model=BookingResponse)
+async def cancel_booking(
+    booking_id: str, current_user_token: dict = Depends(get_current_user)
+):
+    """Endpoint to cancel one of the current user's bookings before the show"""
+    user_id = current_user_token.get("sub")
+    return await booking_controller.cancel_booking(user_id, booking_id)
+
+
+@booking_router.post(
+    "/{booking_id}/payments",
+    response_model=TransactionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_payment(
+    booking_id: str,
+    payment_data: PaymentCreate,
+    idempotency_key: Optional[str] = Header(None),
+    current_user_token: dict = Depends(get_current_user),
+):
+    """Endpoint to start paying for a booking (retry-safe with Idempotency-Key)"""
+    user_id = current_user_token.get("sub")
+    return await idempotency_store.run(
+        scope=f"{user_id}:POST /bookings/{booking_id}/payments",
+        key=idempotency_key,
+        payload=payment_data,
+        action=lambda: booking_controller.create_payment(
+            user_id, booking_id, payment_data
+        ),
+        response_model=TransactionResponse,
+        status_code=status.HTTP_201_CREATED,
+    )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from core.database.database import ping_database
+
+
+health_router = APIRouter()
+
+
+@health_router.get("/live")
+async def live():
+    """Liveness probe - the process is up and serving requests"""
+    return {"status": "ok"}
+
+
+@health_router.get("/ready")
+async def ready():
+    """Readiness probe - MongoDB is reachable, safe to route traffic here"""
+    if await ping_database():
+        return {"status": "ready", "database": "ok"}
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "unavailable", "database": "unreachable"},
+    )
@@ -0,0 +1,42 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request
+
+from core.apis.schemas.responses.user_responses import ImportReportResponse
+from core.controller.import_controller import ImportController
+from commons.auth import require_admin
+
+
+import_router = APIRouter()
+import_controller = ImportController()
+
+
+@import_router.post(
+    "/{collection}",
+    response_model=ImportReportResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"text/csv": {}, "application/x-ndjson": {}},
+            "required": True,
+        }
+    },
+)
+async def import_collection(
+    collection: Literal["movies", "theaters", "screens", "showtimes"],
+    request: Request,
+    format: Optional[Literal["csv", "jsonl"]] = Query(
+        None, description="Defaults from Content-Type (text/csv, else JSONL)"
+    ),
+    dry_run: bool = Query(False, description="Only validate, write nothing"),
+    content_type: Optional[str] = Header(None),
+    admin: dict = Depends(require_admin),
+):
+    """
+    Endpoint for Admin to bulk import catalog data
+
+    The body is streamed (CSV with a header row, or one JSON object per
+    line) and written in batches; the report lists every rejected line.
+    """
+    return await import_controller.import_stream(
+        collection, request.stream(), format, content_type, dry_run
+    )
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from core.controller.movie_controller import movie_cache, movie_list_cache
+from core.services.payment_confirmation import payment_confirmation_pipeline
+from core.services.pricing import pricing_engine
+from core.services.revenue_rollup import revenue_rollups
+from core.services.seat_events import seat_event_hub
+from commons.auth import token_cache
+from commons.metrics import metrics
+from commons.password_pool import password_pool
+
+
+metrics_router = APIRouter()
+
+# Component gauges, read only when /metrics is scraped
+metrics.register_collector("password_pool", password_pool.metrics)
+metrics.register_collector("token_cache", token_cache.metrics)
+metrics.register_collector("movie_cache", movie_cache.metrics)
+metrics.register_collector("movie_list_cache", movie_list_cache.metrics)
+metrics.register_collector("pricing_cache", pricing_engine.cache.metrics)
+metrics.register_collector(
+    "payment_confirmation", payment_confirmation_pipeline.metrics
+)
+metrics.register_collector("seat_events", seat_event_hub.metrics)
+metrics.register_collector("revenue_rollups", revenue_rollups.metrics)
+metrics.register_collector("rollup_showtimes", revenue_rollups.showtimes.metrics)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query, status
+from typing import List, Optional
+
+from core.apis.schemas.requests.movie_schema import MovieCreate, MovieUpdate
+from core.apis.schemas.responses.user_responses import MovieResponse
+from core.controller.movie_controller import MovieController
+from core.models.movie_model import MovieStatus
+from commons.auth import require_admin
+
+
+movie_router = APIRouter()
+movie_controller = MovieController()
+
+
+@movie_router.get("/", response_model=List[MovieResponse])
+async def list_movies(
+    movie_status: Optional[MovieStatus] = Query(None, alias="status"),
+):
+    """Endpoint to list movies, e.g. ?status=NOW_SHOWING"""
+    return await movie_controller.list_movies(movie_status)
+
+
+@movie_router.get("/{movie_id}", response_model=MovieResponse)
+async def get_movie(movie_id: str):
+    """Endpoint to get a single movie"""
+    return await movie_controller.get_movie(movie_id)
+
+
+@movie_router.post(
+    "/", response_model=MovieResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_movie(movie_data: MovieCreate, admin: dict = Depends(require_admin)):
+    """Endpoint for Admin to add a movie"""
+    return await movie_controller.create_movie(movie_data)
+
+
+@movie_router.put("/{movie_id}", response_model=MovieResponse)
+async def update_movie(
+    movie_id: str, update_data: MovieUpdate, admin: dict = Depends(require_admin)
+):
+    """Endpoint for Admin to update a movie"""
+    return await movie_controller.update_movie(movie_id, update_data.model_dump())
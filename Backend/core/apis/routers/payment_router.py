@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from core.apis.schemas.requests.payment_schema import (
+    PaymentCallback,
+    PaymentCallbackBatch,
+)
+from core.apis.schemas.responses.user_responses import (
+    PaymentCallbackBatchResponse,
+    PaymentCallbackResult,
+)
+from core.services.payment_confirmation import payment_confirmation_pipeline
+from commons.auth import require_webhook_secret
+
+
+payment_router = APIRouter(dependencies=[Depends(require_webhook_secret)])
+
+
+@payment_router.post("/callback", response_model=PaymentCallbackResult)
+async def payment_callback(callback: PaymentCallback):
+    """Gateway webhook for one payment (grouped with concurrent callbacks)"""
+    return await payment_confirmation_pipeline.submit(callback.model_dump())
+
+
+@payment_router.post("/callbacks", response_model=PaymentCallbackBatchResponse)
+async def payment_callbacks(batch: PaymentCallbackBatch):
+    """Gateway webhook for a batch of payments, with a result per callback"""
+    results = await payment_confirmation_pipeline.confirm_batch(
+        [callback.model_dump() for callback in batch.callbacks]
+    )
+    failed = sum(1 for result in results if not result["ok"])
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
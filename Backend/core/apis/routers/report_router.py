@@ -0,0 +1,46 @@
+from datetime import date
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from core.apis.schemas.responses.report_responses import (
+    RevenueReportResponse,
+    RollupReconcileResponse,
+)
+from core.controller.report_controller import ReportController
+from core.services.revenue_rollup import ROLLUP_RECONCILE_DAYS
+from commons.auth import require_admin, require_theater_owner
+
+
+report_router = APIRouter()
+report_controller = ReportController()
+
+
+@report_router.get("/revenue", response_model=RevenueReportResponse)
+async def revenue_report(
+    start: Optional[date] = Query(None, description="First day, default 30 days back"),
+    end: Optional[date] = Query(None, description="Last day, defaults to today"),
+    theater_id: Optional[str] = Query(None, description="Only this theater"),
+    group_by: List[Literal["theater", "screen", "movie", "day"]] = Query(
+        ["theater", "day"], description="Dimensions of the rows"
+    ),
+    user: dict = Depends(require_theater_owner),
+):
+    """
+    Endpoint for Theater Owners to see occupancy and revenue
+
+    Served from precomputed daily rollups (days are show dates in the
+    schedule timezone), never from raw bookings.
+    """
+    return await report_controller.revenue_report(
+        user, start, end, theater_id, group_by
+    )
+
+
+@report_router.post("/revenue/reconcile", response_model=RollupReconcileResponse)
+async def reconcile_revenue(
+    days: int = Query(ROLLUP_RECONCILE_DAYS, ge=0, le=3660),
+    admin: dict = Depends(require_admin),
+):
+    """Endpoint for Admin to recompute the rollups, e.g. to backfill history"""
+    return await report_controller.reconcile(days)
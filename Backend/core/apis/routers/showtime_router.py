@@ -0,0 +1,82 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, WebSocket
+
+from core.apis.schemas.requests.showtime_schema import (
+    BestSeatsRequest,
+    BulkScheduleRequest,
+    SeatQuoteRequest,
+)
+from core.apis.schemas.responses.showtime_responses import (
+    BestSeatsResponse,
+    BulkScheduleResponse,
+    QuoteResponse,
+    ScheduleSearchResponse,
+    SeatMapResponse,
+)
+from core.controller.showtime_controller import ShowtimeController
+from commons.auth import require_theater_owner
+
+
+showtime_router = APIRouter()
+showtime_controller = ShowtimeController()
+
+
+@showtime_router.get("/search", response_model=ScheduleSearchResponse)
+async def search_showtimes(
+    city: str = Query(..., min_length=2, description="City or locality"),
+    date: Optional[date] = Query(None, description="Show date, defaults to today"),
+):
+    """Endpoint to list what's playing in a city on a given date"""
+    return showtime_controller.search_schedule(city, date)
+
+
+@showtime_router.get(
+    "/{showtime_id}/seats",
+    response_model=SeatMapResponse,
+    responses={304: {"description": "Seat map unchanged since the given ETag"}},
+)
+async def get_seat_map(
+    showtime_id: str,
+    if_none_match: Optional[str] = Header(None),
+):
+    """Endpoint to poll seat availability (send If-None-Match to revalidate)"""
+    return await showtime_controller.get_seat_map(showtime_id, if_none_match)
+
+
+@showtime_router.get(
+    "/{showtime_id}/seats/stream",
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_seat_map(showtime_id: str):
+    """Endpoint to follow seat availability live (snapshot, then diffs)"""
+    return await showtime_controller.stream_seats(showtime_id)
+
+
+@showtime_router.websocket("/{showtime_id}/seats/ws")
+async def watch_seat_map(websocket: WebSocket, showtime_id: str):
+    """WebSocket variant of the live seat availability stream"""
+    await showtime_controller.watch_seats(websocket, showtime_id)
+
+
+@showtime_router.post("/{showtime_id}/quote", response_model=QuoteResponse)
+async def quote_seats(showtime_id: str, request: SeatQuoteRequest):
+    """Endpoint to price selected seats before booking"""
+    return await showtime_controller.quote_seats(showtime_id, request.seats)
+
+
+@showtime_router.post("/{showtime_id}/best-seats", response_model=BestSeatsResponse)
+async def best_seats(showtime_id: str, request: BestSeatsRequest):
+    """Endpoint to suggest the best N available seats (quick book)"""
+    return await showtime_controller.best_seats(
+        showtime_id, request.count, request.seat_type
+    )
+
+
+@showtime_router.post("/bulk", response_model=BulkScheduleResponse)
+async def bulk_schedule(
+    request: BulkScheduleRequest, user: dict = Depends(require_theater_owner)
+):
+    """Endpoint for Theater Owners to upload a schedule (overlaps are rejected)"""
+    return await showtime_controller.bulk_schedule(request, user)
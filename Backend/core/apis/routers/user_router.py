@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, status
-from typing import List
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
 
 from core.apis.schemas.requests.user_schema import (
     UserCreate,
@@ -9,7 +10,11 @@ from core.apis.schemas.requests.user_schema import (
     UserUpdate,
 )
 
-from core.apis.schemas.responses.user_responses import UserResponse, LoginResponse
+from core.apis.schemas.responses.user_responses import (
+    UserResponse,
+    LoginResponse,
+    UserPageResponse,
+)
 from core.controller.user_controller import UserController
 from commons.auth import get_current_user, require_admin
 
@@ -67,7 +72,24 @@ async def delete_me(current_user_token: dict = Depends(get_current_user)):
     return await user_controller.delete_user(user_id)
 
 
-@user_router.get("/all", response_model=List[UserResponse])
-async def get_all_users(admin: dict = Depends(require_admin)):
-    """Endpoint for Admin to list all users"""
-    return await user_controller.get_all_users()
+@user_router.get("/all", response_model=UserPageResponse)
+async def get_all_users(
+    after: Optional[str] = Query(None, description="Cursor returned by the last page"),
+    limit: int = Query(100, ge=1, le=500),
+    format: Literal["json", "ndjson"] = Query("json"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to export (ndjson only)"
+    ),
+    admin: dict = Depends(require_admin),
+):
+    """
+    Endpoint for Admin to list users
+
+    `json` returns one page at a time; follow `next_cursor` for the next one.
+    `ndjson` streams every user after the cursor in constant memory.
+    """
+    if format == "ndjson":
+        field_list = fields.split(",") if fields else None
+        stream = await user_controller.stream_all_users(after, field_list)
+        return StreamingResponse(stream, media_type="application/x-ndjson")
+    return await user_controller.get_all_users(after, limit)
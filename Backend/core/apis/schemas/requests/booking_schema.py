@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+
+from core.models.transaction_model import PaymentMethod
+
+
+class BookingCreate(BaseModel):
+    showtime_id: str = Field(..., description="Showtime to book seats for")
+    seats: Optional[List[str]] = Field(
+        None, min_length=1, max_length=10, description="e.g. A1"
+    )
+    # Quick book: let the server pick the best available seats instead
+    quantity: Optional[int] = Field(None, ge=1, le=10)
+    seat_type: Optional[str] = Field(None, description="Only for quantity")
+
+    @model_validator(mode="after")
+    def validate_seat_selection(self):
+        """Either pick seats or ask for a quantity, not both."""
+        if (self.seats is None) == (self.quantity is None):
+            raise ValueError("Provide either seats or quantity")
+        return self
+
+
+class PaymentCreate(BaseModel):
+    payment_method: Optional[PaymentMethod] = None
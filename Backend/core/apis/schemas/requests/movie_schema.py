@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from core.models.movie_model import MovieStatus
+
+
+class MovieCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=200)
+    description: str = Field(..., description="Short synopsis of the movie")
+    language: str = Field(..., description="Audio language of the movie")
+    genres: List[str] = Field(default_factory=list)
+    duration_minutes: int = Field(..., gt=0)
+    release_date: datetime
+    poster_url: Optional[str] = None
+    trailer_url: Optional[str] = None
+    status: MovieStatus = MovieStatus.COMING_SOON
+
+
+class MovieUpdate(BaseModel):
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    language: Optional[str] = None
+    genres: Optional[List[str]] = None
+    duration_minutes: Optional[int] = Field(None, gt=0)
+    release_date: Optional[datetime] = None
+    poster_url: Optional[str] = None
+    trailer_url: Optional[str] = None
+    status: Optional[MovieStatus] = None
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class PaymentCallback(BaseModel):
+    """Payment outcome reported by the gateway for one of our transactions"""
+
+    transaction_id: str = Field(..., description="Our Transaction ID")
+    status: Literal["SUCCESS", "FAILED"]
+    gateway_transaction_id: Optional[str] = Field(
+        None, description="Gateway reference e.g. Razorpay/Stripe ID"
+    )
+
+
+class PaymentCallbackBatch(BaseModel):
+    callbacks: List[PaymentCallback] = Field(..., min_length=1, max_length=5000)
@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class ShowtimeCreate(BaseModel):
+    movie_id: str
+    screen_id: str
+    start_time: datetime
+    end_time: Optional[datetime] = Field(
+        None, description="Defaults to start_time + the movie's duration"
+    )
+    base_price: float = Field(..., gt=0)
+
+
+class BulkScheduleRequest(BaseModel):
+    showtimes: List[ShowtimeCreate] = Field(..., min_length=1, max_length=5000)
+    dry_run: bool = Field(False, description="Validate only, create nothing")
+
+
+class SeatQuoteRequest(BaseModel):
+    seats: List[str] = Field(..., min_length=1, max_length=10, description="e.g. A1")
+
+
+class BestSeatsRequest(BaseModel):
+    count: int = Field(..., ge=1, le=10)
+    seat_type: Optional[str] = Field(None, description="e.g. GOLD")
@@ -61,3 +61,14 @@ class UserUpdate(BaseModel):
     first_name: Optional[str] = Field(None, min_length=2, max_length=50)
     last_name: Optional[str] = Field(None, min_length=2, max_length=50)
     mobile_number: Optional[str] = Field(None, min_length=10, max_length=15)
+
+    @field_validator("mobile_number")
+    @classmethod
+    def validate_mobile_number(cls, value: Optional[str]) -> Optional[str]:
+        """Validate that mobile number contains only digits."""
+        if value is None:
+            return value
+        cleaned = value.replace("+", "").replace("-", "").replace(" ", "")
+        if not cleaned.isdigit():
+            raise ValueError("Mobile number must contain only digits")
+        return value
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class RevenueReportRow(BaseModel):
+    # Only the dimensions the report is grouped by are set
+    theater_id: Optional[str] = None
+    screen_id: Optional[str] = None
+    movie_id: Optional[str] = None
+    day: Optional[str] = None
+    shows: int
+    capacity: int
+    bookings: int
+    seats_sold: int
+    revenue: float
+    occupancy: float = Field(..., description="seats_sold / capacity")
+
+
+class RevenueReportResponse(BaseModel):
+    start: str
+    end: str
+    group_by: List[str]
+    rows: List[RevenueReportRow]
+    totals: RevenueReportRow
+
+
+class RollupReconcileResponse(BaseModel):
+    since: str
+    keys: int
+    corrected: int
+    deleted: int
+    skipped: int
@@ -0,0 +1,94 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class ScheduleShowtime(BaseModel):
+    showtime_id: str
+    movie_id: str
+    theater_id: str
+    screen_id: str
+    start_time: str
+    end_time: str
+    base_price: float
+
+
+class ScheduleTheater(BaseModel):
+    theater_id: str
+    name: str
+    address: str
+    showtimes: List[ScheduleShowtime]
+
+
+class ScheduleMovie(BaseModel):
+    movie_id: str
+    title: str
+    language: str
+    genres: List[str]
+    duration_minutes: int
+    poster_url: Optional[str]
+    theaters: List[ScheduleTheater]
+
+
+class ScheduleSearchResponse(BaseModel):
+    city: str
+    date: str
+    movies: List[ScheduleMovie]
+
+
+class SeatMapResponse(BaseModel):
+    """
+    Compact seat availability for a showtime.
+
+    `unavailable` is a base64 bitmap over rows x columns in row-major order
+    (seat i is bit i & 7 of byte i >> 3; set = held or sold). `seat_types`
+    is base64 with one byte per seat indexing into `palette`, or null when
+    every seat is palette[0].
+    """
+
+    showtime_id: str
+    version: int
+    rows: int
+    columns: int
+    unavailable: str
+    palette: List[str]
+    seat_types: Optional[str]
+    total: int
+    held: int
+    sold: int
+    free: int
+
+
+class ScheduleItemResult(BaseModel):
+    index: int
+    ok: bool
+    showtime_id: Optional[str] = None
+    error: Optional[str] = None
+    # Existing showtime ids, or "request:<index>" for earlier items in the upload
+    conflicts: List[str] = []
+
+
+class BulkScheduleResponse(BaseModel):
+    created: int
+    rejected: int
+    dry_run: bool
+    results: List[ScheduleItemResult]
+
+
+class QuotedSeat(BaseModel):
+    seat: str
+    seat_type: str
+    price: float
+
+
+class QuoteResponse(BaseModel):
+    showtime_id: str
+    seats: List[QuotedSeat]
+    demand_multiplier: float
+    total: float
+
+
+class BestSeatsResponse(BaseModel):
+    seats: List[str]
+    # Adjacent seats grouped together, one block when the party sits together
+    blocks: List[List[str]]
+    together: bool
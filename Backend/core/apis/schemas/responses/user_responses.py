@@ -20,6 +20,13 @@ class UserResponse(BaseModel):
         from_attributes = True
 
 
+class UserPageResponse(BaseModel):
+    items: List[UserResponse]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as `after` to fetch the next page"
+    )
+
+
 class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
@@ -99,3 +106,35 @@ class TransactionResponse(BaseModel):
     class Config:
         populate_by_name = True
         from_attributes = True
+
+
+class PaymentCallbackResult(BaseModel):
+    transaction_id: str
+    ok: bool
+    booking_id: Optional[str] = None
+    transaction_status: Optional[str] = None
+    booking_status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PaymentCallbackBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[PaymentCallbackResult]
+
+
+class ImportRowError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class ImportReportResponse(BaseModel):
+    collection: str
+    dry_run: bool
+    rows: int
+    inserted: int
+    rejected: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = Field(
+        default=False, description="More rows were rejected than are listed"
+    )
@@ -0,0 +1,230 @@
+import os
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from odmantic import ObjectId
+
+from core.apis.schemas.requests.booking_schema import BookingCreate, PaymentCreate
+from core.models.booking_model import Booking, BookingStatus
+from core.models.showtime_model import Showtime
+from core.models.transaction_model import Transaction, TransactionStatus
+from core.database.database import get_engine
+from core.services.hold_expiry import hold_expiry_scheduler
+from core.services.pricing import pricing_engine
+from core.services.revenue_rollup import revenue_rollups
+from core.services.seat_allocator import NotEnoughSeatsError, allocate
+from core.services.seat_claims import seat_claims
+from core.services.seat_inventory import (
+    SeatUnavailableError,
+    ShowtimeNotFoundError,
+    UnknownSeatError,
+    seat_inventory,
+)
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+# How long seats stay held while the customer pays
+BOOKING_HOLD_MINUTES = int(os.getenv("BOOKING_HOLD_MINUTES", "10"))
+
+
+def _object_id(value: str, name: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name} ID"
+        )
+
+
+def _booking_dict(booking: Booking) -> dict:
+    booking_dict = booking.model_dump()
+    booking_dict["id"] = str(booking.id)
+    booking_dict["user_id"] = str(booking.user_id)
+    booking_dict["showtime_id"] = str(booking.showtime_id)
+    return booking_dict
+
+
+def _transaction_dict(transaction: Transaction) -> dict:
+    transaction_dict = transaction.model_dump()
+    transaction_dict["id"] = str(transaction.id)
+    transaction_dict["booking_id"] = str(transaction.booking_id)
+    transaction_dict["user_id"] = str(transaction.user_id)
+    return transaction_dict
+
+
+class BookingController:
+    @property
+    def engine(self):
+        return get_engine()
+
+    async def create_booking(self, user_id: str, booking_data: BookingCreate) -> dict:
+        """Hold seats for a showtime as a PENDING booking"""
+        showtime_oid = _object_id(booking_data.showtime_id, "Showtime")
+        seats = booking_data.seats
+        if seats is not None and len(set(seats)) != len(seats):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate seats"
+            )
+
+        showtime = await self.engine.find_one(Showtime, Showtime.id == showtime_oid)
+        if not showtime or not showtime.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Showtime not found"
+            )
+        if showtime.start_time <= datetime.utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Showtime has already started",
+            )
+
+        try:
+            inventory = await seat_inventory.get(str(showtime_oid))
+            pricing = await pricing_engine.get(str(showtime_oid))
+        except ShowtimeNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+        # No awaits from here to the hold, so picked seats can't be taken meanwhile
+        try:
+            if seats is None:
+                blocks = allocate(
+                    inventory, booking_data.quantity, booking_data.seat_type
+                )
+                seats = [seat for block in blocks for seat in block]
+            quote = pricing.quote(inventory, seats)
+        except NotEnoughSeatsError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        except UnknownSeatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        booking = Booking(
+            user_id=ObjectId(user_id),
+            showtime_id=showtime_oid,
+            seats=seats,
+            total_amount=quote["total"],
+            expires_at=datetime.utcnow() + timedelta(minutes=BOOKING_HOLD_MINUTES),
+        )
+
+        # Claim the seats in memory first, all-or-nothing
+        try:
+            inventory.hold(str(booking.id), seats)
+        except UnknownSeatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except SeatUnavailableError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+        # Then in the database, where other workers' holds are visible too
+        try:
+            await seat_claims.claim(showtime_oid, booking.id, seats)
+        except SeatUnavailableError as e:
+            inventory.release(str(booking.id))
+            # Sold through another worker, so this seat map is stale
+            seat_inventory.evict(showtime_oid)
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        except Exception:
+            inventory.release(str(booking.id))
+            raise
+
+        try:
+            await self.engine.save(booking)
+        except Exception:
+            inventory.release(str(booking.id))
+            await seat_claims.release([booking.id])
+            raise
+
+        hold_expiry_scheduler.schedule(booking.id, showtime_oid, booking.expires_at)
+        logging.info(f"Booking {booking.id} holding {len(seats)} seats")
+        return _booking_dict(booking)
+
+    async def _get_own_booking(self, user_id: str, booking_id: str) -> Booking:
+        booking = await self.engine.find_one(
+            Booking,
+            Booking.id == _object_id(booking_id, "Booking"),
+            Booking.user_id == ObjectId(user_id),
+        )
+        if not booking:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found"
+            )
+        return booking
+
+    async def get_booking(self, user_id: str, booking_id: str) -> dict:
+        """Get one of the user's bookings"""
+        return _booking_dict(await self._get_own_booking(user_id, booking_id))
+
+    async def cancel_booking(self, user_id: str, booking_id: str) -> dict:
+        """Cancel a held or paid booking before its show starts"""
+        booking = await self._get_own_booking(user_id, booking_id)
+        if booking.status not in (BookingStatus.PENDING, BookingStatus.CONFIRMED):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Booking can't be cancelled ({booking.status.value})",
+            )
+        showtime = await self.engine.find_one(
+            Showtime, Showtime.id == booking.showtime_id
+        )
+        if showtime and showtime.start_time <= datetime.utcnow():
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Showtime has already started",
+            )
+
+        # Only from the status we saw, so a concurrent payment or expiry wins
+        result = await self.engine.get_collection(Booking).update_one(
+            {"_id": booking.id, "status": booking.status.value},
+            {"$set": {"status": BookingStatus.CANCELLED.value}},
+        )
+        if result.modified_count != 1:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Booking was updated meanwhile, please retry",
+            )
+
+        hold_expiry_scheduler.cancel(booking.id)
+        await seat_claims.release([booking.id])
+        inventory = seat_inventory.peek(booking.showtime_id)
+        if inventory is not None:
+            inventory.release(str(booking.id))
+
+        if booking.status == BookingStatus.CONFIRMED:
+            paid = [
+                doc["amount"]
+                async for doc in self.engine.get_collection(Transaction).find(
+                    {
+                        "booking_id": booking.id,
+                        "status": TransactionStatus.SUCCESS.value,
+                    },
+                    {"amount": 1},
+                )
+            ]
+            await revenue_rollups.record_bookings(
+                [(booking.showtime_id, len(booking.seats), sum(paid))], sign=-1
+            )
+            logging.warning(f"Paid booking {booking.id} cancelled, needs a refund")
+
+        booking.status = BookingStatus.CANCELLED
+        logging.info(f"Booking {booking.id} cancelled")
+        return _booking_dict(booking)
+
+    async def create_payment(
+        self, user_id: str, booking_id: str, payment_data: PaymentCreate
+    ) -> dict:
+        """Start a payment (INITIATED transaction) for a PENDING booking"""
+        booking = await self._get_own_booking(user_id, booking_id)
+        if booking.status != BookingStatus.PENDING or (
+            booking.expires_at and booking.expires_at <= datetime.utcnow()
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Booking is not awaiting payment ({booking.status.value})",
+            )
+
+        transaction = Transaction(
+            booking_id=booking.id,
+            user_id=booking.user_id,
+            amount=booking.total_amount,
+            payment_method=payment_data.payment_method,
+        )
+        await self.engine.save(transaction)
+        logging.info(f"Transaction {transaction.id} initiated for booking {booking.id}")
+        return _transaction_dict(transaction)
@@ -0,0 +1,47 @@
+from typing import AsyncIterator, List, Optional
+
+from fastapi import HTTPException, status
+from odmantic import Model
+
+from core.controller.movie_controller import invalidate_movies
+from core.services.bulk_import import ImportFormatError, bulk_importer
+from core.services.schedule_index import schedule_index
+
+
+def _format_for(content_type: Optional[str]) -> str:
+    if content_type and "csv" in content_type:
+        return "csv"
+    return "jsonl"
+
+
+class ImportController:
+    def _refresh_catalog(self, collection: str, docs: List[Model]) -> None:
+        """Make imported rows visible to the in-memory catalog views"""
+        if collection == "showtimes":
+            for showtime in docs:
+                schedule_index.upsert_showtime(showtime)
+        elif collection == "theaters":
+            for theater in docs:
+                schedule_index.upsert_theater(theater)
+        elif collection == "movies":
+            invalidate_movies(docs)
+
+    async def import_stream(
+        self,
+        collection: str,
+        chunks: AsyncIterator[bytes],
+        format: Optional[str],
+        content_type: Optional[str],
+        dry_run: bool,
+    ) -> dict:
+        """Stream a CSV/JSONL body into a catalog collection"""
+        try:
+            return await bulk_importer.run(
+                collection,
+                chunks,
+                format=format or _format_for(content_type),
+                dry_run=dry_run,
+                on_inserted=lambda docs: self._refresh_catalog(collection, docs),
+            )
+        except ImportFormatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
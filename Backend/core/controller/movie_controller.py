@@ -0,0 +1,143 @@
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from odmantic import ObjectId
+
+from core.models.movie_model import Movie, MovieStatus
+from core.apis.schemas.requests.movie_schema import MovieCreate
+from core.database.database import get_engine, get_catalog_engine
+from core.services.schedule_index import schedule_index
+from commons.cache import TTLCache
+from commons.loggers import logger
+
+
+logging = logger(__name__)
+
+MOVIE_CACHE_MAX_SIZE = int(os.getenv("MOVIE_CACHE_MAX_SIZE", "5000"))
+MOVIE_CACHE_TTL_SECONDS = float(os.getenv("MOVIE_CACHE_TTL_SECONDS", "300"))
+# Unknown ids are remembered briefly, so a 404 flood doesn't reach MongoDB
+# but a movie created elsewhere shows up quickly
+MOVIE_CACHE_MISS_TTL_SECONDS = float(os.getenv("MOVIE_CACHE_MISS_TTL_SECONDS", "5"))
+
+# Read-through caches in front of the movies collection:
+# movie id -> movie dict, and MovieStatus -> list of movie dicts
+movie_cache = TTLCache("movies", MOVIE_CACHE_MAX_SIZE, MOVIE_CACHE_TTL_SECONDS)
+movie_list_cache = TTLCache(
+    "movie_lists", len(MovieStatus) + 1, MOVIE_CACHE_TTL_SECONDS
+)
+
+
+# A lagging secondary could put a just-written movie's old version back in
+# the cache for a whole TTL, so refills after a write read the primary:
+# when movies were last written, and when each list last came from the primary
+_movies_written_at = 0.0
+_lists_refreshed_at: Dict[Optional[MovieStatus], float] = {}
+
+
+def _movie_dict(movie: Movie) -> dict:
+    movie_dict = movie.model_dump()
+    movie_dict["id"] = str(movie.id)
+    return movie_dict
+
+
+def invalidate_movies(movies: List[Movie]) -> None:
+    """Make written movies visible to the caches and the schedule index"""
+    global _movies_written_at
+    _movies_written_at = time.monotonic()
+    for movie in movies:
+        # Seeded from the write itself, never refilled from a secondary
+        movie_cache.delete(str(movie.id))
+        movie_cache.set(str(movie.id), _movie_dict(movie))
+        schedule_index.upsert_movie(movie)
+    # Status may have changed, so every list is dropped, not just one
+    movie_list_cache.clear()
+
+
+class MovieController:
+    @property
+    def engine(self):
+        return get_engine()
+
+    @property
+    def catalog_engine(self):
+        return get_catalog_engine()
+
+    async def list_movies(self, movie_status: Optional[MovieStatus] = None) -> List:
+        """List movies, optionally by status (served from memory when cached)"""
+
+        async def load():
+            started = time.monotonic()
+            stale = _lists_refreshed_at.get(movie_status, -1.0) < _movies_written_at
+            engine = self.engine if stale else self.catalog_engine
+            queries = [Movie.status == movie_status] if movie_status else []
+            movies = await engine.find(
+                Movie, *queries, sort=Movie.release_date.desc()
+            )
+            if stale:
+                _lists_refreshed_at[movie_status] = started
+            return [_movie_dict(movie) for movie in movies]
+
+        return await movie_list_cache.get_or_load(movie_status, load)
+
+    async def get_movie(self, movie_id: str) -> dict:
+        """Get a movie by ID (read-through cache)"""
+        try:
+            movie_oid = ObjectId(movie_id)
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Movie ID"
+            )
+
+        async def load():
+            movie = await self.catalog_engine.find_one(Movie, Movie.id == movie_oid)
+            return _movie_dict(movie) if movie else None
+
+        # One key per movie however the id was spelled (e.g. upper-case hex)
+        movie_dict = await movie_cache.get_or_load(
+            str(movie_oid), load, none_ttl_seconds=MOVIE_CACHE_MISS_TTL_SECONDS
+        )
+        if movie_dict is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found"
+            )
+        return movie_dict
+
+    async def create_movie(self, movie_data: MovieCreate) -> dict:
+        """Create a movie (Admin)"""
+        movie = Movie(**movie_data.model_dump())
+        await self.engine.save(movie)
+        invalidate_movies([movie])
+        logging.info(f"Movie created: {movie.title}")
+        return _movie_dict(movie)
+
+    async def update_movie(self, movie_id: str, update_data: dict) -> dict:
+        """Update a movie (Admin), always read from the primary"""
+        try:
+            movie = await self.engine.find_one(Movie, Movie.id == ObjectId(movie_id))
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Movie ID"
+            )
+        if not movie:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Movie not found"
+            )
+
+        changes = {
+            key: value for key, value in update_data.items() if value is not None
+        }
+        if changes:
+            movie.model_update(changes)
+            movie.updated_at = datetime.utcnow()
+            await self.engine.save(movie)
+            invalidate_movies([movie])
+        return _movie_dict(movie)
+
+    def cache_metrics(self) -> dict:
+        return {
+            "movies": movie_cache.metrics(),
+            "movie_lists": movie_list_cache.metrics(),
+        }
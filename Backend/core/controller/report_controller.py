@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import HTTPException, status
+from odmantic import ObjectId
+
+from core.database.database import get_engine
+from core.models.rollup_model import RevenueRollup
+from core.services.revenue_rollup import COUNTERS, revenue_rollups
+from core.services.schedule_index import today
+
+# Dimensions a report can be grouped by -> rollup field
+GROUP_FIELDS = {
+    "theater": "theater_id",
+    "screen": "screen_id",
+    "movie": "movie_id",
+    "day": "day",
+}
+REPORT_DEFAULT_DAYS = 30
+REPORT_MAX_DAYS = 366
+
+
+def _row(values: dict) -> dict:
+    row = {
+        field: value if field == "day" else str(value)
+        for field, value in values.items()
+        if field in GROUP_FIELDS.values()
+    }
+    for counter in COUNTERS:
+        row[counter] = values.get(counter, 0)
+    row["revenue"] = round(row["revenue"], 2)
+    row["occupancy"] = (
+        round(row["seats_sold"] / row["capacity"], 4) if row["capacity"] else 0.0
+    )
+    return row
+
+
+class ReportController:
+    @property
+    def engine(self):
+        return get_engine()
+
+    async def revenue_report(
+        self,
+        user: dict,
+        start: Optional[date],
+        end: Optional[date],
+        theater_id: Optional[str],
+        group_by: List[str],
+    ) -> dict:
+        """
+        Occupancy and revenue of the user's theaters (any theater for an
+        admin), summed from the precomputed rollups only
+        """
+        end = end or today()
+        start = start or end - timedelta(days=REPORT_DEFAULT_DAYS - 1)
+        if start > end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start must not be after end",
+            )
+        if (end - start).days >= REPORT_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A report covers at most {REPORT_MAX_DAYS} days",
+            )
+
+        query = {"day": {"$gte": start.isoformat(), "$lte": end.isoformat()}}
+        # Owners only see their own theaters, admins any
+        if str(user.get("role", "")).upper() != "ADMIN":
+            query["owner_id"] = ObjectId(user["sub"])
+        if theater_id:
+            try:
+                query["theater_id"] = ObjectId(theater_id)
+            except Exception:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid Theater ID",
+                )
+
+        group_by = list(dict.fromkeys(group_by))
+        fields = [GROUP_FIELDS[name] for name in group_by]
+        pipeline = [
+            {"$match": query},
+            {
+                "$group": {
+                    "_id": {field: f"${field}" for field in fields} or None,
+                    **{counter: {"$sum": f"${counter}"} for counter in COUNTERS},
+                }
+            },
+            {"$sort": {f"_id.{field}": 1 for field in fields} or {"_id": 1}},
+        ]
+        rows = []
+        totals = dict.fromkeys(COUNTERS, 0)
+        cursor = self.engine.get_collection(RevenueRollup).aggregate(pipeline)
+        async for doc in cursor:
+            rows.append(_row({**(doc.pop("_id") or {}), **doc}))
+            for counter in COUNTERS:
+                totals[counter] += doc[counter]
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "group_by": group_by,
+            "rows": rows,
+            "totals": _row(totals),
+        }
+
+    async def reconcile(self, days: int) -> dict:
+        """Recompute the rollups from `days` ago onwards right away"""
+        return await revenue_rollups.reconcile(days)
@@ -0,0 +1,145 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import HTTPException, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from core.apis.schemas.requests.showtime_schema import BulkScheduleRequest
+from core.services.pricing import pricing_engine
+from core.services.schedule_index import schedule_index, today
+from core.services.screen_schedule import screen_scheduler
+from core.services.seat_allocator import NotEnoughSeatsError, allocate
+from core.services.seat_events import (
+    SEAT_PUSH_HEARTBEAT_SECONDS,
+    Subscription,
+    seat_event_hub,
+)
+from core.services.seat_inventory import (
+    ShowtimeNotFoundError,
+    UnknownSeatError,
+    seat_inventory,
+)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+async def _sse_frames(subscription: Subscription):
+    """Server-sent event frames until the hub ends the stream"""
+    try:
+        while True:
+            message = await subscription.next(SEAT_PUSH_HEARTBEAT_SECONDS)
+            if message is None:
+                break
+            event, data = message
+            if event == "heartbeat":
+                yield b": keep-alive\n\n"
+                continue
+            yield b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+    finally:
+        seat_event_hub.unsubscribe(subscription)
+
+
+class ShowtimeController:
+    def search_schedule(self, city: str, day: Optional[date] = None) -> Response:
+        """What's playing in a city on a date, served from the schedule index"""
+        payload = schedule_index.search(city, day or today())
+        # Already rendered JSON, skip response_model validation/serialization
+        return Response(content=payload, media_type="application/json")
+
+    async def get_seat_map(
+        self, showtime_id: str, if_none_match: Optional[str] = None
+    ) -> Response:
+        """Compact seat map, or 304 when the client's copy is still current"""
+        try:
+            inventory = await seat_inventory.get(showtime_id)
+        except ShowtimeNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+        # Clients must revalidate, but unchanged maps cost only a 304
+        headers = {"ETag": inventory.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(if_none_match, inventory.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(
+            content=inventory.encode(), media_type="application/json", headers=headers
+        )
+
+    async def stream_seats(self, showtime_id: str) -> StreamingResponse:
+        """Seat map snapshot followed by live diffs, as server-sent events"""
+        try:
+            subscription = await seat_event_hub.subscribe(showtime_id)
+        except ShowtimeNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        return StreamingResponse(
+            _sse_frames(subscription),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def watch_seats(self, websocket: WebSocket, showtime_id: str) -> None:
+        """Same events as stream_seats, as {"event", "data"} WebSocket messages"""
+        try:
+            subscription = await seat_event_hub.subscribe(showtime_id)
+        except ShowtimeNotFoundError as e:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e))
+            return
+
+        await websocket.accept()
+        try:
+            while True:
+                message = await subscription.next(SEAT_PUSH_HEARTBEAT_SECONDS)
+                if message is None:
+                    # Dropped for falling behind, the client should resync
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                    break
+                event, data = message
+                if event == "heartbeat":
+                    await websocket.send_text('{"event":"heartbeat"}')
+                    continue
+                await websocket.send_text(
+                    f'{{"event":"{event}","data":{data.decode()}}}'
+                )
+        except WebSocketDisconnect:
+            pass
+        finally:
+            seat_event_hub.unsubscribe(subscription)
+
+    async def quote_seats(self, showtime_id: str, seats: List[str]) -> dict:
+        """Price the selected seats at the showtime's current demand"""
+        try:
+            return await pricing_engine.quote(showtime_id, seats)
+        except ShowtimeNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except UnknownSeatError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def best_seats(
+        self, showtime_id: str, count: int, seat_type: Optional[str] = None
+    ) -> dict:
+        """Suggest the best available seats (nothing is held)"""
+        try:
+            inventory = await seat_inventory.get(showtime_id)
+            blocks = allocate(inventory, count, seat_type)
+        except ShowtimeNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except NotEnoughSeatsError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        return {
+            "seats": [seat for block in blocks for seat in block],
+            "blocks": blocks,
+            "together": len(blocks) == 1,
+        }
+
+    async def bulk_schedule(self, request: BulkScheduleRequest, user: dict) -> dict:
+        """Create many showtimes at once, rejecting overlaps per item"""
+        # Owners may only schedule their own theaters' screens, admins any
+        owner_id = None if str(user.get("role", "")).upper() == "ADMIN" else user["sub"]
+        return await screen_scheduler.schedule(
+            [item.model_dump() for item in request.showtimes],
+            owner_id=owner_id,
+            dry_run=request.dry_run,
+        )
@@ -1,18 +1,36 @@
-from datetime import datetime, timedelta
-import random
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
+
+import orjson
 from fastapi import HTTPException, status
 from odmantic import ObjectId
+from odmantic.exceptions import DuplicateKeyError
 
 from core.models.user_model import User, UserStatus, UserRole, UserAddress
 from core.apis.schemas.requests.user_schema import UserCreate
-from commons.auth import get_password_hash, verify_password, create_access_token
+from core.apis.schemas.responses.user_responses import UserResponse
+from core.crud.user_crud import user_crud
+from core.services.otp_store import ExpiredOtpError, InvalidOtpError, otp_store
+from commons.auth import create_access_token
+from commons.responses import ORJSONResponse
+from commons.password_pool import hash_password_async, verify_password_async
 from core.database.database import get_engine
 from commons.loggers import logger
 
 
 logging = logger(__name__)
 
+# Stored fields that may be exposed in listings (never hashed_password)
+USER_PUBLIC_FIELDS = [name for name in UserResponse.model_fields if name != "id"]
+USER_PUBLIC_PROJECTION = {field: 1 for field in USER_PUBLIC_FIELDS}
+
+
+def _user_response(doc: dict) -> dict:
+    """UserResponse-shaped dict straight from a (projected) user document"""
+    user = {"id": str(doc["_id"])}
+    for field in USER_PUBLIC_FIELDS:
+        user[field] = doc.get(field)
+    return user
+
 
 class UserController:
     @property
@@ -30,7 +48,7 @@ class UserController:
             )
 
         # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
 
         # Map Address if provided
         user_address = None
@@ -55,149 +73,201 @@ class UserController:
             role=UserRole.CUSTOMER,
         )
 
-        # Save to database
-        await self.engine.save(user)
+        # Save to database (the unique email index catches concurrent sign-ups)
+        try:
+            await self.engine.save(user)
+        except DuplicateKeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="User with this email already exists",
+            )
         logging.info(f"User registered: {user.email}")
 
-        # Convert to dict for proper serialization
-        user_dict = user.model_dump()
-        user_dict["id"] = str(user.id)
-        return user_dict
+        return ORJSONResponse(
+            _user_response(user.model_dump_doc()), status_code=status.HTTP_201_CREATED
+        )
 
     async def login_user(self, login_data: dict) -> dict:
         """Authenticate user and return token"""
         email = login_data.get("email")
         password = login_data.get("password")
 
-        user = await self.engine.find_one(User, User.email == email)
-        if not user or not verify_password(password, user.hashed_password):
+        # Only what the response and the password check need
+        user = await self.engine.get_collection(User).find_one(
+            {"email": email}, {**USER_PUBLIC_PROJECTION, "hashed_password": 1}
+        )
+        if not user or not await verify_password_async(
+            password, user["hashed_password"]
+        ):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        if user.status == UserStatus.BLOCKED:
+        if user["status"] == UserStatus.BLOCKED:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Account is blocked"
             )
 
         # Create access token
         access_token = create_access_token(
-            data={"sub": str(user.id), "email": user.email, "role": user.role}
+            data={"sub": str(user["_id"]), "email": user["email"], "role": user["role"]}
         )
 
-        # Convert user to dict for proper serialization
-        user_dict = user.model_dump()
-        user_dict["id"] = str(user.id)
-
-        return {"access_token": access_token, "token_type": "bearer", "user": user_dict}
+        return ORJSONResponse(
+            {
+                "access_token": access_token,
+                "token_type": "bearer",
+                "user": _user_response(user),
+            }
+        )
 
-    async def get_user_profile(self, user_id: str):
-        """Get user profile by ID"""
+    def _user_object_id(self, user_id: str) -> ObjectId:
         try:
-            user = await self.engine.find_one(User, User.id == ObjectId(user_id))
+            return ObjectId(user_id)
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid User ID"
             )
 
+    async def get_user_profile(self, user_id: str):
+        """Get user profile by ID"""
+        user = await user_crud.get_document(
+            self._user_object_id(user_id), USER_PUBLIC_PROJECTION
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
-
-        # Convert to dict for proper serialization
-        user_dict = user.model_dump()
-        user_dict["id"] = str(user.id)
-        return user_dict
+        return ORJSONResponse(_user_response(user))
 
     async def update_user_profile(self, user_id: str, update_data: dict):
-        """Update user profile - only allowed fields"""
-        user = await self.get_user_profile(user_id)
-
-        # Convert back to User model if it's a dict
-        if isinstance(user, dict):
-            user = await self.engine.find_one(User, User.id == ObjectId(user_id))
-
-        # Sanitize white-list of fields that can be updated directly
-        allowed_fields = ["first_name", "last_name", "mobile_number"]
-
-        updated = False
-        for field in allowed_fields:
-            if field in update_data and update_data[field] is not None:
-                setattr(user, field, update_data[field])
-                updated = True
-
-        if updated:
-            user.updated_at = datetime.utcnow()
-            await self.engine.save(user)
-
-        # Convert to dict for proper serialization
-        user_dict = user.model_dump()
-        user_dict["id"] = str(user.id)
-        return user_dict
+        """Update user profile - only allowed fields, in one round trip"""
+        user = await user_crud.update(
+            self._user_object_id(user_id),
+            update_data,
+            projection=USER_PUBLIC_PROJECTION,
+        )
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+        return ORJSONResponse(_user_response(user))
 
     async def forgot_password(self, email: str) -> dict:
         """Initiate password reset with OTP"""
-        user = await self.engine.find_one(User, User.email == email)
-        if not user:
+        # The account's own spelling keys the OTP, the lookup and the write
+        email = await user_crud.account_email(email)
+        if email is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
-        # Generate 6-digit OTP
-        otp = str(random.randint(100000, 999999))
-        user.otp = otp
-        user.otp_expiry = datetime.utcnow() + timedelta(minutes=10)
-
-        await self.engine.save(user)
+        # Generate 6-digit OTP (stored hashed in its own collection)
+        otp = await otp_store.issue(email)
 
-        # In a real app, send OTP via email/SMS here
-        logging.info(f"OTP for {email}: {otp}")
+        # In a real app, send `otp` via email/SMS here. Never log the code
+        # itself, at any level: log files outlive its expiry
+        logging.info(f"Password reset OTP issued for {email}")
 
         return {"message": "OTP sent to your email"}
 
     async def reset_password(self, reset_data: dict) -> dict:
         """Reset password using OTP"""
-        email = reset_data.get("email")
         otp = reset_data.get("otp")
         new_password = reset_data.get("new_password")
 
-        user = await self.engine.find_one(User, User.email == email)
-        if not user or user.otp != otp:
+        # Same account email as forgot_password, before the OTP is used up
+        email = await user_crud.account_email(reset_data.get("email"))
+        if email is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid OTP or email"
             )
 
-        if user.otp_expiry < datetime.utcnow():
+        # Check (and use up) the OTP before spending time on hashing
+        try:
+            await otp_store.verify(email, otp)
+        except ExpiredOtpError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="OTP expired"
             )
+        except InvalidOtpError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid OTP or email"
+            )
 
-        user.hashed_password = get_password_hash(new_password)
-        user.otp = None
-        user.otp_expiry = None
-        user.updated_at = datetime.utcnow()
-        await self.engine.save(user)
+        hashed_password = await hash_password_async(new_password)
+        if not await user_crud.set_password(email, hashed_password):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid OTP or email"
+            )
 
         return {"message": "Password reset successful"}
 
     async def delete_user(self, user_id: str) -> dict:
         """Delete user by ID"""
-        # First verify user exists
-        await self.get_user_profile(user_id)
-        # Get actual User object for deletion
-        user = await self.engine.find_one(User, User.id == ObjectId(user_id))
-        await self.engine.delete(user)
+        if not await user_crud.delete(self._user_object_id(user_id)):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
         return {"message": "User deleted successfully"}
 
-    async def get_all_users(self):
-        """List all users (Admin)"""
-        users = await self.engine.find(User)
+    def _users_cursor(self, after: Optional[str], fields: List[str]):
+        """Motor cursor over users ordered by _id, starting after a cursor id"""
+        query = {}
+        if after:
+            try:
+                query["_id"] = {"$gt": ObjectId(after)}
+            except Exception:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+                )
+        projection = {field: 1 for field in fields}
+        return (
+            self.engine.get_collection(User).find(query, projection).sort("_id", 1)
+        )
+
+    async def get_all_users(self, after: Optional[str] = None, limit: int = 100):
+        """List one page of users (Admin), using keyset pagination on _id"""
+        # Fetch one extra document to know whether another page exists
+        cursor = self._users_cursor(after, USER_PUBLIC_FIELDS).limit(limit + 1)
         result = []
-        for user in users:
-            user_dict = user.model_dump()
-            user_dict["id"] = str(user.id)
-            result.append(user_dict)
-        return result
+        async for doc in cursor:
+            result.append(_user_response(doc))
+
+        next_cursor = None
+        if len(result) > limit:
+            result = result[:limit]
+            next_cursor = result[-1]["id"]
+        return ORJSONResponse({"items": result, "next_cursor": next_cursor})
+
+    async def stream_all_users(
+        self,
+        after: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        """Export users (Admin) as NDJSON, one batch of lines per chunk"""
+        fields = fields or USER_PUBLIC_FIELDS
+        unknown = [field for field in fields if field not in USER_PUBLIC_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown)}",
+            )
+
+        cursor = self._users_cursor(after, fields).batch_size(batch_size)
+
+        async def generate():
+            lines = []
+            async for doc in cursor:
+                doc["id"] = str(doc.pop("_id"))
+                lines.append(orjson.dumps(doc))
+                if len(lines) >= batch_size:
+                    yield b"\n".join(lines) + b"\n"
+                    lines = []
+            if lines:
+                yield b"\n".join(lines) + b"\n"
+
+        return generate()
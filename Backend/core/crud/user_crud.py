@@ -1,20 +1,36 @@
-from core import logger
-from core.database.database import get_engine
-from core.models.user_model import User
-from core.apis.schemas.requests.user_request import UserCreateRequest
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
 from odmantic import ObjectId  ## for id to string
+from pymongo import ReturnDocument
+
+from core.database.database import get_engine
+from core.models.user_model import EMAIL_COLLATION, User
+from commons.loggers import logger
 
 logging = logger(__name__)
 
+# Profile fields a user may change themselves
+UPDATABLE_FIELDS = ("first_name", "last_name", "mobile_number")
+
+UserId = Union[str, ObjectId]
+
 
 class UserCRUD:
     def __init__(self):
         self.User = User
-        self.engine = get_engine()
+
+    @property
+    def engine(self):
+        return get_engine()
+
+    @property
+    def collection(self):
+        return self.engine.get_collection(User)
 
     async def create(self, user_data: dict):
         try:
-            logging.info("Executing UserCRUD.create function")
+            logging.debug("Executing UserCRUD.create function")
             user = User(**user_data)
             saved_user = await self.engine.save(user)
             logging.info(f"User created with ID: {saved_user.id}")
@@ -25,62 +41,137 @@ class UserCRUD:
 
     async def get_by_email(self, email: str):
         try:
-            logging.info("Executing UserCRUD.get_by_email function")
-            user = await self.engine.find_one(User, User.email == email)
-            logging.info(f"User found with email: {email}")
-            return user
+            logging.debug("Executing UserCRUD.get_by_email function")
+            return await self.engine.find_one(User, User.email == email)
         except Exception as error:
             logging.error(f"Error in UserCRUD.get_by_email: {str(error)}")
             raise error
 
-    async def get_by_id(self, user_id: str):
+    async def get_by_id(self, user_id: UserId):
         try:
-            logging.info("Executing UserCRUD.get_by_id function")
-            user = await self.engine.find_one(User, User.id == ObjectId(user_id))
-            logging.info(f"User found with ID: {user_id}")
-            return user
+            logging.debug("Executing UserCRUD.get_by_id function")
+            return await self.engine.find_one(User, User.id == ObjectId(user_id))
         except Exception as error:
             logging.error(f"Error in UserCRUD.get_by_id: {str(error)}")
             raise error
 
-    async def update(self, user_id: str, update_data: dict):
+    async def get_document(
+        self, user_id: UserId, projection: Optional[dict] = None
+    ) -> Optional[dict]:
+        """Raw user document, limited to `projection` if given"""
         try:
-            logging.info("Executing UserCRUD.update function")
-            user = await self.get_by_id(user_id)
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-                )
-            for key, value in update_data.items():
-                setattr(user, key, value)
-            updated_user = await self.engine.save(user)
-            logging.info(f"User updated with ID: {user_id}")
-            return updated_user
+            logging.debug("Executing UserCRUD.get_document function")
+            return await self.collection.find_one(
+                {"_id": ObjectId(user_id)}, projection
+            )
+        except Exception as error:
+            logging.error(f"Error in UserCRUD.get_document: {str(error)}")
+            raise error
+
+    async def update(
+        self,
+        user_id: UserId,
+        update_data: dict,
+        fields: Iterable[str] = UPDATABLE_FIELDS,
+        projection: Optional[dict] = None,
+    ) -> Optional[dict]:
+        """
+        Set the whitelisted, non-null fields of `update_data` in one round
+        trip. Returns the updated raw document, or None if the user doesn't
+        exist. Nothing to change is a plain read (updated_at is kept).
+        """
+        try:
+            logging.debug("Executing UserCRUD.update function")
+            changes = {
+                field: update_data[field]
+                for field in fields
+                if update_data.get(field) is not None
+            }
+            if not changes:
+                return await self.get_document(user_id, projection)
+
+            changes["updated_at"] = datetime.utcnow()
+            user = await self.collection.find_one_and_update(
+                {"_id": ObjectId(user_id)},
+                {"$set": changes},
+                projection=projection,
+                return_document=ReturnDocument.AFTER,
+            )
+            if user:
+                logging.info(f"User updated with ID: {user_id}")
+            return user
         except Exception as error:
             logging.error(f"Error in UserCRUD.update: {str(error)}")
             raise error
 
-    async def delete(self, user_id: str):
+    async def email_exists(self, email: str) -> bool:
+        try:
+            logging.debug("Executing UserCRUD.email_exists function")
+            user = await self.collection.find_one({"email": email}, {"_id": 1})
+            return user is not None
+        except Exception as error:
+            logging.error(f"Error in UserCRUD.email_exists: {str(error)}")
+            raise error
+
+    async def account_email(self, email: str) -> Optional[str]:
+        """
+        Email of the account registered under `email` in any case (the
+        exact spelling wins), None if there is none
+        """
         try:
-            logging.info("Executing UserCRUD.delete function")
-            user = await self.get_by_id(user_id)
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            logging.debug("Executing UserCRUD.account_email function")
+            user = await self.collection.find_one({"email": email}, {"email": 1})
+            if user is None:
+                user = await self.collection.find_one(
+                    {"email": email}, {"email": 1}, collation=EMAIL_COLLATION
                 )
-            await self.engine.delete(user)
-            logging.info(f"User deleted with ID: {user_id}")
-            return {"message": "User deleted successfully"}
+            return user["email"] if user else None
+        except Exception as error:
+            logging.error(f"Error in UserCRUD.account_email: {str(error)}")
+            raise error
+
+    async def set_password(self, email: str, hashed_password: str) -> bool:
+        """Replace the password hash in one write, False if no such user"""
+        try:
+            logging.debug("Executing UserCRUD.set_password function")
+            result = await self.collection.update_one(
+                {"email": email},
+                {
+                    "$set": {
+                        "hashed_password": hashed_password,
+                        "updated_at": datetime.utcnow(),
+                    }
+                },
+            )
+            return result.matched_count == 1
+        except Exception as error:
+            logging.error(f"Error in UserCRUD.set_password: {str(error)}")
+            raise error
+
+    async def delete(self, user_id: UserId) -> bool:
+        """Delete in one round trip, False if the user doesn't exist"""
+        try:
+            logging.debug("Executing UserCRUD.delete function")
+            user = await self.collection.find_one_and_delete(
+                {"_id": ObjectId(user_id)}, projection={"_id": 1}
+            )
+            if user:
+                logging.info(f"User deleted with ID: {user_id}")
+            return user is not None
         except Exception as error:
             logging.error(f"Error in UserCRUD.delete: {str(error)}")
             raise error
 
     async def get_all(self):
         try:
-            logging.info("Executing UserCRUD.get_all function")
+            logging.debug("Executing UserCRUD.get_all function")
             users = await self.engine.find(User)
             logging.info(f"Found {len(users)} users")
             return users
         except Exception as error:
             logging.error(f"Error in UserCRUD.get_all: {str(error)}")
             raise error
+
+
+# Shared instance used by the user controller
+user_crud = UserCRUD()
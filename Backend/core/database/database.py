@@ -1,20 +1,48 @@
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from odmantic import AIOEngine
+from pymongo import ReadPreference
 from dotenv import load_dotenv
 from commons.loggers import logger
+from commons.metrics import CommandMetricsListener, PoolMetricsListener, metrics
 
 load_dotenv()
 
 logging = logger(__name__)
 
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "authentication")
+
+# Connection pool settings
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(
+    os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")
+)
+
+# Read preference for catalog data (movies, theaters, screens, showtimes)
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+MONGO_CATALOG_READ_PREFERENCE = os.getenv(
+    "MONGO_CATALOG_READ_PREFERENCE", "secondaryPreferred"
+)
+
 
 class Database:
     # Step 1: Hold MongoDB client
     client: AsyncIOMotorClient | None = None
 
-    # Step 2: Hold ODMantic engine
+    # Step 2: Hold ODMantic engines
+    # - engine: primary reads/writes (users, bookings, transactions)
+    # - catalog_engine: catalog reads, routed with the catalog read preference
     engine: AIOEngine | None = None
+    catalog_engine: AIOEngine | None = None
 
 
 # Step 3: Create a single shared database instance
@@ -22,25 +50,36 @@ db_instance = Database()
 
 
 async def connect_to_mongo():
-    # Step 4: Create MongoDB client (lazy connection)
+    # Step 4: Create MongoDB client with an explicitly sized pool
+    db_instance.client = AsyncIOMotorClient(
+        MONGO_URL,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        event_listeners=[
+            CommandMetricsListener(metrics),
+            PoolMetricsListener(metrics),
+        ],
+    )
+
+    # Step 5: Create ODMantic engines sharing the client (and its pool)
+    db_instance.engine = AIOEngine(client=db_instance.client, database=DATABASE_NAME)
+
+    catalog_engine = AIOEngine(client=db_instance.client, database=DATABASE_NAME)
+    catalog_engine.database = db_instance.client.get_database(
+        DATABASE_NAME,
+        read_preference=READ_PREFERENCES[MONGO_CATALOG_READ_PREFERENCE],
+    )
+    db_instance.catalog_engine = catalog_engine
+
+    # Step 6: Force a real connection check, refuse to start without one
     try:
-        db_instance.client = AsyncIOMotorClient(
-            os.getenv("MONGO_URL", "mongodb://localhost:27017")
-        )
-
-        # Step 5: Create ODMantic engine using the client
-        db_instance.engine = AIOEngine(
-            client=db_instance.client,
-            database=os.getenv("DATABASE_NAME", "authentication"),
-        )
-
-        # Step 6: Force a real connection check
-        await db_instance.client[os.getenv("DATABASE_NAME", "authentication")].command(
-            "ping"
-        )
-        logging.info("Connected to MongoDB")
+        await db_instance.client[DATABASE_NAME].command("ping")
     except Exception as e:
         logging.error(f"Failed to connect to MongoDB: {e}")
+        raise
+    logging.info("Connected to MongoDB")
 
 
 async def close_mongo_connection():
@@ -53,3 +92,21 @@ async def close_mongo_connection():
 def get_engine() -> AIOEngine:
     # Step 8: Provide ODMantic engine for CRUD operations
     return db_instance.engine
+
+
+def get_catalog_engine() -> AIOEngine:
+    # Step 9: Provide the read-scaled engine for catalog reads.
+    # Never use it for bookings/transactions or read-your-own-write flows.
+    return db_instance.catalog_engine or db_instance.engine
+
+
+async def ping_database() -> bool:
+    # Step 10: Readiness probe - True when the primary answers a ping
+    if db_instance.client is None:
+        return False
+    try:
+        await db_instance.client[DATABASE_NAME].command("ping")
+        return True
+    except Exception as e:
+        logging.warning(f"MongoDB ping failed: {e}")
+        return False
@@ -0,0 +1,133 @@
+"""
+Index Registry
+==============
+Creates the indexes declared on every ODMantic model and reports drift.
+
+Indexes are declared next to the models (`Field(unique=True)` or the
+`indexes` entry of `model_config`). At startup `ensure_indexes` compares
+them with what exists in MongoDB:
+
+    - missing indexes are created (creating an existing index is a no-op)
+    - indexes with the same name but different keys/options are logged as drift
+    - indexes in MongoDB that no model declares are logged as extra
+
+Drifted indexes are never dropped automatically; fixing them is an
+operator decision.
+"""
+
+from typing import Dict, List
+
+import pymongo
+from odmantic import AIOEngine
+from odmantic.index import ODMBaseIndex
+
+from core.models import (
+    Booking,
+    IdempotencyRecord,
+    Movie,
+    OtpCode,
+    RevenueRollup,
+    Screen,
+    SeatClaim,
+    Showtime,
+    Theater,
+    Transaction,
+    User,
+)
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+# Every model whose indexes are managed at startup
+INDEXED_MODELS = [
+    User,
+    Movie,
+    Showtime,
+    Screen,
+    Theater,
+    Booking,
+    Transaction,
+    IdempotencyRecord,
+    OtpCode,
+    RevenueRollup,
+    SeatClaim,
+]
+
+# Index options that must match for two indexes to be considered equal
+COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+def declared_indexes(model) -> List[pymongo.IndexModel]:
+    """Return the model's declared indexes as pymongo IndexModels"""
+    return [
+        index.get_pymongo_index() if isinstance(index, ODMBaseIndex) else index
+        for index in model.__indexes__()
+    ]
+
+
+def _spec(document: dict) -> dict:
+    """Normalise an index document (declared or from index_information)"""
+    key = document["key"]
+    if isinstance(key, dict):
+        key = key.items()
+    spec = {"key": [(field, direction) for field, direction in key]}
+    for option in COMPARED_OPTIONS:
+        if document.get(option) not in (None, False):
+            spec[option] = document[option]
+    return spec
+
+
+async def ensure_indexes(engine: AIOEngine) -> Dict[str, dict]:
+    """
+    Create missing indexes for all models and log any drift
+
+    Returns:
+        Per-collection summary of created, drifted and extra index names
+    """
+    summary = {}
+    for model in INDEXED_MODELS:
+        collection = engine.get_collection(model)
+        existing = {
+            name: _spec(info)
+            for name, info in (await collection.index_information()).items()
+            if name != "_id_"
+        }
+
+        missing = []
+        drifted = []
+        declared_names = set()
+        for index in declared_indexes(model):
+            document = index.document
+            name = document["name"]
+            declared_names.add(name)
+            wanted = _spec(document)
+
+            current = existing.get(name)
+            if current is None:
+                missing.append(index)
+            elif current != wanted:
+                drifted.append(name)
+                logging.warning(
+                    f"Index drift on {model.__collection__}.{name}: "
+                    f"declared {wanted}, found {current}"
+                )
+
+        if missing:
+            await collection.create_indexes(missing)
+            logging.info(
+                f"Created indexes on {model.__collection__}: "
+                f"{', '.join(index.document['name'] for index in missing)}"
+            )
+
+        extra = sorted(set(existing) - declared_names)
+        if extra:
+            logging.warning(
+                f"Undeclared indexes on {model.__collection__}: {', '.join(extra)}"
+            )
+
+        summary[model.__collection__] = {
+            "created": [index.document["name"] for index in missing],
+            "drifted": drifted,
+            "extra": extra,
+        }
+    return summary
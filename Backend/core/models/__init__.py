@@ -4,6 +4,10 @@ from .showtime_model import Showtime
 from .theater_model import Theater, Screen
 from .booking_model import Booking, BookingStatus
 from .transaction_model import Transaction, TransactionStatus, PaymentMethod
+from .idempotency_model import IdempotencyRecord, IdempotencyState
+from .otp_model import OtpCode, OtpPurpose
+from .rollup_model import RevenueRollup
+from .seat_claim_model import SeatClaim
 
 __all__ = [
     "User",
@@ -19,4 +23,10 @@ __all__ = [
     "Transaction",
     "TransactionStatus",
     "PaymentMethod",
+    "IdempotencyRecord",
+    "IdempotencyState",
+    "OtpCode",
+    "OtpPurpose",
+    "RevenueRollup",
+    "SeatClaim",
 ]
@@ -1,7 +1,14 @@
+import os
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional
-from odmantic import Field, Model, ObjectId
+import pymongo
+from odmantic import Field, Index, Model, ObjectId
+
+# How long EXPIRED holds are kept (after expires_at) before Mongo deletes them
+EXPIRED_BOOKING_RETENTION_SECONDS = int(
+    os.getenv("EXPIRED_BOOKING_RETENTION_SECONDS", str(7 * 24 * 3600))
+)
 
 
 class BookingStatus(str, Enum):
@@ -30,4 +37,25 @@ class Booking(Model):
     # Optional: Track expiry for pending bookings (e.g. if payment not done in 10 mins)
     expires_at: Optional[datetime] = Field(default=None)
 
-    model_config = {"collection": "bookings"}
+    # Written with the PENDING -> CONFIRMED update, so the payment callback
+    # that confirmed the booking can tell its write from a concurrent one
+    confirmation_id: Optional[ObjectId] = Field(default=None)
+    # The payment that confirmed it; any other successful payment of the
+    # booking is owed a refund and is not revenue
+    transaction_id: Optional[ObjectId] = Field(default=None)
+
+    model_config = {
+        "collection": "bookings",
+        "indexes": lambda: [
+            Index(Booking.showtime_id, Booking.status),
+            # Restoring pending holds on startup
+            Index(Booking.status, Booking.expires_at),
+            # TTL clean-up of expired holds only; confirmed bookings are kept
+            pymongo.IndexModel(
+                [("expires_at", pymongo.ASCENDING)],
+                name="expires_at_ttl",
+                expireAfterSeconds=EXPIRED_BOOKING_RETENTION_SECONDS,
+                partialFilterExpression={"status": BookingStatus.EXPIRED.value},
+            ),
+        ],
+    }
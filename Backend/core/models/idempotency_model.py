@@ -0,0 +1,47 @@
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+import pymongo
+from odmantic import Field, Index, Model
+
+# How long a completed request can be replayed with the same Idempotency-Key
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+
+
+class IdempotencyState(str, Enum):
+    IN_PROGRESS = "IN_PROGRESS"
+    COMPLETED = "COMPLETED"
+
+
+class IdempotencyRecord(Model):
+    """
+    Outcome of a mutating request made with an Idempotency-Key.
+    """
+
+    # Caller + endpoint the key belongs to, e.g. "<user id>:POST /bookings"
+    scope: str = Field(..., description="Who/what the key is scoped to")
+    key: str = Field(..., description="Client supplied Idempotency-Key")
+
+    # Hash of the request payload, a reused key with another payload is rejected
+    fingerprint: str = Field(..., description="SHA-256 of the request payload")
+    state: IdempotencyState = Field(default=IdempotencyState.IN_PROGRESS)
+
+    # Cached response, replayed for retries once COMPLETED
+    status_code: Optional[int] = Field(default=None)
+    response_body: Optional[str] = Field(default=None)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(..., description="Mongo deletes the record after")
+
+    model_config = {
+        "collection": "idempotency_keys",
+        "indexes": lambda: [
+            Index(IdempotencyRecord.scope, IdempotencyRecord.key, unique=True),
+            pymongo.IndexModel(
+                [("expires_at", pymongo.ASCENDING)],
+                name="expires_at_ttl",
+                expireAfterSeconds=0,
+            ),
+        ],
+    }
@@ -2,7 +2,8 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
-from odmantic import Field, Model
+from odmantic import Field, Index, Model
+from odmantic.query import desc
 
 
 class MovieStatus(str, Enum):
@@ -34,4 +35,8 @@ class Movie(Model):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    model_config = {"collection": "movies"}
+    model_config = {
+        "collection": "movies",
+        # Catalog listings by status, newest releases first
+        "indexes": lambda: [Index(Movie.status, desc(Movie.release_date))],
+    }
@@ -0,0 +1,43 @@
+import os
+from datetime import datetime
+from enum import Enum
+import pymongo
+from odmantic import Field, Index, Model
+
+# How long an issued OTP can be used
+OTP_TTL_MINUTES = int(os.getenv("OTP_TTL_MINUTES", "10"))
+
+
+class OtpPurpose(str, Enum):
+    PASSWORD_RESET = "PASSWORD_RESET"
+
+
+class OtpCode(Model):
+    """
+    One-time password issued to an email, kept out of the users collection.
+
+    Only an HMAC of the code is stored. At most one code per email and
+    purpose exists; issuing a new one replaces it.
+    """
+
+    email: str = Field(..., description="Normalised (lower-case) email")
+    purpose: OtpPurpose = Field(default=OtpPurpose.PASSWORD_RESET)
+    otp_hash: str = Field(..., description="HMAC-SHA256 of the code")
+
+    # Failed verifications, the code is dead once it reaches OTP_MAX_ATTEMPTS
+    attempts: int = Field(default=0)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(..., description="Mongo deletes the code after")
+
+    model_config = {
+        "collection": "otp_codes",
+        "indexes": lambda: [
+            Index(OtpCode.email, OtpCode.purpose, unique=True),
+            pymongo.IndexModel(
+                [("expires_at", pymongo.ASCENDING)],
+                name="expires_at_ttl",
+                expireAfterSeconds=0,
+            ),
+        ],
+    }
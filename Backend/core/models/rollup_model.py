@@ -0,0 +1,49 @@
+from datetime import datetime
+from odmantic import Field, Index, Model, ObjectId
+
+
+class RevenueRollup(Model):
+    """
+    Precomputed sales of one movie on one screen on one (local) day.
+
+    Kept current by the booking flows and periodically recomputed from
+    bookings and transactions (see core.services.revenue_rollup), so owner
+    dashboards never aggregate raw bookings.
+    """
+
+    theater_id: ObjectId = Field(..., description="Reference to the Theater")
+    screen_id: ObjectId = Field(..., description="Reference to the Screen")
+    movie_id: ObjectId = Field(..., description="Reference to the Movie")
+    # Show date in the schedule timezone, "YYYY-MM-DD" (sorts as a date)
+    day: str = Field(..., description="Local date of the shows")
+
+    # Copied from the Theater, so dashboards filter without a join
+    owner_id: ObjectId = Field(..., description="Owner of the theater")
+
+    # Active shows and the seats they offered
+    shows: int = Field(default=0)
+    capacity: int = Field(default=0)
+
+    # CONFIRMED bookings and their successful payments
+    bookings: int = Field(default=0)
+    seats_sold: int = Field(default=0)
+    revenue: float = Field(default=0.0)
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = {
+        "collection": "revenue_rollups",
+        "indexes": lambda: [
+            # One document per key; theater + day range queries use the prefix
+            Index(
+                RevenueRollup.theater_id,
+                RevenueRollup.day,
+                RevenueRollup.screen_id,
+                RevenueRollup.movie_id,
+                unique=True,
+            ),
+            Index(RevenueRollup.owner_id, RevenueRollup.day),
+            # Admin dashboards and reconciliation windows
+            Index(RevenueRollup.day),
+        ],
+    }
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from odmantic import Field, Index, Model, ObjectId
+
+
+class SeatClaim(Model):
+    """
+    One seat of one showtime taken by a booking.
+
+    The unique (showtime, seat) index makes a seat claimable by a single
+    booking across every worker; see core.services.seat_claims.
+    """
+
+    showtime_id: ObjectId = Field(..., description="Reference to the Showtime")
+    seat: str = Field(..., description="Seat label e.g. C7")
+    booking_id: ObjectId = Field(..., description="Booking holding the seat")
+    claimed_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = {
+        "collection": "seat_claims",
+        "indexes": lambda: [
+            Index(SeatClaim.showtime_id, SeatClaim.seat, unique=True),
+            # Releasing a booking's seats
+            Index(SeatClaim.booking_id),
+        ],
+    }
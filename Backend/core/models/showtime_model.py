@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from odmantic import Field, Model, ObjectId
+from odmantic import Field, Index, Model, ObjectId
 
 
 class Showtime(Model):
@@ -26,4 +26,12 @@ class Showtime(Model):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    model_config = {"collection": "showtimes"}
+    model_config = {
+        "collection": "showtimes",
+        "indexes": lambda: [
+            Index(Showtime.movie_id, Showtime.start_time),
+            Index(Showtime.theater_id, Showtime.start_time),
+            # Overlap checks when scheduling a screen
+            Index(Showtime.screen_id, Showtime.start_time),
+        ],
+    }
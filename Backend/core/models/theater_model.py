@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import List, Optional
+import pydantic
 from pydantic import BaseModel
-from odmantic import Field, Model, ObjectId
+from odmantic import Field, Index, Model, ObjectId
 
 
 class SeatLayout(BaseModel):
@@ -10,9 +11,10 @@ class SeatLayout(BaseModel):
     Simplified as rows and columns or a list of seat labels.
     """
 
-    rows: int = Field(..., description="Number of rows")
-    columns: int = Field(..., description="Number of columns")
-    seat_types: dict = Field(
+    # pydantic's Field: odmantic's doesn't apply default_factory on plain models
+    rows: int = pydantic.Field(..., description="Number of rows")
+    columns: int = pydantic.Field(..., description="Number of columns")
+    seat_types: dict = pydantic.Field(
         default_factory=dict,
         description="Mapping of seat labels to types e.g. {'A1': 'GOLD'}",
     )
@@ -36,7 +38,10 @@ class Screen(Model):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    model_config = {"collection": "screens"}
+    model_config = {
+        "collection": "screens",
+        "indexes": lambda: [Index(Screen.theater_id)],
+    }
 
 
 class Theater(Model):
@@ -57,4 +62,7 @@ class Theater(Model):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    model_config = {"collection": "theaters"}
+    model_config = {
+        "collection": "theaters",
+        "indexes": lambda: [Index(Theater.location), Index(Theater.owner_id)],
+    }
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional
-from odmantic import Field, Model, ObjectId
+from odmantic import Field, Index, Model, ObjectId
 
 
 class PaymentMethod(str, Enum):
@@ -39,4 +39,7 @@ class Transaction(Model):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    model_config = {"collection": "transactions"}
+    model_config = {
+        "collection": "transactions",
+        "indexes": lambda: [Index(Transaction.booking_id)],
+    }
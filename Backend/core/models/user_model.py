@@ -2,9 +2,13 @@ from enum import Enum
 from typing import Optional
 from datetime import datetime
 
+import pymongo
 from odmantic import Field, Model, ObjectId
 from pydantic import BaseModel, EmailStr, field_validator
 
+# Compares emails ignoring case (emails are stored as given at sign-up)
+EMAIL_COLLATION = {"locale": "en", "strength": 2}
+
 
 class UserAddress(BaseModel):
     """
@@ -92,7 +96,9 @@ class User(Model):
     last_name: str = Field(
         ..., min_length=2, max_length=50, description="User's last name"
     )
-    email: EmailStr = Field(..., description="User's email address (must be unique)")
+    email: EmailStr = Field(
+        ..., unique=True, description="User's email address (must be unique)"
+    )
     mobile_number: str = Field(
         ...,
         min_length=10,
@@ -116,10 +122,6 @@ class User(Model):
         default=UserRole.CUSTOMER,
         description="User role (Customer, Theater Owner, etc.)",
     )
-    otp: Optional[str] = Field(default=None, description="OTP for password reset")
-    otp_expiry: Optional[datetime] = Field(
-        default=None, description="OTP expiry timestamp"
-    )
 
     @field_validator("mobile_number")
     @classmethod
@@ -130,4 +132,15 @@ class User(Model):
             raise ValueError("Mobile number must contain only digits")
         return value
 
-    model_config = {"collection": "users", "extra": "ignore"}
+    model_config = {
+        "collection": "users",
+        "extra": "ignore",
+        "indexes": lambda: [
+            # Password resets look accounts up in any case
+            pymongo.IndexModel(
+                [("email", pymongo.ASCENDING)],
+                name="email_case_insensitive",
+                collation=EMAIL_COLLATION,
+            ),
+        ],
+    }
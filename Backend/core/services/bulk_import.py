@@ -0,0 +1,387 @@
+"""
+Bulk Import Module
+==================
+Streams CSV or JSON Lines files into the catalog collections.
+
+Input is consumed as a stream of byte chunks and split into lines, so the
+file is never held in memory. Each row is validated against its ODMantic
+model and collected into a batch; full batches are reference-checked with
+one query per referenced collection and written with one unordered
+insert_many. The next batch is parsed while the previous one is written,
+so at most two batches are in memory at any time.
+
+    movies:     Movie fields
+    theaters:   Theater fields (owner_id)
+    screens:    Screen fields, theater_id must exist
+    showtimes:  Showtime fields, movie_id and screen_id must exist and the
+                screen must belong to theater_id; the show must last at
+                least the movie and, if active, must not overlap another
+                show on its screen (cleaning gap included, as in
+                core.services.screen_schedule; a dry run writes nothing, so
+                it only checks rows against stored shows and their batch)
+
+Rows may carry an `id` so later files can reference them (e.g. screens of
+theaters imported just before). CSV cells holding JSON (starting with
+"[" or "{", e.g. genres or layout) are decoded and empty cells are
+treated as missing; quoted line breaks inside CSV cells are not supported.
+
+Every rejected row is reported with its line number and reasons (up to
+IMPORT_MAX_ERRORS rows; later failures are only counted).
+
+Configuration (environment variables):
+    IMPORT_BATCH_SIZE: rows per insert_many (default: 1000)
+    IMPORT_MAX_ERRORS: rejected rows listed in a report (default: 1000)
+"""
+
+import asyncio
+import csv
+import json
+import os
+from datetime import timedelta
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from odmantic import Model
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from core.database.database import get_engine
+from core.models.movie_model import Movie
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen, Theater
+from core.services.screen_schedule import cleaning_gap, naive_utc, screen_scheduler
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+
+# Longest accepted line, longer ones are rejected without being buffered
+MAX_LINE_BYTES = 1024 * 1024
+
+IMPORT_MODELS: Dict[str, Type[Model]] = {
+    "movies": Movie,
+    "theaters": Theater,
+    "screens": Screen,
+    "showtimes": Showtime,
+}
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# (line number, parsed row or None, parse error)
+Row = Tuple[int, Optional[dict], Optional[str]]
+Batch = List[Tuple[int, Model]]
+
+
+class ImportFormatError(ValueError):
+    """Unknown collection or format, or an unusable CSV header"""
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """Decoded lines of a byte stream (None for a line that is too long)"""
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                yield None
+                continue
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        if len(buffer) > MAX_LINE_BYTES:
+            buffer = b""
+            skipping = True
+    if skipping:
+        yield None
+    elif buffer.strip():
+        yield buffer.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def _csv_value(cell: str):
+    if cell[:1] in ("[", "{"):
+        try:
+            return json.loads(cell)
+        except ValueError:
+            pass
+    return cell
+
+
+async def iter_rows(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[Row]:
+    """
+    Parse a CSV (with header) or JSONL stream into rows
+
+    Raises:
+        ImportFormatError: If the format is unknown or the CSV has no header
+    """
+    if format not in IMPORT_FORMATS:
+        raise ImportFormatError(f"Unknown format {format!r}")
+
+    header: Optional[List[str]] = None
+    number = 0
+    async for line in iter_lines(chunks):
+        number += 1
+        if line is None:
+            yield number, None, f"Line is longer than {MAX_LINE_BYTES} bytes"
+            continue
+        if not line.strip():
+            continue
+
+        if format == "jsonl":
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield number, None, "Expected a JSON object"
+                continue
+            yield number, row, None
+            continue
+
+        cells = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in cells]
+            if not all(header):
+                raise ImportFormatError("CSV header has empty column names")
+            continue
+        if len(cells) != len(header):
+            yield number, None, f"Expected {len(header)} columns, got {len(cells)}"
+            continue
+        yield number, {
+            name: _csv_value(cell) for name, cell in zip(header, cells) if cell != ""
+        }, None
+
+
+def _validation_messages(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+class ImportReport:
+    def __init__(self, collection: str, dry_run: bool):
+        self.collection = collection
+        self.dry_run = dry_run
+        self.rows = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.errors: List[dict] = []
+
+    def reject(self, line: int, messages: List[str]) -> None:
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "errors": messages})
+
+    def as_dict(self) -> dict:
+        return {
+            "collection": self.collection,
+            "dry_run": self.dry_run,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "errors_truncated": self.rejected > len(self.errors),
+        }
+
+
+class BulkImporter:
+    @property
+    def engine(self):
+        return get_engine()
+
+    async def _existing(self, model: Type[Model], ids, fields: dict) -> Dict:
+        """_id -> projected document, for the ids that exist"""
+        if not ids:
+            return {}
+        cursor = self.engine.get_collection(model).find(
+            {"_id": {"$in": list(ids)}}, fields
+        )
+        return {doc["_id"]: doc async for doc in cursor}
+
+    async def _check_references(self, collection: str, batch: Batch) -> Dict[int, str]:
+        """
+        Position in batch -> error, for rows pointing at missing documents
+        (and showtimes that don't fit the schedule)
+        """
+        errors: Dict[int, str] = {}
+        if collection == "screens":
+            theaters = await self._existing(
+                Theater, {screen.theater_id for _, screen in batch}, {"_id": 1}
+            )
+            for i, (_, screen) in enumerate(batch):
+                if screen.theater_id not in theaters:
+                    errors[i] = "theater_id: Theater not found"
+
+        elif collection == "showtimes":
+            movies = await self._existing(
+                Movie, {show.movie_id for _, show in batch}, {"duration_minutes": 1}
+            )
+            screens = await self._existing(
+                Screen, {show.screen_id for _, show in batch}, {"theater_id": 1}
+            )
+            for i, (_, show) in enumerate(batch):
+                if show.movie_id not in movies:
+                    errors[i] = "movie_id: Movie not found"
+                elif show.screen_id not in screens:
+                    errors[i] = "screen_id: Screen not found"
+                elif screens[show.screen_id]["theater_id"] != show.theater_id:
+                    errors[i] = "screen_id: Screen belongs to another theater"
+            await self._check_schedule(batch, movies, errors)
+        return errors
+
+    async def _check_schedule(
+        self, batch: Batch, movies: Dict, errors: Dict[int, str]
+    ) -> None:
+        """
+        Add the shows that are shorter than their movie or overlap another
+        active show on their screen to `errors`, the way the ScreenScheduler
+        checks uploads: one interval tree per screen, filled with the stored
+        shows and then with the accepted rows in file order
+        """
+        slots = {}
+        for i, (_, show) in enumerate(batch):
+            if i in errors:
+                continue
+            duration = movies[show.movie_id].get("duration_minutes")
+            show.start_time = naive_utc(show.start_time)
+            show.end_time = naive_utc(show.end_time)
+            if duration and show.end_time - show.start_time < timedelta(
+                minutes=duration
+            ):
+                errors[i] = (
+                    f"end_time: Show is shorter than the movie ({duration} minutes)"
+                )
+            elif show.is_active:
+                slots[i] = cleaning_gap(duration)
+        if not slots:
+            return
+
+        shows = [batch[i][1] for i in slots]
+        trees = await screen_scheduler.load_trees(
+            {show.screen_id for show in shows},
+            min(show.start_time for show in shows),
+            max(show.end_time + slots[i] for i, show in zip(slots, shows)),
+        )
+        for i, gap in slots.items():
+            line, show = batch[i]
+            tree = trees[show.screen_id]
+            conflicts = tree.overlaps(show.start_time, show.end_time + gap)
+            if conflicts:
+                errors[i] = (
+                    "start_time: Overlaps another show on this screen "
+                    f"({', '.join(conflicts)})"
+                )
+                continue
+            tree.add(show.start_time, show.end_time + gap, f"line {line}")
+
+    async def _write(
+        self,
+        collection: str,
+        batch: Batch,
+        report: ImportReport,
+        on_inserted: Optional[Callable[[List[Model]], None]],
+    ) -> None:
+        errors = await self._check_references(collection, batch)
+        for i, message in errors.items():
+            report.reject(batch[i][0], [message])
+        accepted = [entry for i, entry in enumerate(batch) if i not in errors]
+        if not accepted or report.dry_run:
+            return
+
+        failed: Dict[int, str] = {}
+        try:
+            await self.engine.get_collection(IMPORT_MODELS[collection]).insert_many(
+                [doc.model_dump_doc() for _, doc in accepted], ordered=False
+            )
+        except BulkWriteError as e:
+            failed = {
+                error["index"]: error.get("errmsg", "write failed")
+                for error in e.details.get("writeErrors", [])
+            }
+
+        inserted = []
+        for position, (line, doc) in enumerate(accepted):
+            if position in failed:
+                report.reject(line, [failed[position]])
+            else:
+                inserted.append(doc)
+        report.inserted += len(inserted)
+        if on_inserted is not None and inserted:
+            on_inserted(inserted)
+
+    async def run(
+        self,
+        collection: str,
+        chunks: AsyncIterator[bytes],
+        format: str = "jsonl",
+        dry_run: bool = False,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        on_inserted: Optional[Callable[[List[Model]], None]] = None,
+    ) -> dict:
+        """
+        Import a stream into a catalog collection
+
+        Args:
+            on_inserted: called with each batch of inserted documents
+
+        Raises:
+            ImportFormatError: If the collection or format is unknown
+        """
+        model = IMPORT_MODELS.get(collection)
+        if model is None:
+            raise ImportFormatError(f"Unknown collection {collection!r}")
+
+        report = ImportReport(collection, dry_run)
+        batch: Batch = []
+        writing: Optional[Awaitable] = None
+
+        async for line, row, error in iter_rows(chunks, format):
+            report.rows += 1
+            if error is not None:
+                report.reject(line, [error])
+                continue
+            try:
+                doc = model.model_validate(row)
+            except ValidationError as e:
+                report.reject(line, _validation_messages(e))
+                continue
+            if collection == "showtimes" and doc.end_time <= doc.start_time:
+                report.reject(line, ["end_time: must be after start_time"])
+                continue
+
+            batch.append((line, doc))
+            if len(batch) >= batch_size:
+                # Parse the next batch while this one is written
+                if writing is not None:
+                    await writing
+                writing = asyncio.ensure_future(
+                    self._write(collection, batch, report, on_inserted)
+                )
+                batch = []
+
+        if writing is not None:
+            await writing
+        if batch:
+            await self._write(collection, batch, report, on_inserted)
+
+        logging.info(
+            f"Imported {collection}: {report.rows} rows, {report.inserted} inserted, "
+            f"{report.rejected} rejected{' (dry run)' if dry_run else ''}"
+        )
+        return report.as_dict()
+
+
+# Shared instance used by the import route and CLI
+bulk_importer = BulkImporter()
@@ -0,0 +1,240 @@
+"""
+Hold Expiry Module
+==================
+Expires unpaid (PENDING) bookings at their `expires_at` deadline.
+
+Deadlines live in an in-memory min-heap instead of being discovered by
+polling the bookings collection. A single background task sleeps until
+the earliest deadline, then moves every due booking to EXPIRED with one
+`update_many` per batch. Only bookings that are EXPIRED afterwards return
+their seats (to the seat inventory and the seat claims); one confirmed or
+cancelled meanwhile keeps its seats or has released them already.
+
+On startup the heap is rebuilt from the PENDING bookings in Mongo, so
+holds survive restarts. Queue depth and expiry lag are exported as
+`hold_expiry_*` gauges at /metrics.
+"""
+
+import asyncio
+import heapq
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from odmantic import ObjectId
+
+from core.database.database import get_engine
+from core.models.booking_model import Booking, BookingStatus
+from core.services.seat_claims import seat_claims
+from core.services.seat_inventory import seat_inventory
+from commons.loggers import logger
+from commons.metrics import metrics
+
+logging = logger(__name__)
+
+HOLD_EXPIRY_BATCH_SIZE = int(os.getenv("HOLD_EXPIRY_BATCH_SIZE", "500"))
+HOLD_EXPIRY_RETRY_SECONDS = float(os.getenv("HOLD_EXPIRY_RETRY_SECONDS", "1"))
+
+
+def to_timestamp(value: datetime) -> float:
+    """Convert a (naive UTC or aware) datetime to a POSIX timestamp"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class HoldExpiryScheduler:
+    """
+    Min-heap of (deadline, booking_id) driving booking expiry.
+
+    Cancelled or rescheduled holds are removed lazily: the heap entry stays
+    until it reaches the top and is skipped if it no longer matches
+    `self._entries`.
+    """
+
+    def __init__(self, batch_size: int = HOLD_EXPIRY_BATCH_SIZE):
+        self.batch_size = batch_size
+
+        self._heap: List[Tuple[float, str]] = []
+        # booking id -> (deadline, showtime id)
+        self._entries: Dict[str, Tuple[float, str]] = {}
+
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.expired_total = 0
+        self.batches_total = 0
+        self.failed_batches_total = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+    @property
+    def engine(self):
+        return get_engine()
+
+    # ------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------
+
+    def schedule(self, booking_id: str, showtime_id: str, expires_at: datetime):
+        """Register (or move) the expiry deadline of a PENDING booking"""
+        booking_id = str(booking_id)
+        deadline = to_timestamp(expires_at)
+        self._entries[booking_id] = (deadline, str(showtime_id))
+        heapq.heappush(self._heap, (deadline, booking_id))
+
+        # Wake the runner if this is now the earliest deadline
+        if self._heap[0][1] == booking_id:
+            self._wakeup.set()
+
+    def cancel(self, booking_id: str) -> None:
+        """Forget a hold, e.g. once the booking is paid or cancelled"""
+        self._entries.pop(str(booking_id), None)
+
+    def _pop_due(self, now: float) -> List[Tuple[str, str, float]]:
+        """Pop up to batch_size live entries whose deadline has passed"""
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            deadline, booking_id = heapq.heappop(self._heap)
+            entry = self._entries.get(booking_id)
+            if entry is None or entry[0] != deadline:
+                continue  # cancelled or rescheduled
+            del self._entries[booking_id]
+            due.append((booking_id, entry[1], deadline))
+        return due
+
+    # ------------------------------------------------------------
+    # Expiry
+    # ------------------------------------------------------------
+
+    async def _expire(self, due: List[Tuple[str, str, float]]) -> None:
+        collection = self.engine.get_collection(Booking)
+        ids = [ObjectId(booking_id) for booking_id, _, _ in due]
+        try:
+            await collection.update_many(
+                {"_id": {"$in": ids}, "status": BookingStatus.PENDING.value},
+                {"$set": {"status": BookingStatus.EXPIRED.value}},
+            )
+            # Bookings confirmed or cancelled in the meantime were not updated
+            expired = [
+                doc["_id"]
+                async for doc in collection.find(
+                    {"_id": {"$in": ids}, "status": BookingStatus.EXPIRED.value},
+                    {"_id": 1},
+                )
+            ]
+            await seat_claims.release(expired)
+        except Exception as e:
+            logging.error(f"Failed to expire {len(due)} bookings: {e}")
+            self.failed_batches_total += 1
+            retry_at = time.time() + HOLD_EXPIRY_RETRY_SECONDS
+            for booking_id, showtime_id, _ in due:
+                self._entries[booking_id] = (retry_at, showtime_id)
+                heapq.heappush(self._heap, (retry_at, booking_id))
+            return
+
+        expired_ids = {str(booking_id) for booking_id in expired}
+        for booking_id, showtime_id, _ in due:
+            if booking_id not in expired_ids:
+                continue
+            inventory = seat_inventory.peek(showtime_id)
+            if inventory is not None:
+                inventory.release(booking_id, held_only=True)
+
+        now = time.time()
+        lag = max(now - min(deadline for _, _, deadline in due), 0.0)
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+        self.expired_total += len(expired)
+        self.batches_total += 1
+        logging.info(f"Expired {len(expired)} pending bookings (lag {lag:.3f}s)")
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if self._heap:
+                delay = self._heap[0][0] - time.time()
+            else:
+                delay = None
+
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = self._pop_due(time.time())
+            if due:
+                await self._expire(due)
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    async def restore(self) -> int:
+        """Load every PENDING booking with a deadline from Mongo"""
+        cursor = self.engine.get_collection(Booking).find(
+            {"status": BookingStatus.PENDING.value, "expires_at": {"$ne": None}},
+            {"showtime_id": 1, "expires_at": 1},
+        )
+        count = 0
+        async for doc in cursor:
+            self._entries[str(doc["_id"])] = (
+                to_timestamp(doc["expires_at"]),
+                str(doc["showtime_id"]),
+            )
+            count += 1
+
+        self._heap = [
+            (deadline, booking_id)
+            for booking_id, (deadline, _) in self._entries.items()
+        ]
+        heapq.heapify(self._heap)
+        return count
+
+    async def start(self) -> None:
+        try:
+            restored = await self.restore()
+        except Exception as e:
+            logging.error(f"Failed to restore pending holds: {e}")
+            restored = 0
+        self._task = asyncio.create_task(self._run())
+        logging.info(f"Hold expiry scheduler started with {restored} pending holds")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logging.info("Hold expiry scheduler stopped")
+
+    def metrics(self) -> dict:
+        next_deadline = self._heap[0][0] if self._heap else None
+        now = time.time()
+        return {
+            "queue_depth": len(self._entries),
+            "heap_size": len(self._heap),
+            "expired_total": self.expired_total,
+            "batches_total": self.batches_total,
+            "failed_batches_total": self.failed_batches_total,
+            "last_lag_seconds": self.last_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "next_deadline_in_seconds": (
+                max(next_deadline - now, 0.0) if next_deadline is not None else None
+            ),
+            # How far behind the earliest deadline the runner is right now
+            "overdue_seconds": (
+                max(now - next_deadline, 0.0) if next_deadline is not None else 0.0
+            ),
+        }
+
+
+# Shared instance started by the API lifespan
+hold_expiry_scheduler = HoldExpiryScheduler()
+metrics.register_collector("hold_expiry", hold_expiry_scheduler.metrics)
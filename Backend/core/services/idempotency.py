@@ -0,0 +1,177 @@
+"""
+Idempotency Module
+==================
+Makes mutating endpoints safe to retry with an `Idempotency-Key` header.
+
+The first request with a key records an IN_PROGRESS entry (unique on
+scope + key), runs the work and stores the response as COMPLETED.
+Retries with the same key:
+    - replay the stored response without running the work again
+    - get 409 while the first request is still running
+    - get 422 if the key is reused for a different payload
+
+If the work fails the entry is removed so the client can retry. An entry
+stuck IN_PROGRESS (e.g. the process died mid-request) can be taken over
+after IDEMPOTENCY_LOCK_SECONDS. MongoDB's TTL monitor deletes entries at
+`expires_at` (IDEMPOTENCY_KEY_TTL_SECONDS after creation).
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, Type
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from odmantic.exceptions import DuplicateKeyError
+from pydantic import BaseModel
+
+from core.database.database import get_engine
+from core.models.idempotency_model import (
+    IDEMPOTENCY_KEY_TTL_SECONDS,
+    IdempotencyRecord,
+    IdempotencyState,
+)
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable hash of a request payload"""
+    encoded = json.dumps(jsonable_encoder(payload), sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class IdempotencyStore:
+    @property
+    def engine(self):
+        return get_engine()
+
+    async def _begin(
+        self, scope: str, key: str, request_hash: str
+    ) -> tuple[IdempotencyRecord, bool]:
+        """Claim the key. Returns (record, True) if this request owns the work."""
+        now = datetime.utcnow()
+        record = IdempotencyRecord(
+            scope=scope,
+            key=key,
+            fingerprint=request_hash,
+            created_at=now,
+            expires_at=now + timedelta(seconds=IDEMPOTENCY_KEY_TTL_SECONDS),
+        )
+        try:
+            await self.engine.save(record)
+            return record, True
+        except DuplicateKeyError:
+            pass
+
+        # Take over an entry whose owner stopped responding
+        collection = self.engine.get_collection(IdempotencyRecord)
+        lock_expired = now - timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)
+        stale = await collection.find_one_and_update(
+            {
+                "scope": scope,
+                "key": key,
+                "fingerprint": request_hash,
+                "state": IdempotencyState.IN_PROGRESS.value,
+                "created_at": {"$lt": lock_expired},
+            },
+            {"$set": {"created_at": now}},
+        )
+        if stale is not None:
+            logging.warning(f"Taking over stale idempotency key {scope}/{key}")
+            stale["created_at"] = now
+            return IdempotencyRecord.model_validate_doc(stale), True
+
+        existing = await self.engine.find_one(
+            IdempotencyRecord,
+            IdempotencyRecord.scope == scope,
+            IdempotencyRecord.key == key,
+        )
+        if existing is None:
+            # Removed after a failure between our insert and lookup, try again
+            return await self._begin(scope, key, request_hash)
+        return existing, False
+
+    @staticmethod
+    def _replay(record: IdempotencyRecord, request_hash: str) -> Response:
+        if record.fingerprint != request_hash:
+            raise HTTPException(
+                status_code=422,  # name differs across Starlette versions
+                detail="Idempotency-Key was already used with a different request",
+            )
+        if record.state != IdempotencyState.COMPLETED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress",
+                headers={"Retry-After": "1"},
+            )
+        return Response(
+            content=record.response_body,
+            status_code=record.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    async def run(
+        self,
+        scope: str,
+        key: Optional[str],
+        payload: Any,
+        action: Callable[[], Awaitable[Any]],
+        response_model: Optional[Type[BaseModel]] = None,
+        status_code: int = status.HTTP_200_OK,
+    ) -> Any:
+        """
+        Run `action` at most once per (scope, key)
+
+        Without a key the action simply runs and its result is returned.
+        With a key the (serialised) result is stored and returned as a
+        Response, and retries replay it.
+        """
+        if key is None:
+            return await action()
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} "
+                "characters",
+            )
+
+        request_hash = fingerprint(payload)
+        record, owner = await self._begin(scope, key, request_hash)
+        if not owner:
+            return self._replay(record, request_hash)
+
+        try:
+            result = await action()
+        except BaseException:
+            # Nothing was done, let the client retry with the same key
+            await self.engine.delete(record)
+            raise
+
+        if response_model is not None:
+            result = response_model.model_validate(result)
+        body = json.dumps(jsonable_encoder(result))
+
+        record.state = IdempotencyState.COMPLETED
+        record.status_code = status_code
+        record.response_body = body
+        try:
+            await self.engine.save(record)
+        except Exception as e:
+            # The work is done; a retry may repeat it, but don't fail this one
+            logging.error(f"Failed to store idempotent response {scope}/{key}: {e}")
+
+        return Response(
+            content=body, status_code=status_code, media_type="application/json"
+        )
+
+
+# Shared instance used by the booking and payment flows
+idempotency_store = IdempotencyStore()
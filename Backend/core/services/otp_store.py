@@ -0,0 +1,158 @@
+"""
+OTP Store Module
+================
+Issues and verifies one-time passwords in their own collection.
+
+Codes live in `otp_codes` (see OtpCode), one document per email and
+purpose, so password reset traffic never rewrites user documents:
+
+    issue:   one upsert (replaces any previous code, resets attempts)
+    verify:  one find_one_and_delete matching the code's HMAC, unexpired and
+             not locked; only a wrong code costs a second write to count
+             the failed attempt
+
+Expired codes are removed by a TTL index. Only an HMAC of the code is
+stored, keyed with OTP_SECRET_KEY.
+
+Emails with no usable code (none issued, expired, or locked after too
+many attempts) are remembered in an in-process cache for
+OTP_NEGATIVE_CACHE_SECONDS, so repeated guesses are rejected without a
+database round trip. Issuing a code in this process clears the entry;
+a code issued by another worker is picked up once the entry expires.
+
+Configuration (environment variables):
+    OTP_TTL_MINUTES:            code lifetime (default: 10)
+    OTP_MAX_ATTEMPTS:           wrong guesses before a code is locked
+                                (default: 5)
+    OTP_SECRET_KEY:             HMAC key for stored codes (default: the JWT
+                                secret)
+    OTP_NEGATIVE_CACHE_SECONDS: how long a dead email is remembered
+                                (default: 30)
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+from commons.auth import SECRET_KEY
+from commons.cache import TTLCache
+from core.database.database import get_engine
+from core.models.otp_model import OTP_TTL_MINUTES, OtpCode, OtpPurpose
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", "5"))
+OTP_SECRET_KEY = os.getenv("OTP_SECRET_KEY", SECRET_KEY).encode()
+OTP_NEGATIVE_CACHE_SECONDS = float(os.getenv("OTP_NEGATIVE_CACHE_SECONDS", "30"))
+
+
+class OtpError(Exception):
+    """Base class for OTP verification failures"""
+
+
+class InvalidOtpError(OtpError):
+    """Wrong code, no code issued, or too many attempts"""
+
+
+class ExpiredOtpError(OtpError):
+    """The code was right once, but it is past its expiry"""
+
+
+def _normalise(email: str) -> str:
+    return email.strip().lower()
+
+
+def _hash(purpose: OtpPurpose, email: str, otp: str) -> str:
+    message = f"{purpose.value}:{email}:{otp}".encode()
+    return hmac.new(OTP_SECRET_KEY, message, hashlib.sha256).hexdigest()
+
+
+class OtpStore:
+    def __init__(self):
+        # (purpose, email) -> reason, for emails with no usable code
+        self.dead = TTLCache(
+            "otp_dead", max_size=100_000, ttl_seconds=OTP_NEGATIVE_CACHE_SECONDS
+        )
+
+    @property
+    def collection(self):
+        return get_engine().get_collection(OtpCode)
+
+    async def issue(
+        self, email: str, purpose: OtpPurpose = OtpPurpose.PASSWORD_RESET
+    ) -> str:
+        """Create a new code for the email, replacing any previous one"""
+        email = _normalise(email)
+        otp = f"{secrets.randbelow(1_000_000):06d}"
+        now = datetime.utcnow()
+        await self.collection.update_one(
+            {"email": email, "purpose": purpose.value},
+            {
+                "$set": {
+                    "otp_hash": _hash(purpose, email, otp),
+                    "attempts": 0,
+                    "created_at": now,
+                    "expires_at": now + timedelta(minutes=OTP_TTL_MINUTES),
+                }
+            },
+            upsert=True,
+        )
+        self.dead.delete((purpose, email))
+        return otp
+
+    async def verify(
+        self, email: str, otp: str, purpose: OtpPurpose = OtpPurpose.PASSWORD_RESET
+    ) -> None:
+        """
+        Check and consume a code
+
+        Raises:
+            InvalidOtpError: If the code is wrong, missing or locked
+            ExpiredOtpError: If the code has expired
+        """
+        email = _normalise(email)
+        key = (purpose, email)
+        reason = self.dead.get(key)
+        if reason is not None:
+            raise (ExpiredOtpError if reason == "expired" else InvalidOtpError)()
+
+        now = datetime.utcnow()
+        consumed = await self.collection.find_one_and_delete(
+            {
+                "email": email,
+                "purpose": purpose.value,
+                "otp_hash": _hash(purpose, email, otp),
+                "expires_at": {"$gt": now},
+                "attempts": {"$lt": OTP_MAX_ATTEMPTS},
+            },
+            projection={"_id": 1},
+        )
+        if consumed:
+            return
+
+        # Wrong, expired or locked: count the attempt and find out which
+        code = await self.collection.find_one_and_update(
+            {"email": email, "purpose": purpose.value},
+            {"$inc": {"attempts": 1}},
+            projection={"otp_hash": 1, "expires_at": 1, "attempts": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        if code is None:
+            self.dead.set(key, "missing")
+            raise InvalidOtpError()
+        if code["expires_at"] <= now:
+            self.dead.set(key, "expired")
+            raise ExpiredOtpError()
+        if code["attempts"] >= OTP_MAX_ATTEMPTS:
+            logging.warning(f"OTP locked after {code['attempts']} attempts: {email}")
+            self.dead.set(key, "locked")
+        raise InvalidOtpError()
+
+
+# Shared instance used by the password reset flow
+otp_store = OtpStore()
@@ -0,0 +1,428 @@
+"""
+Payment Confirmation Module
+===========================
+Applies gateway payment callbacks in batches.
+
+A SUCCESS callback moves its Transaction from INITIATED to SUCCESS and the
+Booking from PENDING to CONFIRMED; a FAILED callback only marks the
+Transaction FAILED (the booking stays held until it expires, so the
+customer can retry). Instead of two round-trips per ticket, a batch costs:
+
+    1. one find over the transactions
+    2. one find over their bookings
+    3. one unordered bulk_write on transactions
+    4. one unordered bulk_write on bookings
+    (+ a verification find per collection only if some update didn't match)
+    (+ one bulk_write on the revenue rollups for the confirmed bookings)
+
+Every callback gets its own result; one bad item never fails the batch.
+
+Callbacks can be applied as an explicit batch (`confirm_batch`) or
+submitted one by one (`submit`); single submissions are grouped for up to
+PAYMENT_CONFIRM_WINDOW_MS or PAYMENT_CONFIRM_BATCH_SIZE callbacks. While
+the grouping task isn't running (before start, after stop, or after it
+died) a submitted callback is applied on its own instead. stop() lets the
+task finish its batch and applies whatever is still queued, so every
+submitter gets an answer.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from odmantic import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from core.database.database import get_engine
+from core.models.booking_model import Booking, BookingStatus
+from core.models.transaction_model import Transaction, TransactionStatus
+from core.services.hold_expiry import hold_expiry_scheduler
+from core.services.revenue_rollup import revenue_rollups
+from core.services.seat_inventory import seat_inventory
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+PAYMENT_CONFIRM_BATCH_SIZE = int(os.getenv("PAYMENT_CONFIRM_BATCH_SIZE", "500"))
+PAYMENT_CONFIRM_WINDOW_MS = float(os.getenv("PAYMENT_CONFIRM_WINDOW_MS", "20"))
+
+
+def _result(transaction_id: str, ok: bool, **fields) -> dict:
+    return {"transaction_id": transaction_id, "ok": ok, **fields}
+
+
+def _write_errors(error: BulkWriteError) -> Dict[int, str]:
+    """Operation index -> error message of a failed unordered bulk_write"""
+    return {
+        item["index"]: item.get("errmsg", "write failed")
+        for item in error.details.get("writeErrors", [])
+    }
+
+
+class PaymentConfirmationPipeline:
+    def __init__(
+        self,
+        batch_size: int = PAYMENT_CONFIRM_BATCH_SIZE,
+        window_seconds: float = PAYMENT_CONFIRM_WINDOW_MS / 1000,
+    ):
+        self.batch_size = batch_size
+        self.window_seconds = window_seconds
+
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Metrics
+        self.batches_total = 0
+        self.callbacks_total = 0
+        self.failed_total = 0
+
+    @property
+    def engine(self):
+        return get_engine()
+
+    # ------------------------------------------------------------
+    # Batch processing
+    # ------------------------------------------------------------
+
+    async def confirm_batch(self, callbacks: List[dict]) -> List[dict]:
+        """Apply callbacks ({transaction_id, status, gateway_transaction_id})"""
+        results = []
+        for start in range(0, len(callbacks), self.batch_size):
+            batch = callbacks[start : start + self.batch_size]
+            results.extend(await self._process(batch))
+        return results
+
+    async def _process(self, callbacks: List[dict]) -> List[dict]:
+        results: List[Optional[dict]] = [None] * len(callbacks)
+        now = datetime.utcnow()
+
+        # Step 1: Parse ids, first callback per transaction wins
+        requested: Dict[ObjectId, int] = {}
+        for i, callback in enumerate(callbacks):
+            transaction_id = callback["transaction_id"]
+            try:
+                oid = ObjectId(transaction_id)
+            except Exception:
+                results[i] = _result(
+                    transaction_id, False, error="Invalid transaction ID"
+                )
+                continue
+            if oid in requested:
+                results[i] = _result(
+                    transaction_id, False, error="Duplicate callback in batch"
+                )
+                continue
+            requested[oid] = i
+
+        # Step 2: Load the transactions and their bookings (one find each)
+        transactions = self.engine.get_collection(Transaction)
+        bookings = self.engine.get_collection(Booking)
+        found = {
+            doc["_id"]: doc
+            async for doc in transactions.find(
+                {"_id": {"$in": list(requested)}},
+                {"booking_id": 1, "status": 1, "amount": 1},
+            )
+        }
+        booking_docs = {
+            doc["_id"]: doc
+            async for doc in bookings.find(
+                {"_id": {"$in": [doc["booking_id"] for doc in found.values()]}},
+                {"status": 1, "showtime_id": 1, "expires_at": 1, "seats": 1},
+            )
+        }
+
+        # Step 3: Decide what to write for each callback
+        transaction_ops: List[UpdateOne] = []
+        transaction_items: List[Tuple[ObjectId, int]] = []
+        redelivered: List[int] = []
+        for oid, i in requested.items():
+            callback = callbacks[i]
+            doc = found.get(oid)
+            if doc is None:
+                results[i] = _result(str(oid), False, error="Transaction not found")
+                continue
+
+            booking = booking_docs.get(doc["booking_id"], {})
+            results[i] = _result(
+                str(oid),
+                True,
+                booking_id=str(doc["booking_id"]),
+                transaction_status=doc["status"],
+                booking_status=booking.get("status"),
+            )
+            if doc["status"] == callback["status"]:
+                # Gateway re-delivered a callback we already applied; retry
+                # the booking only if it didn't get confirmed the first time
+                if booking.get("status") == BookingStatus.PENDING.value:
+                    redelivered.append(i)
+                continue
+            if doc["status"] != TransactionStatus.INITIATED.value:
+                results[i].update(
+                    ok=False, error=f"Transaction is already {doc['status']}"
+                )
+                continue
+
+            transaction_ops.append(
+                UpdateOne(
+                    {"_id": oid, "status": TransactionStatus.INITIATED.value},
+                    {
+                        "$set": {
+                            "status": callback["status"],
+                            "gateway_transaction_id": callback.get(
+                                "gateway_transaction_id"
+                            ),
+                            "updated_at": now,
+                        }
+                    },
+                )
+            )
+            transaction_items.append((oid, i))
+
+        # Step 4: Transactions, one unordered bulk write
+        errors, current = await self._bulk_write(
+            transactions, transaction_ops, [oid for oid, _ in transaction_items]
+        )
+        applied: List[int] = redelivered
+        for op_index, (oid, i) in enumerate(transaction_items):
+            wanted = callbacks[i]["status"]
+            state = current.get(oid, {}).get("status") if current is not None else None
+            if op_index in errors:
+                results[i].update(ok=False, error=errors[op_index])
+            elif current is not None and state != wanted:
+                results[i].update(
+                    ok=False,
+                    transaction_status=state,
+                    error="Transaction was updated concurrently",
+                )
+            else:
+                results[i]["transaction_status"] = wanted
+                applied.append(i)
+
+        # Step 5: Bookings of successful payments, one unordered bulk write.
+        # Each update carries its own confirmation_id: if some didn't match,
+        # the re-read shows which bookings this batch actually confirmed
+        booking_ops: List[UpdateOne] = []
+        booking_items: List[Tuple[ObjectId, int, ObjectId]] = []
+        for i in applied:
+            if callbacks[i]["status"] != TransactionStatus.SUCCESS.value:
+                continue
+            booking_id = ObjectId(results[i]["booking_id"])
+            # Stop the expiry timer first, so it can't race the confirmation
+            hold_expiry_scheduler.cancel(booking_id)
+            confirmation_id = ObjectId()
+            booking_ops.append(
+                UpdateOne(
+                    {"_id": booking_id, "status": BookingStatus.PENDING.value},
+                    {
+                        "$set": {
+                            "status": BookingStatus.CONFIRMED.value,
+                            "confirmation_id": confirmation_id,
+                            "transaction_id": ObjectId(results[i]["transaction_id"]),
+                        }
+                    },
+                )
+            )
+            booking_items.append((booking_id, i, confirmation_id))
+
+        errors, current = await self._bulk_write(
+            bookings,
+            booking_ops,
+            [booking_id for booking_id, _, _ in booking_items],
+            {"status": 1, "confirmation_id": 1},
+        )
+        confirmed: List[Tuple[ObjectId, int]] = []
+        for op_index, (booking_id, i, confirmation_id) in enumerate(booking_items):
+            state = BookingStatus.CONFIRMED.value
+            ours = True
+            if current is not None:
+                doc = current.get(booking_id, {})
+                state = doc.get("status")
+                # Confirmed by another payment or batch: not a new sale
+                ours = doc.get("confirmation_id") == confirmation_id
+            if op_index not in errors and ours:
+                results[i]["booking_status"] = state
+                confirmed.append((booking_id, i))
+                continue
+
+            refund = f"Booking is {state or 'missing'}, payment needs a refund"
+            results[i].update(
+                ok=False, booking_status=state, error=errors.get(op_index, refund)
+            )
+            booking = booking_docs.get(booking_id, {})
+            if state == BookingStatus.PENDING.value and booking.get("expires_at"):
+                # Write failed, keep expiring the hold as before
+                hold_expiry_scheduler.schedule(
+                    booking_id, booking["showtime_id"], booking["expires_at"]
+                )
+
+        # Step 6: Mark the seats sold in memory
+        for booking_id, _ in confirmed:
+            showtime_id = booking_docs[booking_id]["showtime_id"]
+            inventory = seat_inventory.peek(showtime_id)
+            if inventory is not None and not inventory.confirm(str(booking_id)):
+                # Released in memory meanwhile, reload from Mongo on next use
+                seat_inventory.evict(showtime_id)
+
+        # Step 7: Add the sales to the theater owners' revenue rollups
+        await revenue_rollups.record_bookings(
+            [
+                (
+                    booking_docs[booking_id]["showtime_id"],
+                    len(booking_docs[booking_id]["seats"]),
+                    found[ObjectId(results[i]["transaction_id"])]["amount"],
+                )
+                for booking_id, i in confirmed
+            ]
+        )
+
+        failures = sum(1 for result in results if not result["ok"])
+        self.batches_total += 1
+        self.callbacks_total += len(callbacks)
+        self.failed_total += failures
+        logging.info(
+            f"Applied {len(callbacks)} payment callbacks "
+            f"({len(confirmed)} bookings confirmed, {failures} failed)"
+        )
+        return results
+
+    async def _bulk_write(
+        self,
+        collection,
+        ops: List[UpdateOne],
+        ids: List[ObjectId],
+        fields: Optional[dict] = None,
+    ) -> Tuple[Dict[int, str], Optional[Dict[ObjectId, dict]]]:
+        """
+        Run an unordered bulk_write of status updates
+
+        Returns per-operation errors, plus the current `fields` (default:
+        status) of every targeted document when some update didn't match
+        (another writer got there first); None when everything matched.
+        """
+        if not ops:
+            return {}, None
+        try:
+            result = await collection.bulk_write(ops, ordered=False)
+            matched = result.matched_count
+            errors = {}
+        except BulkWriteError as e:
+            matched = e.details.get("nMatched", 0)
+            errors = _write_errors(e)
+        except Exception as e:
+            logging.error(f"Bulk write on {collection.name} failed: {e}")
+            return {index: "Database error" for index in range(len(ops))}, None
+
+        if matched == len(ops) - len(errors):
+            return errors, None
+        current = {
+            doc["_id"]: doc
+            async for doc in collection.find(
+                {"_id": {"$in": ids}}, fields or {"status": 1}
+            )
+        }
+        return errors, current
+
+    # ------------------------------------------------------------
+    # Grouping single callbacks
+    # ------------------------------------------------------------
+
+    async def submit(self, callback: dict) -> dict:
+        """Queue one callback and wait for the result of its batch"""
+        if self._task is None or self._task.done() or self._stopping:
+            # Nobody would pick it up from the queue
+            return (await self._process([callback]))[0]
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((callback, future))
+        self._wakeup.set()
+        return await future
+
+    async def _flush(self) -> None:
+        batch = self._pending[: self.batch_size]
+        del self._pending[: self.batch_size]
+        try:
+            results = await self._process([callback for callback, _ in batch])
+        except BaseException as e:
+            # Waiters must never hang, hand them the error or the cancellation
+            for _, future in batch:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            logging.error(f"Payment confirmation batch failed: {e}")
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Give concurrent webhooks a moment to join this batch
+            if len(self._pending) < self.batch_size and not self._stopping:
+                await asyncio.sleep(self.window_seconds)
+            while self._pending:
+                await self._flush()
+            if self._stopping:
+                return
+
+    def _run_done(self, task: asyncio.Task) -> None:
+        """Fail the queued callbacks if the grouping task died"""
+        if not task.cancelled() and task.exception() is None:
+            return
+        error = (
+            RuntimeError("Payment confirmation pipeline stopped")
+            if task.cancelled()
+            else task.exception()
+        )
+        logging.error(f"Payment confirmation task ended: {error!r}")
+        pending, self._pending = self._pending, []
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(self._run_done)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task:
+            # Not cancelled: a batch in flight is finished, not cut short
+            self._stopping = True
+            self._wakeup.set()
+            try:
+                await task
+            except BaseException as e:
+                logging.error(f"Payment confirmation task failed: {e!r}")
+            finally:
+                self._stopping = False
+        # Whatever is still queued is applied before shutting down
+        while self._pending:
+            await self._flush()
+
+    def metrics(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "batches_total": self.batches_total,
+            "callbacks_total": self.callbacks_total,
+            "failed_total": self.failed_total,
+        }
+
+
+# Shared instance started by the API lifespan
+payment_confirmation_pipeline = PaymentConfirmationPipeline()
@@ -0,0 +1,227 @@
+"""
+Pricing Module
+==============
+Per-seat ticket prices for a showtime, computed for all seats at once.
+
+A showtime's price matrix is built once with NumPy:
+
+    price[seat] = Showtime.base_price
+                  * tier multiplier of the seat's type (SeatLayout.seat_types)
+                  * weekend multiplier    (show date in the schedule timezone)
+                  * 3D / IMAX multipliers (Screen flags)
+                  * demand multiplier     (share of seats held or sold)
+
+Everything but demand is fixed per showtime, so that part is cached; the
+rounded matrix for each demand step is cached next to it. A quote is then
+a label -> index lookup plus one fancy-indexed sum, regardless of how many
+seats are picked.
+
+Configuration (environment variables):
+    PRICING_TIER_MULTIPLIERS:  JSON object of seat type -> multiplier,
+                               merged over the defaults below
+    PRICING_WEEKEND_MULTIPLIER: Saturday/Sunday shows (default: 1.2)
+    PRICING_3D_MULTIPLIER:      3D-enabled screens (default: 1.15)
+    PRICING_IMAX_MULTIPLIER:    IMAX screens (default: 1.3)
+    PRICING_DEMAND_STEPS:       "occupancy:multiplier,..." (default:
+                                "0.5:1.1,0.8:1.25")
+    PRICING_CACHE_MAX_SIZE:     showtimes kept in memory (default: 5000)
+    PRICING_CACHE_TTL_SECONDS:  how long a price matrix is reused (default: 300)
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from odmantic import ObjectId
+
+from commons.cache import TTLCache
+from core.database.database import get_engine
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen
+from core.services.schedule_index import local_date
+from core.services.seat_inventory import (
+    ShowtimeInventory,
+    ShowtimeNotFoundError,
+    seat_inventory,
+)
+
+DEFAULT_TIER_MULTIPLIERS = {
+    "STANDARD": 1.0,
+    "SILVER": 1.0,
+    "GOLD": 1.25,
+    "PLATINUM": 1.5,
+    "PREMIUM": 1.5,
+    "RECLINER": 2.0,
+    "VIP": 2.5,
+}
+TIER_MULTIPLIERS = {
+    **DEFAULT_TIER_MULTIPLIERS,
+    **{
+        seat_type.upper(): float(multiplier)
+        for seat_type, multiplier in json.loads(
+            os.getenv("PRICING_TIER_MULTIPLIERS", "{}")
+        ).items()
+    },
+}
+PRICING_WEEKEND_MULTIPLIER = float(os.getenv("PRICING_WEEKEND_MULTIPLIER", "1.2"))
+PRICING_3D_MULTIPLIER = float(os.getenv("PRICING_3D_MULTIPLIER", "1.15"))
+PRICING_IMAX_MULTIPLIER = float(os.getenv("PRICING_IMAX_MULTIPLIER", "1.3"))
+PRICING_CACHE_MAX_SIZE = int(os.getenv("PRICING_CACHE_MAX_SIZE", "5000"))
+PRICING_CACHE_TTL_SECONDS = float(os.getenv("PRICING_CACHE_TTL_SECONDS", "300"))
+
+
+def _demand_steps(spec: str) -> List[Tuple[float, float]]:
+    steps = []
+    for step in filter(None, spec.split(",")):
+        occupancy, multiplier = step.split(":")
+        steps.append((float(occupancy), float(multiplier)))
+    return sorted(steps)
+
+
+# (occupancy threshold, multiplier), ascending; below the first step = 1.0
+DEMAND_STEPS = _demand_steps(os.getenv("PRICING_DEMAND_STEPS", "0.5:1.1,0.8:1.25"))
+
+
+def demand_level(inventory: ShowtimeInventory) -> int:
+    """Index into DEMAND_STEPS + 1 (0 = no surcharge)"""
+    counts = inventory.counts()
+    occupancy = (counts["held"] + counts["sold"]) / counts["total"]
+    level = 0
+    for threshold, _ in DEMAND_STEPS:
+        if occupancy >= threshold:
+            level += 1
+    return level
+
+
+def demand_multiplier(level: int) -> float:
+    return DEMAND_STEPS[level - 1][1] if level else 1.0
+
+
+class ShowtimePricing:
+    """Price matrix of one showtime (flat, row-major like the SeatMap)"""
+
+    __slots__ = ("showtime_id", "seat_types", "base", "_levels")
+
+    def __init__(self, showtime_id: str, seat_types: List[str], base: np.ndarray):
+        self.showtime_id = showtime_id
+        self.seat_types = seat_types
+        self.base = base
+        # Demand level -> rounded prices
+        self._levels: Dict[int, np.ndarray] = {}
+
+    def prices(self, level: int = 0) -> np.ndarray:
+        prices = self._levels.get(level)
+        if prices is None:
+            prices = np.round(self.base * demand_multiplier(level), 2)
+            prices.setflags(write=False)
+            self._levels[level] = prices
+        return prices
+
+    def quote(self, inventory: ShowtimeInventory, labels: Iterable[str]) -> dict:
+        """
+        Price the given seats at the showtime's current demand
+
+        Raises:
+            UnknownSeatError: If a label is not in the layout
+        """
+        labels = list(labels)
+        positions = inventory.seat_map.resolve(labels)
+        level = demand_level(inventory)
+        seat_prices = self.prices(level)[positions]
+        return {
+            "showtime_id": self.showtime_id,
+            "seats": [
+                {"seat": label, "seat_type": self.seat_types[position], "price": price}
+                for label, position, price in zip(
+                    labels, positions, seat_prices.tolist()
+                )
+            ],
+            "demand_multiplier": demand_multiplier(level),
+            "total": round(float(seat_prices.sum()), 2),
+        }
+
+
+def compile_pricing(
+    showtime: Showtime, screen: Screen, inventory: ShowtimeInventory
+) -> ShowtimePricing:
+    """Build the (pre-demand) per-seat price vector of a showtime"""
+    seat_map = inventory.seat_map
+
+    # Seat types -> tier multipliers, via the seat map's palette codes
+    palette = np.array(
+        [TIER_MULTIPLIERS.get(seat_type.upper(), 1.0) for seat_type in seat_map.palette]
+    )
+    codes = np.frombuffer(seat_map.type_codes, dtype=np.uint8)
+    tiers = palette[codes]
+
+    # Showtime-wide rules fold into one scalar
+    multiplier = 1.0
+    if local_date(showtime.start_time).weekday() >= 5:
+        multiplier *= PRICING_WEEKEND_MULTIPLIER
+    if screen.is_3d_enabled:
+        multiplier *= PRICING_3D_MULTIPLIER
+    if screen.is_imax:
+        multiplier *= PRICING_IMAX_MULTIPLIER
+
+    base = tiers * (showtime.base_price * multiplier)
+    base.setflags(write=False)
+    seat_types = [seat_map.palette[code] for code in seat_map.type_codes]
+    return ShowtimePricing(str(showtime.id), seat_types, base)
+
+
+class PricingEngine:
+    def __init__(self):
+        self.cache = TTLCache(
+            "pricing",
+            max_size=PRICING_CACHE_MAX_SIZE,
+            ttl_seconds=PRICING_CACHE_TTL_SECONDS,
+        )
+
+    @property
+    def engine(self):
+        return get_engine()
+
+    async def _load(self, showtime_id: str) -> ShowtimePricing:
+        inventory = await seat_inventory.get(showtime_id)
+        showtime = await self.engine.find_one(
+            Showtime, Showtime.id == ObjectId(showtime_id)
+        )
+        if not showtime:
+            raise ShowtimeNotFoundError(f"Showtime {showtime_id} not found")
+        screen = await self.engine.find_one(Screen, Screen.id == showtime.screen_id)
+        if not screen:
+            raise ShowtimeNotFoundError(f"Screen {showtime.screen_id} not found")
+        return compile_pricing(showtime, screen, inventory)
+
+    async def get(self, showtime_id: str) -> ShowtimePricing:
+        """
+        Price matrix for a showtime, compiled on first use
+
+        Raises:
+            ShowtimeNotFoundError: If the showtime or its screen is missing
+        """
+        showtime_id = str(showtime_id)
+        return await self.cache.get_or_load(
+            showtime_id, lambda: self._load(showtime_id)
+        )
+
+    async def quote(self, showtime_id: str, labels: Iterable[str]) -> dict:
+        """
+        Price seats of a showtime
+
+        Raises:
+            ShowtimeNotFoundError: If the showtime or its screen is missing
+            UnknownSeatError: If a label is not in the layout
+        """
+        inventory = await seat_inventory.get(showtime_id)
+        pricing = await self.get(showtime_id)
+        return pricing.quote(inventory, labels)
+
+    def invalidate(self, showtime_id: str) -> None:
+        """Forget a price matrix, e.g. after the showtime's price changed"""
+        self.cache.delete(str(showtime_id))
+
+
+# Shared instance used by quotes and bookings
+pricing_engine = PricingEngine()
@@ -0,0 +1,501 @@
+"""
+Revenue Rollup Module
+=====================
+Keeps per theater / screen / movie / day sales figures for owner
+dashboards in `revenue_rollups` (see RevenueRollup), so a dashboard reads
+a handful of precomputed documents instead of aggregating bookings.
+
+The documents are maintained in two ways:
+
+    incremental:  confirming bookings adds their seats and payments with one
+                  $inc upsert per rollup key (one bulk_write per callback
+                  batch), cancelling a confirmed booking subtracts them and
+                  scheduling shows adds their capacity
+    reconcile:    a background pass recomputes every day from
+                  ROLLUP_RECONCILE_DAYS ago onwards from showtimes, CONFIRMED
+                  bookings and the transactions that confirmed them (one
+                  aggregation pipeline per chunk of shows) and rewrites only
+                  the documents that drifted
+
+Reconciling repairs increments lost to failed writes and fills in shows
+created outside the API (e.g. imports). Its reads go to the primary, like
+the increments: totals computed from a lagging secondary would miss
+bookings the documents already count and overwrite them. A document
+incremented while a pass runs is left for the next pass instead of being
+overwritten.
+
+Configuration (environment variables):
+    ROLLUP_RECONCILE_SECONDS: interval between reconcile passes (default: 900)
+    ROLLUP_RECONCILE_DAYS:    past days recomputed by each pass (default: 7)
+"""
+
+import asyncio
+import os
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from odmantic import ObjectId
+from pymongo import DeleteMany, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from commons.cache import TTLCache
+from core.database.database import get_catalog_engine, get_engine
+from core.models.booking_model import Booking, BookingStatus
+from core.models.rollup_model import RevenueRollup
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen, Theater
+from core.models.transaction_model import Transaction, TransactionStatus
+from core.services.schedule_index import SCHEDULE_TIMEZONE, local_date, today
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+ROLLUP_RECONCILE_SECONDS = float(os.getenv("ROLLUP_RECONCILE_SECONDS", "900"))
+ROLLUP_RECONCILE_DAYS = int(os.getenv("ROLLUP_RECONCILE_DAYS", "7"))
+
+# Shows per $in when aggregating their bookings
+RECONCILE_CHUNK_SIZE = 1000
+
+DUPLICATE_KEY = 11000
+
+COUNTERS = ("shows", "capacity", "bookings", "seats_sold", "revenue")
+
+# (theater id, screen id, movie id, local day)
+RollupKey = Tuple[ObjectId, ObjectId, ObjectId, str]
+
+
+def start_of_day(day: date) -> datetime:
+    """Local midnight of a day in the schedule timezone, as naive UTC"""
+    midnight = datetime.combine(day, datetime.min.time(), tzinfo=SCHEDULE_TIMEZONE)
+    return midnight.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _key(doc: dict) -> RollupKey:
+    """Rollup key of a showtime or rollup document"""
+    day = doc.get("day") or local_date(doc["start_time"]).isoformat()
+    return doc["theater_id"], doc["screen_id"], doc["movie_id"], day
+
+
+def _key_filter(key: RollupKey) -> dict:
+    theater_id, screen_id, movie_id, day = key
+    return {
+        "theater_id": theater_id,
+        "screen_id": screen_id,
+        "movie_id": movie_id,
+        "day": day,
+    }
+
+
+def _drifted(current: dict, totals: dict, owner_id: ObjectId) -> bool:
+    if current.get("owner_id") != owner_id:
+        return True
+    if abs(current.get("revenue", 0) - totals["revenue"]) >= 0.005:
+        return True
+    return any(
+        current.get(field, 0) != totals[field]
+        for field in COUNTERS
+        if field != "revenue"
+    )
+
+
+def _bookings_pipeline(showtime_ids: List[ObjectId]) -> List[dict]:
+    """
+    Confirmed bookings, seats and the payment that confirmed each, per
+    showtime. Other successful payments of a booking are refund-owed
+    duplicates, which payment confirmation doesn't roll up either; bookings
+    confirmed before transaction_id was recorded count every SUCCESS payment.
+    """
+    return [
+        {
+            "$match": {
+                "showtime_id": {"$in": showtime_ids},
+                "status": BookingStatus.CONFIRMED.value,
+            }
+        },
+        {
+            "$lookup": {
+                "from": Transaction.__collection__,
+                "localField": "_id",
+                "foreignField": "booking_id",
+                "as": "payments",
+            }
+        },
+        {
+            "$project": {
+                "showtime_id": 1,
+                "seats": {"$size": "$seats"},
+                "payments": {
+                    "$filter": {
+                        "input": "$payments",
+                        "as": "payment",
+                        "cond": {
+                            "$and": [
+                                {
+                                    "$eq": [
+                                        "$$payment.status",
+                                        TransactionStatus.SUCCESS.value,
+                                    ]
+                                },
+                                {
+                                    "$or": [
+                                        {
+                                            "$eq": [
+                                                {"$ifNull": ["$transaction_id", None]},
+                                                None,
+                                            ]
+                                        },
+                                        {"$eq": ["$$payment._id", "$transaction_id"]},
+                                    ]
+                                },
+                            ]
+                        },
+                    }
+                },
+            }
+        },
+        {
+            "$group": {
+                "_id": "$showtime_id",
+                "bookings": {"$sum": 1},
+                "seats_sold": {"$sum": "$seats"},
+                "revenue": {"$sum": {"$sum": "$payments.amount"}},
+            }
+        },
+    ]
+
+
+class RevenueRollups:
+    def __init__(self):
+        # showtime id -> (rollup key, owner id); a show's theater, screen,
+        # movie and start don't change once it is on sale
+        self.showtimes = TTLCache(
+            "rollup_showtimes", max_size=50_000, ttl_seconds=3600
+        )
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.increments_total = 0
+        self.failed_increments_total = 0
+        self.reconciles_total = 0
+        self.failed_reconciles_total = 0
+        self.corrected_total = 0
+        self.last_reconcile_seconds = 0.0
+
+    @property
+    def collection(self):
+        return get_engine().get_collection(RevenueRollup)
+
+    @property
+    def catalog(self):
+        return get_catalog_engine()
+
+    # ------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------
+
+    async def _owners(self, theater_ids: Iterable[ObjectId], engine=None) -> Dict:
+        """Theater id -> owner id (read from `engine`, default the catalog)"""
+        cursor = (engine or self.catalog).get_collection(Theater).find(
+            {"_id": {"$in": list(theater_ids)}}, {"owner_id": 1}
+        )
+        return {doc["_id"]: doc["owner_id"] async for doc in cursor}
+
+    async def _capacities(self, screen_ids: Iterable[ObjectId], engine=None) -> Dict:
+        """Screen id -> seating capacity (read from `engine`, default the catalog)"""
+        cursor = (engine or self.catalog).get_collection(Screen).find(
+            {"_id": {"$in": list(screen_ids)}}, {"capacity": 1}
+        )
+        return {doc["_id"]: doc["capacity"] async for doc in cursor}
+
+    async def _showtime_keys(
+        self, showtime_ids: Iterable[ObjectId]
+    ) -> Dict[ObjectId, Tuple[RollupKey, ObjectId]]:
+        """Showtime id -> (rollup key, owner id), cached per showtime"""
+        found = {}
+        missing = []
+        for showtime_id in set(showtime_ids):
+            entry = self.showtimes.get(showtime_id)
+            if entry is None:
+                missing.append(showtime_id)
+            else:
+                found[showtime_id] = entry
+        if not missing:
+            return found
+
+        docs = [
+            doc
+            async for doc in self.catalog.get_collection(Showtime).find(
+                {"_id": {"$in": missing}},
+                {"theater_id": 1, "screen_id": 1, "movie_id": 1, "start_time": 1},
+            )
+        ]
+        owners = await self._owners({doc["theater_id"] for doc in docs})
+        for doc in docs:
+            owner_id = owners.get(doc["theater_id"])
+            if owner_id is None:
+                continue  # theater deleted, nothing to report it under
+            found[doc["_id"]] = (_key(doc), owner_id)
+            self.showtimes.set(doc["_id"], found[doc["_id"]])
+        return found
+
+    # ------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------
+
+    async def _increment(
+        self, deltas: Dict[RollupKey, dict], owners: Dict[RollupKey, ObjectId]
+    ) -> None:
+        now = datetime.utcnow()
+        await self.collection.bulk_write(
+            [
+                UpdateOne(
+                    _key_filter(key),
+                    {
+                        "$inc": delta,
+                        "$set": {"updated_at": now},
+                        "$setOnInsert": {"owner_id": owners[key]},
+                    },
+                    upsert=True,
+                )
+                for key, delta in deltas.items()
+            ],
+            ordered=False,
+        )
+
+    async def record_bookings(
+        self, bookings: List[Tuple[ObjectId, int, float]], sign: int = 1
+    ) -> None:
+        """
+        Add confirmed bookings, given as (showtime id, seats, amount paid),
+        or subtract cancelled ones with sign=-1
+
+        Failures are logged, not raised; the next reconcile repairs them.
+        """
+        if not bookings:
+            return
+        try:
+            keys = await self._showtime_keys(
+                showtime_id for showtime_id, _, _ in bookings
+            )
+            deltas: Dict[RollupKey, dict] = {}
+            owners: Dict[RollupKey, ObjectId] = {}
+            for showtime_id, seats, amount in bookings:
+                if showtime_id not in keys:
+                    continue
+                key, owner_id = keys[showtime_id]
+                owners[key] = owner_id
+                delta = deltas.setdefault(
+                    key, {"bookings": 0, "seats_sold": 0, "revenue": 0.0}
+                )
+                delta["bookings"] += sign
+                delta["seats_sold"] += sign * seats
+                delta["revenue"] += sign * amount
+            if deltas:
+                await self._increment(deltas, owners)
+            self.increments_total += len(bookings)
+        except Exception as e:
+            self.failed_increments_total += len(bookings)
+            logging.error(f"Failed to roll up {len(bookings)} bookings: {e}")
+
+    async def record_showtimes(self, showtimes: List[Showtime]) -> None:
+        """
+        Add the shows and seats offered by newly created showtimes
+
+        Failures are logged, not raised; the next reconcile repairs them.
+        """
+        showtimes = [showtime for showtime in showtimes if showtime.is_active]
+        if not showtimes:
+            return
+        try:
+            capacities = await self._capacities(
+                {showtime.screen_id for showtime in showtimes}
+            )
+            theater_owners = await self._owners(
+                {showtime.theater_id for showtime in showtimes}
+            )
+            deltas: Dict[RollupKey, dict] = {}
+            owners: Dict[RollupKey, ObjectId] = {}
+            for showtime in showtimes:
+                owner_id = theater_owners.get(showtime.theater_id)
+                if owner_id is None:
+                    continue
+                key = _key(showtime.model_dump_doc())
+                owners[key] = owner_id
+                self.showtimes.set(showtime.id, (key, owner_id))
+                delta = deltas.setdefault(key, {"shows": 0, "capacity": 0})
+                delta["shows"] += 1
+                delta["capacity"] += capacities.get(showtime.screen_id, 0)
+            if deltas:
+                await self._increment(deltas, owners)
+        except Exception as e:
+            logging.error(f"Failed to roll up {len(showtimes)} showtimes: {e}")
+
+    # ------------------------------------------------------------
+    # Reconciliation
+    # ------------------------------------------------------------
+
+    async def reconcile(self, days: int = ROLLUP_RECONCILE_DAYS) -> dict:
+        """
+        Recompute every rollup from `days` ago onwards and rewrite the
+        documents that differ
+
+        Returns:
+            Counts of recomputed keys and corrected, deleted and skipped
+            (updated during the pass) documents
+        """
+        started = datetime.utcnow()
+        clock = time.monotonic()
+        since = today() - timedelta(days=days)
+        # Everything is read from the primary, see the module docstring
+        primary = get_engine()
+
+        # Step 1: Shows in the window and the seats they offered
+        shows = [
+            doc
+            async for doc in primary.get_collection(Showtime).find(
+                {"start_time": {"$gte": start_of_day(since)}},
+                {
+                    "theater_id": 1,
+                    "screen_id": 1,
+                    "movie_id": 1,
+                    "start_time": 1,
+                    "is_active": 1,
+                },
+            )
+        ]
+        theater_owners = await self._owners(
+            {doc["theater_id"] for doc in shows}, primary
+        )
+        capacities = await self._capacities(
+            {doc["screen_id"] for doc in shows}, primary
+        )
+
+        expected: Dict[RollupKey, dict] = {}
+        owners: Dict[RollupKey, ObjectId] = {}
+        show_keys: Dict[ObjectId, RollupKey] = {}
+        for doc in shows:
+            owner_id = theater_owners.get(doc["theater_id"])
+            if owner_id is None:
+                continue
+            key = _key(doc)
+            show_keys[doc["_id"]] = key
+            owners[key] = owner_id
+            totals = expected.setdefault(key, dict.fromkeys(COUNTERS, 0))
+            if doc.get("is_active", True):
+                totals["shows"] += 1
+                totals["capacity"] += capacities.get(doc["screen_id"], 0)
+
+        # Step 2: Confirmed bookings and payments per show, summed in Mongo
+        bookings = primary.get_collection(Booking)
+        showtime_ids = list(show_keys)
+        for start in range(0, len(showtime_ids), RECONCILE_CHUNK_SIZE):
+            chunk = showtime_ids[start : start + RECONCILE_CHUNK_SIZE]
+            async for row in bookings.aggregate(_bookings_pipeline(chunk)):
+                totals = expected[show_keys[row["_id"]]]
+                totals["bookings"] += row["bookings"]
+                totals["seats_sold"] += row["seats_sold"]
+                totals["revenue"] += row["revenue"]
+
+        # Step 3: Rewrite drifted documents, drop those with nothing behind them
+        existing = {
+            _key(doc): doc
+            async for doc in self.collection.find({"day": {"$gte": since.isoformat()}})
+        }
+        # Documents updated since the pass started are left for the next one
+        untouched = {"updated_at": {"$lt": started}}
+        ops = []
+        for key, totals in expected.items():
+            current = existing.pop(key, None)
+            if current is None and not any(totals.values()):
+                continue
+            totals["revenue"] = round(totals["revenue"], 2)
+            if current is not None and not _drifted(current, totals, owners[key]):
+                continue
+            ops.append(
+                UpdateOne(
+                    {**_key_filter(key), **untouched},
+                    {
+                        "$set": {
+                            **totals,
+                            "owner_id": owners[key],
+                            "updated_at": started,
+                        }
+                    },
+                    upsert=True,
+                )
+            )
+        corrected = len(ops)
+        stale = [doc["_id"] for doc in existing.values()]
+        if stale:
+            ops.append(DeleteMany({"_id": {"$in": stale}, **untouched}))
+
+        skipped = deleted = 0
+        if ops:
+            try:
+                result = await self.collection.bulk_write(ops, ordered=False)
+                deleted = result.deleted_count
+            except BulkWriteError as e:
+                # The upsert of a document touched meanwhile hits the unique key
+                errors = e.details.get("writeErrors", [])
+                skipped = sum(1 for error in errors if error["code"] == DUPLICATE_KEY)
+                if skipped < len(errors):
+                    raise
+                deleted = e.details.get("nRemoved", 0)
+            corrected -= skipped
+
+        self.reconciles_total += 1
+        self.corrected_total += corrected
+        self.last_reconcile_seconds = time.monotonic() - clock
+        logging.info(
+            f"Revenue rollups reconciled since {since}: {len(expected)} keys, "
+            f"{corrected} corrected, {deleted} deleted, {skipped} skipped "
+            f"in {self.last_reconcile_seconds:.2f}s"
+        )
+        return {
+            "since": since.isoformat(),
+            "keys": len(expected),
+            "corrected": corrected,
+            "deleted": deleted,
+            "skipped": skipped,
+        }
+
+    async def _reconcile_periodically(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                self.failed_reconciles_total += 1
+                logging.error(f"Revenue rollup reconcile failed: {e}")
+            await asyncio.sleep(ROLLUP_RECONCILE_SECONDS)
+
+    # ------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------
+
+    async def start(self) -> None:
+        # The first pass runs in the background, startup doesn't wait for it
+        self._task = asyncio.create_task(self._reconcile_periodically())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> dict:
+        return {
+            "increments_total": self.increments_total,
+            "failed_increments_total": self.failed_increments_total,
+            "reconciles_total": self.reconciles_total,
+            "failed_reconciles_total": self.failed_reconciles_total,
+            "corrected_total": self.corrected_total,
+            "last_reconcile_seconds": self.last_reconcile_seconds,
+        }
+
+
+# Shared instance started by the API lifespan
+revenue_rollups = RevenueRollups()
@@ -0,0 +1,454 @@
+"""
+Schedule Index Module
+=====================
+Answers "what's playing in city X on date Y" from memory.
+
+Upcoming showtimes are grouped by (city, local date) into
+movie -> theater -> showtimes buckets, so a search is one dict lookup
+instead of a join over theaters, showtimes and movies. The rendered JSON
+for each (city, date) is cached until something in that bucket changes.
+
+The index is rebuilt from the catalog on startup and periodically (which
+also drops past days). Between rebuilds it is kept current by:
+    - explicit hooks (upsert_showtime, upsert_theater, ...) called by
+      in-process writers such as schedule uploads and imports
+    - a MongoDB change stream on showtimes/theaters/movies, when the
+      deployment supports one (replica set or sharded cluster)
+
+The change stream is opened before the first rebuild, so nothing written
+while the catalog is being read is missed. Updates that arrive during a
+rebuild are applied to the live index and replayed onto the new one before
+the swap. A failed stream is reopened with backoff from its last resume
+token; if that token has expired the index is rebuilt instead.
+
+Configuration (environment variables):
+    SCHEDULE_TIMEZONE:              zone used to bucket shows by date
+                                    (default: Asia/Kolkata)
+    SCHEDULE_INDEX_REFRESH_SECONDS: full rebuild interval (default: 900)
+    SCHEDULE_STREAM_RETRY_SECONDS:  first delay before reopening a failed
+                                    change stream, doubled up to 60s
+                                    (default: 1)
+"""
+
+import asyncio
+import json
+import os
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from pymongo.errors import OperationFailure
+
+from core.database.database import get_catalog_engine
+from core.models.movie_model import Movie
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Theater
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+SCHEDULE_TIMEZONE = ZoneInfo(os.getenv("SCHEDULE_TIMEZONE", "Asia/Kolkata"))
+SCHEDULE_INDEX_REFRESH_SECONDS = float(
+    os.getenv("SCHEDULE_INDEX_REFRESH_SECONDS", "900")
+)
+SCHEDULE_STREAM_RETRY_SECONDS = float(
+    os.getenv("SCHEDULE_STREAM_RETRY_SECONDS", "1")
+)
+SCHEDULE_STREAM_MAX_RETRY_SECONDS = 60.0
+
+# Server error codes: no change streams on a standalone server, and a
+# resume token older than the oplog
+CHANGE_STREAMS_UNSUPPORTED = (40573, 40415)
+CHANGE_STREAM_HISTORY_LOST = 286
+
+BucketKey = Tuple[str, date]
+
+
+def normalize_city(city: str) -> str:
+    return " ".join(city.split()).lower()
+
+
+def local_date(value: datetime) -> date:
+    """Calendar date of a (naive UTC) datetime in the schedule timezone"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(SCHEDULE_TIMEZONE).date()
+
+
+def today() -> date:
+    """Current date in the schedule timezone"""
+    return datetime.now(SCHEDULE_TIMEZONE).date()
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat()
+
+
+class ScheduleIndex:
+    """
+    In-process (city, date) -> movie -> theater -> showtimes index.
+
+    Movie and theater details are stored once and joined in when a bucket
+    is rendered; each showtime entry only keeps what the listing shows.
+    """
+
+    def __init__(self):
+        self._movies: Dict[str, dict] = {}
+        self._theaters: Dict[str, dict] = {}
+        # showtime id -> entry (includes movie_id/theater_id/start for re-keying)
+        self._showtimes: Dict[str, dict] = {}
+        self._by_theater: Dict[str, Set[str]] = {}
+        self._keys: Dict[str, BucketKey] = {}
+        self._buckets: Dict[BucketKey, Dict[str, Dict[str, Dict[str, dict]]]] = {}
+        self._payloads: Dict[BucketKey, bytes] = {}
+
+        self._tasks = []
+        self.rebuilt_at: Optional[datetime] = None
+        # Updates made while a rebuild runs, replayed onto the new index
+        self._replay: Optional[List[Tuple[str, object]]] = None
+        self._rebuild_lock = asyncio.Lock()
+        self._resume_token: Optional[dict] = None
+
+    @property
+    def engine(self):
+        return get_catalog_engine()
+
+    # ------------------------------------------------------------
+    # Entry builders
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _movie_entry(movie: Movie) -> dict:
+        return {
+            "movie_id": str(movie.id),
+            "title": movie.title,
+            "language": movie.language,
+            "genres": movie.genres,
+            "duration_minutes": movie.duration_minutes,
+            "poster_url": movie.poster_url,
+        }
+
+    @staticmethod
+    def _theater_entry(theater: Theater) -> dict:
+        return {
+            "theater_id": str(theater.id),
+            "name": theater.name,
+            "address": theater.address,
+            "city": normalize_city(theater.location),
+            "is_active": theater.is_active,
+        }
+
+    @staticmethod
+    def _showtime_entry(showtime: Showtime) -> dict:
+        return {
+            "showtime_id": str(showtime.id),
+            "movie_id": str(showtime.movie_id),
+            "theater_id": str(showtime.theater_id),
+            "screen_id": str(showtime.screen_id),
+            "start_time": _iso(showtime.start_time),
+            "end_time": _iso(showtime.end_time),
+            "base_price": showtime.base_price,
+            "_date": local_date(showtime.start_time),
+        }
+
+    # ------------------------------------------------------------
+    # Bucket maintenance
+    # ------------------------------------------------------------
+
+    def _link(self, entry: dict) -> None:
+        """Place an indexed showtime into its (city, date) bucket"""
+        theater = self._theaters.get(entry["theater_id"])
+        if theater is None or not theater["is_active"]:
+            return
+        key = (theater["city"], entry["_date"])
+        bucket = self._buckets.setdefault(key, {})
+        bucket.setdefault(entry["movie_id"], {}).setdefault(entry["theater_id"], {})[
+            entry["showtime_id"]
+        ] = entry
+        self._keys[entry["showtime_id"]] = key
+        self._payloads.pop(key, None)
+
+    def _unlink(self, showtime_id: str) -> None:
+        """Remove a showtime from its bucket (it stays in self._showtimes)"""
+        key = self._keys.pop(showtime_id, None)
+        entry = self._showtimes.get(showtime_id)
+        if key is None or entry is None:
+            return
+        bucket = self._buckets.get(key, {})
+        theaters = bucket.get(entry["movie_id"], {})
+        shows = theaters.get(entry["theater_id"], {})
+        shows.pop(showtime_id, None)
+        if not shows:
+            theaters.pop(entry["theater_id"], None)
+        if not theaters:
+            bucket.pop(entry["movie_id"], None)
+        if not bucket:
+            self._buckets.pop(key, None)
+        self._payloads.pop(key, None)
+
+    def _drop_showtime(self, showtime_id: str) -> None:
+        self._unlink(showtime_id)
+        entry = self._showtimes.pop(showtime_id, None)
+        if entry is not None:
+            self._by_theater.get(entry["theater_id"], set()).discard(showtime_id)
+
+    # ------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------
+
+    def _record(self, method: str, argument) -> None:
+        """Remember an update made during a rebuild, to replay after it"""
+        if self._replay is not None:
+            self._replay.append((method, argument))
+
+    def upsert_showtime(self, showtime: Showtime) -> None:
+        self._record("upsert_showtime", showtime)
+        showtime_id = str(showtime.id)
+        self._drop_showtime(showtime_id)
+        if not showtime.is_active:
+            return
+
+        entry = self._showtime_entry(showtime)
+        self._showtimes[showtime_id] = entry
+        self._by_theater.setdefault(entry["theater_id"], set()).add(showtime_id)
+        self._link(entry)
+
+    def remove_showtime(self, showtime_id: str) -> None:
+        self._record("remove_showtime", showtime_id)
+        self._drop_showtime(str(showtime_id))
+
+    def upsert_theater(self, theater: Theater) -> None:
+        self._record("upsert_theater", theater)
+        theater_id = str(theater.id)
+        showtime_ids = self._by_theater.get(theater_id, set())
+        for showtime_id in showtime_ids:
+            self._unlink(showtime_id)
+
+        self._theaters[theater_id] = self._theater_entry(theater)
+        # City or active flag may have changed, re-bucket its showtimes
+        for showtime_id in showtime_ids:
+            self._link(self._showtimes[showtime_id])
+
+    def remove_theater(self, theater_id: str) -> None:
+        self._record("remove_theater", theater_id)
+        theater_id = str(theater_id)
+        for showtime_id in list(self._by_theater.get(theater_id, ())):
+            self._drop_showtime(showtime_id)
+        self._by_theater.pop(theater_id, None)
+        self._theaters.pop(theater_id, None)
+
+    def upsert_movie(self, movie: Movie) -> None:
+        self._record("upsert_movie", movie)
+        self._movies[str(movie.id)] = self._movie_entry(movie)
+        # Movie details are rendered into every bucket, and change rarely
+        self._payloads.clear()
+
+    def remove_movie(self, movie_id: str) -> None:
+        """Stop listing a movie (its showtimes are skipped when rendering)"""
+        self._record("remove_movie", movie_id)
+        self._movies.pop(str(movie_id), None)
+        self._payloads.clear()
+
+    # ------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------
+
+    def _render(self, key: BucketKey) -> bytes:
+        bucket = self._buckets.get(key, {})
+        movies = []
+        for movie_id, theaters in bucket.items():
+            movie = self._movies.get(movie_id)
+            if movie is None:
+                continue
+            theater_list = []
+            for theater_id, shows in theaters.items():
+                theater = self._theaters[theater_id]
+                theater_list.append(
+                    {
+                        "theater_id": theater_id,
+                        "name": theater["name"],
+                        "address": theater["address"],
+                        "showtimes": sorted(
+                            (
+                                {k: v for k, v in show.items() if k[0] != "_"}
+                                for show in shows.values()
+                            ),
+                            key=lambda show: show["start_time"],
+                        ),
+                    }
+                )
+            theater_list.sort(key=lambda theater: theater["name"])
+            movies.append({**movie, "theaters": theater_list})
+        movies.sort(key=lambda movie: movie["title"])
+
+        return json.dumps(
+            {"city": key[0], "date": key[1].isoformat(), "movies": movies}
+        ).encode()
+
+    def search(self, city: str, day: date) -> bytes:
+        """Rendered JSON listing for a city and date (cached per bucket)"""
+        key = (normalize_city(city), day)
+        payload = self._payloads.get(key)
+        if payload is None:
+            payload = self._render(key)
+            self._payloads[key] = payload
+        return payload
+
+    # ------------------------------------------------------------
+    # Rebuild and change tracking
+    # ------------------------------------------------------------
+
+    async def rebuild(self) -> None:
+        """Reload movies, theaters and upcoming showtimes from the catalog"""
+        async with self._rebuild_lock:
+            self._replay = []
+            try:
+                fresh = await self._load()
+                # Updates made while loading may be missing from what was read
+                for method, argument in self._replay:
+                    getattr(fresh, method)(argument)
+            finally:
+                self._replay = None
+
+            # Swap in one step so searches never see a half-built index
+            self._movies = fresh._movies
+            self._theaters = fresh._theaters
+            self._showtimes = fresh._showtimes
+            self._by_theater = fresh._by_theater
+            self._keys = fresh._keys
+            self._buckets = fresh._buckets
+            self._payloads = {}
+            self.rebuilt_at = datetime.utcnow()
+        logging.info(
+            f"Schedule index rebuilt: {len(self._showtimes)} showtimes "
+            f"in {len(self._buckets)} city/date buckets"
+        )
+
+    async def _load(self) -> "ScheduleIndex":
+        fresh = ScheduleIndex()
+        for movie in await self.engine.find(Movie):
+            fresh._movies[str(movie.id)] = fresh._movie_entry(movie)
+        for theater in await self.engine.find(Theater):
+            fresh._theaters[str(theater.id)] = fresh._theater_entry(theater)
+
+        # Start of today in the schedule timezone, expressed as naive UTC
+        today = datetime.now(SCHEDULE_TIMEZONE).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        since = today.astimezone(timezone.utc).replace(tzinfo=None)
+        upcoming = self.engine.find(
+            Showtime,
+            Showtime.is_active == True,  # noqa: E712
+            Showtime.start_time >= since,
+        )
+        async for showtime in upcoming:
+            fresh.upsert_showtime(showtime)
+        return fresh
+
+    def _apply_change(self, change: dict) -> None:
+        collection = change["ns"]["coll"]
+        document_id = change["documentKey"]["_id"]
+        document = change.get("fullDocument")
+
+        if collection == Showtime.__collection__:
+            if document is None:
+                self.remove_showtime(document_id)
+            else:
+                self.upsert_showtime(Showtime.model_validate_doc(document))
+        elif collection == Theater.__collection__:
+            if document is None:
+                self.remove_theater(document_id)
+            else:
+                self.upsert_theater(Theater.model_validate_doc(document))
+        elif collection == Movie.__collection__:
+            if document is None:
+                self.remove_movie(document_id)
+            else:
+                self.upsert_movie(Movie.model_validate_doc(document))
+
+    async def _watch_changes(self, opened: asyncio.Event) -> None:
+        """
+        Follow the catalog change stream, reopening it after failures
+
+        `opened` is set once the first attempt to open the stream is over,
+        so start() can rebuild knowing every later change will be seen.
+        """
+        collections = [
+            Showtime.__collection__,
+            Theater.__collection__,
+            Movie.__collection__,
+        ]
+        pipeline = [{"$match": {"ns.coll": {"$in": collections}}}]
+        delay = SCHEDULE_STREAM_RETRY_SECONDS
+        missed = False
+        while True:
+            try:
+                async with self.engine.database.watch(
+                    pipeline,
+                    full_document="updateLookup",
+                    resume_after=self._resume_token,
+                ) as stream:
+                    logging.info("Schedule index following catalog change stream")
+                    self._resume_token = stream.resume_token
+                    opened.set()
+                    delay = SCHEDULE_STREAM_RETRY_SECONDS
+                    if missed:
+                        # Changes from before the stream reopened are gone;
+                        # later ones queue up in the stream meanwhile
+                        await self.rebuild()
+                        missed = False
+                    async for change in stream:
+                        try:
+                            self._apply_change(change)
+                        except Exception as e:
+                            logging.error(f"Failed to apply catalog change: {e}")
+                        self._resume_token = stream.resume_token
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    # Standalone servers have no change streams; rely on rebuilds
+                    logging.warning(f"Catalog change stream unavailable: {e}")
+                    opened.set()
+                    return
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    self._resume_token = None
+                logging.error(f"Catalog change stream failed: {e}")
+            except Exception as e:
+                logging.error(f"Catalog change stream failed: {e}")
+            # Without a resume point the reopened stream starts from now
+            missed = missed or self._resume_token is None
+            opened.set()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, SCHEDULE_STREAM_MAX_RETRY_SECONDS)
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(SCHEDULE_INDEX_REFRESH_SECONDS)
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logging.error(f"Schedule index rebuild failed: {e}")
+
+    async def start(self) -> None:
+        # Open the change stream first: writes made during the rebuild are
+        # then either in what it reads or replayed from the stream
+        opened = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._watch_changes(opened))]
+        await opened.wait()
+        try:
+            await self.rebuild()
+        except Exception:
+            await self.stop()
+            raise
+        self._tasks.append(asyncio.create_task(self._refresh_periodically()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+# Shared instance started by the API lifespan
+schedule_index = ScheduleIndex()
@@ -0,0 +1,259 @@
+"""
+Screen Schedule Module
+======================
+Validates and creates showtimes in bulk without overlapping shows.
+
+A show occupies its screen from `start_time` until `end_time` plus a
+cleaning gap. The gap grows with the movie length (longer movies mean
+more clean-up) but never drops below a minimum:
+
+    gap = max(SCHEDULE_CLEANING_GAP_MINUTES,
+              SCHEDULE_CLEANING_GAP_RATIO * Movie.duration_minutes)
+
+For an upload, every affected screen's existing showtimes in the upload's
+time window are loaded once (one query for all screens) into an
+IntervalTree. New shows are checked against the tree in upload order and
+added to it when accepted, so conflicts between two new shows are caught
+too. Accepted shows are inserted with a single insert_many.
+
+Configuration (environment variables):
+    SCHEDULE_CLEANING_GAP_MINUTES: minimum gap after every show (default: 15)
+    SCHEDULE_CLEANING_GAP_RATIO:   gap as a fraction of the movie length
+                                   (default: 0.1)
+"""
+
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+from odmantic import ObjectId
+from pymongo.errors import BulkWriteError
+
+from commons.interval_tree import IntervalTree
+from core.database.database import get_engine
+from core.models.movie_model import Movie
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen, Theater
+from core.services.revenue_rollup import revenue_rollups
+from core.services.schedule_index import schedule_index
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+SCHEDULE_CLEANING_GAP_MINUTES = int(os.getenv("SCHEDULE_CLEANING_GAP_MINUTES", "15"))
+SCHEDULE_CLEANING_GAP_RATIO = float(os.getenv("SCHEDULE_CLEANING_GAP_RATIO", "0.1"))
+
+# Existing shows starting this long before the upload window can still overlap it
+SCHEDULE_LOOKBACK = timedelta(hours=24)
+
+
+def cleaning_gap(duration_minutes: Optional[int]) -> timedelta:
+    ratio_minutes = math.ceil((duration_minutes or 0) * SCHEDULE_CLEANING_GAP_RATIO)
+    return timedelta(minutes=max(SCHEDULE_CLEANING_GAP_MINUTES, ratio_minutes))
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Showtimes are stored as naive UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _object_id(value: str) -> Optional[ObjectId]:
+    try:
+        return ObjectId(value)
+    except Exception:
+        return None
+
+
+class ScreenScheduler:
+    @property
+    def engine(self):
+        return get_engine()
+
+    async def _durations(self, movie_ids: Set[ObjectId]) -> Dict[ObjectId, int]:
+        if not movie_ids:
+            return {}
+        cursor = self.engine.get_collection(Movie).find(
+            {"_id": {"$in": list(movie_ids)}}, {"duration_minutes": 1}
+        )
+        return {doc["_id"]: doc["duration_minutes"] async for doc in cursor}
+
+    async def _screens(
+        self, screen_ids: Set[ObjectId], owner_id: Optional[str]
+    ) -> Dict[ObjectId, ObjectId]:
+        """
+        Screen id -> theater id, for screens that exist (and belong to the
+        owner's theaters, if given)
+        """
+        screens = {
+            doc["_id"]: doc["theater_id"]
+            async for doc in self.engine.get_collection(Screen).find(
+                {"_id": {"$in": list(screen_ids)}}, {"theater_id": 1}
+            )
+        }
+        if owner_id is None:
+            return screens
+
+        owned = {
+            doc["_id"]
+            async for doc in self.engine.get_collection(Theater).find(
+                {
+                    "_id": {"$in": list(set(screens.values()))},
+                    "owner_id": ObjectId(owner_id),
+                },
+                {"_id": 1},
+            )
+        }
+        return {
+            screen_id: theater_id
+            for screen_id, theater_id in screens.items()
+            if theater_id in owned
+        }
+
+    async def load_trees(
+        self, screen_ids: Set[ObjectId], since: datetime, until: datetime
+    ) -> Dict[ObjectId, IntervalTree]:
+        """
+        Existing active shows of the screens around [since, until), each
+        with its cleaning gap (bulk imports check their rows against these)
+        """
+        cursor = self.engine.get_collection(Showtime).find(
+            {
+                "screen_id": {"$in": list(screen_ids)},
+                "is_active": True,
+                "start_time": {"$gte": since - SCHEDULE_LOOKBACK, "$lt": until},
+            },
+            {"screen_id": 1, "movie_id": 1, "start_time": 1, "end_time": 1},
+        )
+        existing = [doc async for doc in cursor]
+        durations = await self._durations({doc["movie_id"] for doc in existing})
+
+        trees = {screen_id: IntervalTree() for screen_id in screen_ids}
+        for doc in existing:
+            gap = cleaning_gap(durations.get(doc["movie_id"]))
+            trees[doc["screen_id"]].add(
+                doc["start_time"], doc["end_time"] + gap, str(doc["_id"])
+            )
+        return trees
+
+    async def schedule(
+        self, items: List[dict], owner_id: Optional[str] = None, dry_run: bool = False
+    ) -> dict:
+        """
+        Validate and create showtimes ({movie_id, screen_id, start_time,
+        end_time?, base_price}), in upload order
+
+        Args:
+            owner_id: restrict to screens of this owner's theaters (None = any)
+            dry_run: only validate
+        """
+        results = [
+            {"index": i, "ok": False, "conflicts": []} for i in range(len(items))
+        ]
+        now = datetime.utcnow()
+
+        # Step 1: Load referenced movies and screens once
+        movie_ids = [_object_id(item["movie_id"]) for item in items]
+        screen_ids = [_object_id(item["screen_id"]) for item in items]
+        durations = await self._durations(set(movie_ids) - {None})
+        theaters = await self._screens(set(screen_ids) - {None}, owner_id)
+
+        # Step 2: Resolve each show's time slot
+        slots = {}
+        for i, item in enumerate(items):
+            movie_id, screen_id = movie_ids[i], screen_ids[i]
+            if movie_id not in durations:
+                results[i]["error"] = "Movie not found"
+                continue
+            if screen_id not in theaters:
+                results[i]["error"] = "Screen not found"
+                continue
+
+            duration = durations[movie_id]
+            start = naive_utc(item["start_time"])
+            end = start + timedelta(minutes=duration)
+            if item.get("end_time") is not None:
+                if naive_utc(item["end_time"]) < end:
+                    results[i]["error"] = (
+                        f"Show is shorter than the movie ({duration} minutes)"
+                    )
+                    continue
+                end = naive_utc(item["end_time"])
+            if start <= now:
+                results[i]["error"] = "Show must start in the future"
+                continue
+            slots[i] = (movie_id, screen_id, start, end, cleaning_gap(duration))
+
+        # Step 3: Check every slot against its screen's interval tree
+        accepted: List[Showtime] = []
+        accepted_items: List[int] = []
+        if slots:
+            trees = await self.load_trees(
+                {slot[1] for slot in slots.values()},
+                min(slot[2] for slot in slots.values()),
+                max(slot[3] + slot[4] for slot in slots.values()),
+            )
+            for i, (movie_id, screen_id, start, end, gap) in slots.items():
+                tree = trees[screen_id]
+                conflicts = tree.overlaps(start, end + gap)
+                if conflicts:
+                    results[i].update(
+                        error="Overlaps another show on this screen",
+                        conflicts=conflicts,
+                    )
+                    continue
+
+                showtime = Showtime(
+                    movie_id=movie_id,
+                    theater_id=theaters[screen_id],
+                    screen_id=screen_id,
+                    start_time=start,
+                    end_time=end,
+                    base_price=items[i]["base_price"],
+                )
+                tree.add(start, end + gap, f"request:{i}")
+                accepted.append(showtime)
+                accepted_items.append(i)
+
+        # Step 4: Insert every accepted show at once
+        failed: Dict[int, str] = {}
+        if accepted and not dry_run:
+            try:
+                await self.engine.get_collection(Showtime).insert_many(
+                    [showtime.model_dump_doc() for showtime in accepted], ordered=False
+                )
+            except BulkWriteError as e:
+                failed = {
+                    error["index"]: error.get("errmsg", "write failed")
+                    for error in e.details.get("writeErrors", [])
+                }
+
+        created: List[Showtime] = []
+        for position, (i, showtime) in enumerate(zip(accepted_items, accepted)):
+            if position in failed:
+                results[i]["error"] = failed[position]
+                continue
+            results[i].update(ok=True, showtime_id=str(showtime.id))
+            if not dry_run:
+                schedule_index.upsert_showtime(showtime)
+                created.append(showtime)
+        # Seats now on sale count towards the owners' occupancy
+        await revenue_rollups.record_showtimes(created)
+
+        rejected = sum(1 for result in results if not result["ok"])
+        logging.info(
+            f"Bulk schedule: {len(items)} shows, {len(created)} created, "
+            f"{rejected} rejected{' (dry run)' if dry_run else ''}"
+        )
+        return {
+            "created": len(created),
+            "rejected": rejected,
+            "dry_run": dry_run,
+            "results": results,
+        }
+
+
+# Shared instance used by the showtime routes
+screen_scheduler = ScreenScheduler()
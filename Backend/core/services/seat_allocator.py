@@ -0,0 +1,140 @@
+"""
+Seat Allocator Module
+=====================
+Picks the best available seats for "give me N seats" requests.
+
+Every seat has a quality score that only depends on the screen size, so
+the score matrix is computed once per (rows, columns):
+
+    score = ROW_WEIGHT    * closeness to the ideal row (about 2/3 back)
+          + CENTER_WEIGHT * closeness to the middle column
+
+The showtime's availability bitmap is unpacked into a rows x columns free
+mask, and sliding-window sums (cumulative sums along each row) give the
+score of every run of N seats in one pass. The best run that is entirely
+free wins. When no row has N free seats side by side, the largest best
+blocks are taken one after another until N seats are found.
+
+Configuration (environment variables):
+    SEAT_IDEAL_ROW_FRACTION: ideal row as a fraction of the depth, 0 = front
+                             (default: 0.65)
+    SEAT_ROW_WEIGHT:         weight of the row score (default: 0.6)
+    SEAT_CENTER_WEIGHT:      weight of the centre score (default: 0.4)
+"""
+
+import os
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from core.services.seat_inventory import SeatInventoryError, ShowtimeInventory
+
+SEAT_IDEAL_ROW_FRACTION = float(os.getenv("SEAT_IDEAL_ROW_FRACTION", "0.65"))
+SEAT_ROW_WEIGHT = float(os.getenv("SEAT_ROW_WEIGHT", "0.6"))
+SEAT_CENTER_WEIGHT = float(os.getenv("SEAT_CENTER_WEIGHT", "0.4"))
+
+
+class NotEnoughSeatsError(SeatInventoryError):
+    """Fewer free seats (of the requested type) than asked for"""
+
+
+@lru_cache(maxsize=256)
+def quality_scores(rows: int, columns: int) -> np.ndarray:
+    """Seat quality (rows x columns), higher is better"""
+    row = np.arange(rows, dtype=np.float64)
+    ideal = SEAT_IDEAL_ROW_FRACTION * (rows - 1)
+    row_score = 1.0 - np.abs(row - ideal) / max(rows - 1, 1)
+
+    column = np.arange(columns, dtype=np.float64)
+    middle = (columns - 1) / 2
+    center_score = 1.0 - np.abs(column - middle) / max(middle, 1)
+
+    scores = (
+        SEAT_ROW_WEIGHT * row_score[:, None]
+        + SEAT_CENTER_WEIGHT * center_score[None, :]
+    )
+    scores.setflags(write=False)
+    return scores
+
+
+def free_mask(inventory: ShowtimeInventory, seat_type: Optional[str] = None):
+    """Boolean rows x columns matrix of free seats (optionally of one type)"""
+    seat_map = inventory.seat_map
+    taken = np.unpackbits(
+        np.frombuffer(inventory.unavailable_bitmap(), dtype=np.uint8),
+        count=seat_map.size,
+        bitorder="little",
+    )
+    free = taken == 0
+    if seat_type is not None:
+        # Case-insensitive, like the pricing tiers: "premium" is "PREMIUM"
+        wanted = [
+            code
+            for code, name in enumerate(seat_map.palette)
+            if name.upper() == seat_type.upper()
+        ]
+        codes = np.frombuffer(seat_map.type_codes, dtype=np.uint8)
+        free &= np.isin(codes, wanted)
+    return free.reshape(seat_map.rows, seat_map.columns)
+
+
+@lru_cache(maxsize=256)
+def _score_sums(rows: int, columns: int) -> np.ndarray:
+    """Row-wise prefix sums of the quality scores, with a leading 0 column"""
+    sums = np.zeros((rows, columns + 1))
+    np.cumsum(quality_scores(rows, columns), axis=1, out=sums[:, 1:])
+    sums.setflags(write=False)
+    return sums
+
+
+def best_block(free: np.ndarray, size: int) -> Optional[Tuple[int, int]]:
+    """(row, first column) of the best fully free run of `size` seats"""
+    rows, columns = free.shape
+    if size > columns:
+        return None
+
+    free_sums = np.zeros((rows, columns + 1), dtype=np.int32)
+    np.cumsum(free, axis=1, out=free_sums[:, 1:])
+    score_sums = _score_sums(rows, columns)
+
+    window_free = free_sums[:, size:] - free_sums[:, :-size]
+    window_score = score_sums[:, size:] - score_sums[:, :-size]
+    window_score[window_free != size] = -np.inf
+
+    best = int(np.argmax(window_score))
+    row, column = divmod(best, window_score.shape[1])
+    if window_score[row, column] == -np.inf:
+        return None
+    return row, column
+
+
+def allocate(
+    inventory: ShowtimeInventory, count: int, seat_type: Optional[str] = None
+) -> List[List[str]]:
+    """
+    Best available seats as blocks of adjacent seat labels (one block
+    when the seats can sit together). Nothing is held.
+
+    Raises:
+        NotEnoughSeatsError: If fewer than `count` matching seats are free
+    """
+    seat_map = inventory.seat_map
+    free = free_mask(inventory, seat_type)
+    if int(free.sum()) < count:
+        raise NotEnoughSeatsError(f"Only {int(free.sum())} matching seats are free")
+
+    blocks = []
+    remaining = count
+    while remaining:
+        # Largest block that still fits, best-scoring first
+        for size in range(min(remaining, seat_map.columns), 0, -1):
+            found = best_block(free, size)
+            if found is not None:
+                break
+        row, column = found
+        free[row, column : column + size] = False
+        start = row * seat_map.columns + column
+        blocks.append(seat_map.labels[start : start + size])
+        remaining -= size
+    return blocks
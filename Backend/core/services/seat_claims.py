@@ -0,0 +1,136 @@
+"""
+Seat Claims Module
+==================
+Makes a seat sellable once across every API worker.
+
+Each worker keeps its own in-memory SeatInventory, so two workers can both
+see a seat as free. Before a booking is saved its seats are claimed in the
+`seat_claims` collection, one document per (showtime, seat) under a unique
+index: the database lets exactly one booking insert a given seat.
+
+A claim outlives its booking's hold only until someone needs the seat. A
+conflicting claim is taken over (with a conditional update, so only one
+claimant wins) when its booking is EXPIRED or CANCELLED, or has not been
+saved SEAT_CLAIM_ORPHAN_SECONDS after the claim (the claiming request
+died). Cancelling a booking releases its claims right away, and so does
+expiring an unpaid hold.
+
+Configuration (environment variables):
+    SEAT_CLAIM_ORPHAN_SECONDS: age after which a claim without a booking
+                               can be taken over (default: 60)
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from odmantic import ObjectId
+from pymongo.errors import BulkWriteError
+
+from core.database.database import get_engine
+from core.models.booking_model import Booking, BookingStatus
+from core.models.seat_claim_model import SeatClaim
+from core.services.seat_inventory import SeatUnavailableError
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+SEAT_CLAIM_ORPHAN_SECONDS = float(os.getenv("SEAT_CLAIM_ORPHAN_SECONDS", "60"))
+
+DUPLICATE_KEY = 11000
+
+# Bookings in these states keep their seats
+ACTIVE_STATUSES = (BookingStatus.PENDING.value, BookingStatus.CONFIRMED.value)
+
+
+class SeatClaims:
+    @property
+    def collection(self):
+        return get_engine().get_collection(SeatClaim)
+
+    async def claim(
+        self, showtime_id: ObjectId, booking_id: ObjectId, seats: List[str]
+    ) -> None:
+        """
+        Claim every seat for the booking, all-or-nothing
+
+        Raises:
+            SeatUnavailableError: If another live booking holds any seat
+        """
+        now = datetime.utcnow()
+        try:
+            await self.collection.insert_many(
+                [
+                    SeatClaim(
+                        showtime_id=showtime_id,
+                        seat=seat,
+                        booking_id=booking_id,
+                        claimed_at=now,
+                    ).model_dump_doc()
+                    for seat in seats
+                ],
+                ordered=False,
+            )
+            return
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != DUPLICATE_KEY for error in errors):
+                await self.release([booking_id])
+                raise
+            conflicts = [seats[error["index"]] for error in errors]
+
+        taken = await self._take_over(showtime_id, booking_id, conflicts, now)
+        if taken:
+            await self.release([booking_id])
+            raise SeatUnavailableError(taken)
+
+    async def _take_over(
+        self,
+        showtime_id: ObjectId,
+        booking_id: ObjectId,
+        seats: List[str],
+        now: datetime,
+    ) -> List[str]:
+        """Take the stale claims among `seats`, return the seats still taken"""
+        claims = [
+            doc
+            async for doc in self.collection.find(
+                {"showtime_id": showtime_id, "seat": {"$in": seats}}
+            )
+        ]
+        bookings = get_engine().get_collection(Booking)
+        holders = {
+            doc["_id"]: doc["status"]
+            async for doc in bookings.find(
+                {"_id": {"$in": list({doc["booking_id"] for doc in claims})}},
+                {"status": 1},
+            )
+        }
+        orphaned_before = now - timedelta(seconds=SEAT_CLAIM_ORPHAN_SECONDS)
+
+        # A claim released since the insert failed isn't ours either; the
+        # client simply retries
+        taken = set(seats) - {doc["seat"] for doc in claims}
+        for doc in claims:
+            status = holders.get(doc["booking_id"])
+            if status in ACTIVE_STATUSES or (
+                status is None and doc["claimed_at"] > orphaned_before
+            ):
+                taken.add(doc["seat"])
+                continue
+            # Only if nobody took it over first
+            result = await self.collection.update_one(
+                {"_id": doc["_id"], "booking_id": doc["booking_id"]},
+                {"$set": {"booking_id": booking_id, "claimed_at": now}},
+            )
+            if result.modified_count != 1:
+                taken.add(doc["seat"])
+        return [seat for seat in seats if seat in taken]
+
+    async def release(self, booking_ids: Iterable[ObjectId]) -> None:
+        """Drop the claims of bookings that no longer hold their seats"""
+        await self.collection.delete_many({"booking_id": {"$in": list(booking_ids)}})
+
+
+# Shared instance used by the booking flows
+seat_claims = SeatClaims()
@@ -0,0 +1,187 @@
+"""
+Seat Events Module
+==================
+Pushes seat availability changes to clients watching a showtime.
+
+Each subscriber first gets a snapshot (the compact seat map, see
+ShowtimeInventory.encode) and then diffs:
+
+    {"showtime_id": ..., "version": 42,
+     "held": ["C4", "C5"], "sold": [], "free": ["A1"]}
+
+Changes are coalesced per showtime for SEAT_PUSH_COALESCE_MS (a seat that
+changes twice in the window is sent once, in its latest state), and each
+diff is serialised once and shared by every subscriber.
+
+Every connection has a bounded queue (SEAT_PUSH_QUEUE_SIZE messages). A
+subscriber whose queue is full is dropped: its queue is replaced by an
+end-of-stream marker so the client reconnects and resyncs from a fresh
+snapshot, and one slow reader never holds up the others.
+
+Configuration (environment variables):
+    SEAT_PUSH_COALESCE_MS:       diff batching window (default: 100)
+    SEAT_PUSH_QUEUE_SIZE:        max undelivered messages per connection
+                                 (default: 32)
+    SEAT_PUSH_HEARTBEAT_SECONDS: keep-alive interval for idle streams
+                                 (default: 15)
+"""
+
+import asyncio
+import json
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.services.seat_inventory import (
+    SEAT_FREE,
+    SEAT_HELD,
+    SEAT_SOLD,
+    ShowtimeInventory,
+    add_change_listener,
+    seat_inventory,
+)
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+SEAT_PUSH_COALESCE_MS = float(os.getenv("SEAT_PUSH_COALESCE_MS", "100"))
+SEAT_PUSH_QUEUE_SIZE = int(os.getenv("SEAT_PUSH_QUEUE_SIZE", "32"))
+SEAT_PUSH_HEARTBEAT_SECONDS = float(os.getenv("SEAT_PUSH_HEARTBEAT_SECONDS", "15"))
+
+# (event name, JSON payload); None ends the stream
+Message = Optional[Tuple[str, bytes]]
+
+
+class Subscription:
+    __slots__ = ("showtime_id", "queue", "dropped")
+
+    def __init__(self, showtime_id: str):
+        self.showtime_id = showtime_id
+        self.queue: "asyncio.Queue[Message]" = asyncio.Queue(SEAT_PUSH_QUEUE_SIZE)
+        self.dropped = False
+
+    async def next(self, timeout: Optional[float] = None) -> Message:
+        """Next message; ("heartbeat", b"") if nothing arrives within timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return "heartbeat", b""
+
+
+class _Channel:
+    __slots__ = ("subscribers", "pending", "flush_handle")
+
+    def __init__(self):
+        self.subscribers: Set[Subscription] = set()
+        # seat index -> latest state within the coalescing window
+        self.pending: Dict[int, str] = {}
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+
+class SeatEventHub:
+    def __init__(self, coalesce_seconds: float = SEAT_PUSH_COALESCE_MS / 1000):
+        self.coalesce_seconds = coalesce_seconds
+        self._channels: Dict[str, _Channel] = {}
+
+        # Metrics
+        self.messages_total = 0
+        self.dropped_total = 0
+
+    # ------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------
+
+    async def subscribe(self, showtime_id: str) -> Subscription:
+        """
+        Start watching a showtime; the first message is a snapshot
+
+        Raises:
+            ShowtimeNotFoundError: If the showtime or its layout is missing
+        """
+        inventory = await seat_inventory.get(showtime_id)
+        subscription = Subscription(inventory.showtime_id)
+        subscription.queue.put_nowait(("snapshot", inventory.encode()))
+        channel = self._channels.setdefault(inventory.showtime_id, _Channel())
+        channel.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        channel = self._channels.get(subscription.showtime_id)
+        if channel is None:
+            return
+        channel.subscribers.discard(subscription)
+        if not channel.subscribers:
+            if channel.flush_handle is not None:
+                channel.flush_handle.cancel()
+            del self._channels[subscription.showtime_id]
+
+    def _drop(self, subscription: Subscription) -> None:
+        """Disconnect a subscriber that isn't keeping up"""
+        subscription.dropped = True
+        self.dropped_total += 1
+        logging.warning(
+            f"Dropping slow seat subscriber of showtime {subscription.showtime_id}"
+        )
+        self.unsubscribe(subscription)
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    # ------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------
+
+    def publish(
+        self, inventory: ShowtimeInventory, state: str, positions: List[int]
+    ) -> None:
+        """Seat inventory change listener, batches changes per showtime"""
+        channel = self._channels.get(inventory.showtime_id)
+        if channel is None:
+            return  # nobody is watching
+        for position in positions:
+            channel.pending[position] = state
+        if channel.flush_handle is None:
+            channel.flush_handle = asyncio.get_running_loop().call_later(
+                self.coalesce_seconds, self._flush, inventory
+            )
+
+    def _flush(self, inventory: ShowtimeInventory) -> None:
+        channel = self._channels.get(inventory.showtime_id)
+        if channel is None:
+            return
+        channel.flush_handle = None
+        pending, channel.pending = channel.pending, {}
+
+        labels = inventory.seat_map.labels
+        diff = {
+            "showtime_id": inventory.showtime_id,
+            "version": inventory.version,
+            "held": [],
+            "sold": [],
+            "free": [],
+        }
+        keys = {SEAT_HELD: "held", SEAT_SOLD: "sold", SEAT_FREE: "free"}
+        for position, state in sorted(pending.items()):
+            diff[keys[state]].append(labels[position])
+        message = ("diff", json.dumps(diff, separators=(",", ":")).encode())
+
+        for subscription in list(channel.subscribers):
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscription)
+        self.messages_total += 1
+
+    def metrics(self) -> dict:
+        return {
+            "showtimes": len(self._channels),
+            "subscribers": sum(
+                len(channel.subscribers) for channel in self._channels.values()
+            ),
+            "messages_total": self.messages_total,
+            "dropped_total": self.dropped_total,
+        }
+
+
+# Shared instance fed by the seat inventory
+seat_event_hub = SeatEventHub()
+add_change_listener(seat_event_hub.publish)
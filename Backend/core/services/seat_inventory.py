@@ -0,0 +1,485 @@
+"""
+Seat Inventory Module
+=====================
+Keeps an in-memory seat map per Showtime so availability checks and
+hold/confirm/release operations never have to scan the bookings collection.
+
+Each Screen layout is compiled once into a SeatMap (label <-> index lookup
+plus seat types). Every Showtime then keeps two bitsets over that map:
+one for held seats (PENDING bookings) and one for sold seats (CONFIRMED
+bookings). A seat is free when neither bit is set.
+
+Inventories are loaded lazily from the `bookings` collection the first time
+a showtime is requested and kept up to date by the booking flows afterwards.
+
+Seat maps are served to clients in a compact form (see `encode`): a
+base64 availability bitmap plus a seat-type palette, rendered once per
+inventory version and revalidated with an ETag built from that version.
+
+Once an inventory is loaded, every seat change is also reported to the
+listeners registered with `add_change_listener` (e.g. the push channel).
+"""
+
+import asyncio
+import base64
+import json
+import uuid
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from odmantic import ObjectId
+
+from core.database.database import get_engine
+from core.models.booking_model import Booking, BookingStatus
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen, SeatLayout
+from commons.loggers import logger
+
+logging = logger(__name__)
+
+
+SEAT_FREE = "FREE"
+SEAT_HELD = "HELD"
+SEAT_SOLD = "SOLD"
+
+# Type of seats that have no entry in SeatLayout.seat_types
+DEFAULT_SEAT_TYPE = "STANDARD"
+
+# Called as listener(inventory, new_state, seat_indexes) after each change
+_change_listeners: List[Callable[["ShowtimeInventory", str, List[int]], None]] = []
+
+
+def add_change_listener(
+    listener: Callable[["ShowtimeInventory", str, List[int]], None]
+) -> None:
+    _change_listeners.append(listener)
+
+
+# ============================================================
+# ERRORS
+# ============================================================
+
+
+class SeatInventoryError(Exception):
+    """Base error for seat inventory operations"""
+
+
+class ShowtimeNotFoundError(SeatInventoryError):
+    """Showtime (or its screen layout) does not exist"""
+
+
+class UnknownSeatError(SeatInventoryError):
+    """Seat label is not part of the screen layout"""
+
+    def __init__(self, seats: List[str]):
+        self.seats = seats
+        super().__init__(f"Unknown seats: {', '.join(seats)}")
+
+
+class SeatUnavailableError(SeatInventoryError):
+    """One or more seats are already held or sold"""
+
+    def __init__(self, seats: List[str]):
+        self.seats = seats
+        super().__init__(f"Seats not available: {', '.join(seats)}")
+
+
+# ============================================================
+# SEAT MAP (compiled screen layout)
+# ============================================================
+
+
+def row_label(row: int) -> str:
+    """Convert a 0-based row index to its label (0 -> A, 25 -> Z, 26 -> AA)"""
+    label = ""
+    row += 1
+    while row:
+        row, remainder = divmod(row - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+class SeatMap:
+    """
+    Compiled form of a SeatLayout.
+
+    Seats are numbered row-major: index = row * columns + column, with
+    labels built as <row letters><1-based column> e.g. "C7".
+    """
+
+    __slots__ = (
+        "rows",
+        "columns",
+        "size",
+        "labels",
+        "index",
+        "seat_types",
+        "palette",
+        "type_codes",
+    )
+
+    def __init__(self, rows: int, columns: int, seat_types: Optional[dict] = None):
+        self.rows = rows
+        self.columns = columns
+        self.size = rows * columns
+
+        self.labels: List[str] = [
+            f"{row_label(row)}{column + 1}"
+            for row in range(rows)
+            for column in range(columns)
+        ]
+        self.index: Dict[str, int] = {
+            label: position for position, label in enumerate(self.labels)
+        }
+
+        seat_types = seat_types or {}
+        self.seat_types: List[Optional[str]] = [
+            seat_types.get(label) for label in self.labels
+        ]
+
+        # Distinct seat types (default first) and one palette index per seat
+        self.palette: List[str] = [DEFAULT_SEAT_TYPE] + sorted(
+            {seat_type for seat_type in self.seat_types if seat_type}
+            - {DEFAULT_SEAT_TYPE}
+        )
+        codes = {seat_type: code for code, seat_type in enumerate(self.palette)}
+        self.type_codes = bytes(
+            codes[seat_type or DEFAULT_SEAT_TYPE] for seat_type in self.seat_types
+        )
+
+    @classmethod
+    def from_layout(cls, layout: SeatLayout) -> "SeatMap":
+        return cls(layout.rows, layout.columns, layout.seat_types)
+
+    def resolve(self, labels: Iterable[str]) -> List[int]:
+        """
+        Convert seat labels to indexes
+
+        Raises:
+            UnknownSeatError: If any label is not part of the layout
+        """
+        positions = []
+        unknown = []
+        for label in labels:
+            position = self.index.get(label)
+            if position is None:
+                unknown.append(label)
+            else:
+                positions.append(position)
+        if unknown:
+            raise UnknownSeatError(unknown)
+        return positions
+
+
+class SeatBitset:
+    """Fixed-size bitset stored in a bytearray (1 bit per seat)"""
+
+    __slots__ = ("size", "bits")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.bits = bytearray((size + 7) // 8)
+
+    def test(self, position: int) -> bool:
+        return bool(self.bits[position >> 3] & (1 << (position & 7)))
+
+    def set(self, position: int) -> None:
+        self.bits[position >> 3] |= 1 << (position & 7)
+
+    def clear(self, position: int) -> None:
+        self.bits[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+
+    def count(self) -> int:
+        return int.from_bytes(self.bits, "little").bit_count()
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.bits)
+
+
+# ============================================================
+# SHOWTIME INVENTORY
+# ============================================================
+
+
+class ShowtimeInventory:
+    """
+    Seat state for a single showtime.
+
+    All operations are O(1) per seat. Holds are all-or-nothing: if any
+    requested seat is taken, nothing is changed.
+    """
+
+    def __init__(self, showtime_id: str, seat_map: SeatMap):
+        self.showtime_id = showtime_id
+        self.seat_map = seat_map
+        self.held = SeatBitset(seat_map.size)
+        self.sold = SeatBitset(seat_map.size)
+
+        # Seat index -> booking id, and booking id -> seat indexes
+        self.owners: Dict[int, str] = {}
+        self.bookings: Dict[str, List[int]] = {}
+
+        # Bumped on every change, used to detect stale seat maps. The epoch
+        # tells apart inventories reloaded with the same version number.
+        self.version = 0
+        self.epoch = uuid.uuid4().hex[:8]
+        self._encoded: Optional[Tuple[int, bytes]] = None
+
+        # Listeners are only told about changes after the initial load
+        self.live = False
+
+    def _changed(self, state: str, positions: List[int]) -> None:
+        self.version += 1
+        if self.live:
+            for listener in _change_listeners:
+                try:
+                    listener(self, state, positions)
+                except Exception as e:
+                    logging.error(f"Seat change listener failed: {e}")
+
+    def _is_free(self, position: int) -> bool:
+        return not (self.held.test(position) or self.sold.test(position))
+
+    def seat_state(self, label: str) -> str:
+        """Return FREE, HELD or SOLD for a seat label"""
+        position = self.seat_map.resolve([label])[0]
+        if self.sold.test(position):
+            return SEAT_SOLD
+        if self.held.test(position):
+            return SEAT_HELD
+        return SEAT_FREE
+
+    def is_available(self, label: str) -> bool:
+        return self.seat_state(label) == SEAT_FREE
+
+    def unavailable(self, labels: Iterable[str]) -> List[str]:
+        """Return the subset of labels that are held or sold"""
+        labels = list(labels)
+        positions = self.seat_map.resolve(labels)
+        return [
+            label
+            for label, position in zip(labels, positions)
+            if not self._is_free(position)
+        ]
+
+    def hold(self, booking_id: str, labels: Iterable[str]) -> None:
+        """
+        Hold seats for a PENDING booking
+
+        Raises:
+            UnknownSeatError: If a label is not in the layout
+            SeatUnavailableError: If any seat is already held or sold
+        """
+        labels = list(labels)
+        positions = self.seat_map.resolve(labels)
+        taken = [
+            label
+            for label, position in zip(labels, positions)
+            if not self._is_free(position)
+        ]
+        if taken:
+            raise SeatUnavailableError(taken)
+
+        for position in positions:
+            self.held.set(position)
+            self.owners[position] = booking_id
+        self.bookings.setdefault(booking_id, []).extend(positions)
+        self._changed(SEAT_HELD, positions)
+
+    def confirm(self, booking_id: str) -> bool:
+        """Move a booking's held seats to sold. Returns False if nothing was held."""
+        positions = self.bookings.get(booking_id)
+        if not positions:
+            return False
+
+        for position in positions:
+            self.held.clear(position)
+            self.sold.set(position)
+        self._changed(SEAT_SOLD, positions)
+        return True
+
+    def release(self, booking_id: str, held_only: bool = False) -> List[str]:
+        """
+        Free every seat owned by a booking (held or sold). Returns the freed labels.
+
+        With held_only, a booking whose seats are already sold is left alone.
+        """
+        positions = self.bookings.get(booking_id)
+        if not positions:
+            return []
+        if held_only and self.sold.test(positions[0]):
+            return []
+        del self.bookings[booking_id]
+
+        for position in positions:
+            self.held.clear(position)
+            self.sold.clear(position)
+            self.owners.pop(position, None)
+        self._changed(SEAT_FREE, positions)
+        return [self.seat_map.labels[position] for position in positions]
+
+    def counts(self) -> dict:
+        held = self.held.count()
+        sold = self.sold.count()
+        return {
+            "total": self.seat_map.size,
+            "held": held,
+            "sold": sold,
+            "free": self.seat_map.size - held - sold,
+        }
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.epoch}-{self.version}"'
+
+    def unavailable_bitmap(self) -> bytes:
+        """Held | sold as one bitset (bit i set = seat i can't be picked)"""
+        taken = int.from_bytes(self.held.bits, "little") | int.from_bytes(
+            self.sold.bits, "little"
+        )
+        return taken.to_bytes(len(self.held.bits), "little")
+
+    def encode(self) -> bytes:
+        """
+        Compact JSON seat map, rendered once per version
+
+        `unavailable` is a base64 bitmap over the seats in row-major order
+        (seat i is bit i & 7 of byte i >> 3). `seat_types` is base64 with
+        one byte per seat indexing into `palette`; it is omitted when every
+        seat is of the default type.
+        """
+        if self._encoded is not None and self._encoded[0] == self.version:
+            return self._encoded[1]
+
+        seat_map = self.seat_map
+        body = {
+            "showtime_id": self.showtime_id,
+            "version": self.version,
+            "rows": seat_map.rows,
+            "columns": seat_map.columns,
+            "unavailable": base64.b64encode(self.unavailable_bitmap()).decode(),
+            "palette": seat_map.palette,
+            "seat_types": (
+                base64.b64encode(seat_map.type_codes).decode()
+                if len(seat_map.palette) > 1
+                else None
+            ),
+            **self.counts(),
+        }
+        payload = json.dumps(body, separators=(",", ":")).encode()
+        self._encoded = (self.version, payload)
+        return payload
+
+
+# ============================================================
+# INVENTORY REGISTRY
+# ============================================================
+
+
+class SeatInventory:
+    """
+    Registry of ShowtimeInventory objects, loaded lazily per showtime.
+
+    Compiled SeatMaps are shared between showtimes on the same screen.
+    """
+
+    def __init__(self):
+        self._showtimes: Dict[str, ShowtimeInventory] = {}
+        self._seat_maps: Dict[str, SeatMap] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @property
+    def engine(self):
+        return get_engine()
+
+    def peek(self, showtime_id: str) -> Optional[ShowtimeInventory]:
+        """Return the inventory only if it is already loaded"""
+        return self._showtimes.get(str(showtime_id))
+
+    async def get(self, showtime_id: str) -> ShowtimeInventory:
+        """
+        Return the inventory for a showtime, loading it on first use
+
+        Raises:
+            ShowtimeNotFoundError: If the showtime or its screen layout is missing
+        """
+        showtime_id = str(showtime_id)
+        inventory = self._showtimes.get(showtime_id)
+        if inventory is not None:
+            return inventory
+
+        lock = self._locks.setdefault(showtime_id, asyncio.Lock())
+        try:
+            async with lock:
+                # Another request may have loaded it while we waited
+                inventory = self._showtimes.get(showtime_id)
+                if inventory is None:
+                    inventory = await self._load(showtime_id)
+                    inventory.live = True
+                    self._showtimes[showtime_id] = inventory
+        finally:
+            # Also when the load failed, or unknown ids would pile up locks
+            self._locks.pop(showtime_id, None)
+        return inventory
+
+    def evict(self, showtime_id: str) -> None:
+        """Drop a showtime from memory (e.g. after the show has ended)"""
+        self._showtimes.pop(str(showtime_id), None)
+
+    def invalidate_screen(self, screen_id: str) -> None:
+        """Forget a compiled layout after the screen has been edited"""
+        self._seat_maps.pop(str(screen_id), None)
+
+    async def _get_seat_map(self, screen_id: ObjectId) -> SeatMap:
+        seat_map = self._seat_maps.get(str(screen_id))
+        if seat_map is not None:
+            return seat_map
+
+        screen = await self.engine.find_one(Screen, Screen.id == screen_id)
+        if not screen or not screen.layout:
+            raise ShowtimeNotFoundError(f"Screen {screen_id} has no seat layout")
+
+        seat_map = SeatMap.from_layout(screen.layout)
+        self._seat_maps[str(screen_id)] = seat_map
+        return seat_map
+
+    async def _load(self, showtime_id: str) -> ShowtimeInventory:
+        try:
+            showtime_oid = ObjectId(showtime_id)
+        except Exception:
+            raise ShowtimeNotFoundError(f"Invalid showtime id {showtime_id}")
+
+        showtime = await self.engine.find_one(Showtime, Showtime.id == showtime_oid)
+        if not showtime:
+            raise ShowtimeNotFoundError(f"Showtime {showtime_id} not found")
+
+        seat_map = await self._get_seat_map(showtime.screen_id)
+        inventory = ShowtimeInventory(showtime_id, seat_map)
+
+        # Only seats and status are needed, skip the rest of the document
+        cursor = self.engine.get_collection(Booking).find(
+            {
+                "showtime_id": showtime_oid,
+                "status": {
+                    "$in": [BookingStatus.PENDING.value, BookingStatus.CONFIRMED.value]
+                },
+            },
+            {"seats": 1, "status": 1},
+        )
+        async for doc in cursor:
+            booking_id = str(doc["_id"])
+            try:
+                inventory.hold(booking_id, doc.get("seats", []))
+            except SeatInventoryError as e:
+                logging.warning(
+                    f"Skipping booking {booking_id} for showtime {showtime_id}: {e}"
+                )
+                continue
+            if doc.get("status") == BookingStatus.CONFIRMED.value:
+                inventory.confirm(booking_id)
+
+        logging.info(f"Loaded seat inventory for showtime {showtime_id}")
+        return inventory
+
+
+# Shared instance used by the booking flows
+seat_inventory = SeatInventory()
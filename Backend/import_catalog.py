@@ -0,0 +1,91 @@
+"""
+Catalog Bulk Import
+===================
+Streams a CSV or JSON Lines file into movies, theaters, screens or
+showtimes, in batches and with constant memory, and prints a report of
+rejected lines.
+
+Uses the same MongoDB settings as the API (MONGO_URL, DATABASE_NAME). A
+running API picks the new rows up on its next schedule index refresh (or
+right away through its change stream, where available).
+
+Examples:
+    python import_catalog.py theaters theaters.csv
+    python import_catalog.py showtimes schedule.jsonl --batch-size 5000
+    python import_catalog.py showtimes schedule.csv --dry-run --report report.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import AsyncIterator
+
+from core.database.database import close_mongo_connection, connect_to_mongo
+from core.services.bulk_import import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    IMPORT_MODELS,
+    bulk_importer,
+)
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+async def read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(READ_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+async def run(args) -> dict:
+    await connect_to_mongo()
+    try:
+        return await bulk_importer.run(
+            args.collection,
+            read_chunks(args.path),
+            format=args.format,
+            dry_run=args.dry_run,
+            batch_size=args.batch_size,
+        )
+    finally:
+        await close_mongo_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("collection", choices=sorted(IMPORT_MODELS))
+    parser.add_argument("path", help="CSV (with header) or JSONL file")
+    parser.add_argument(
+        "--format", choices=IMPORT_FORMATS, help="defaults from the file extension"
+    )
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="only validate")
+    parser.add_argument("--report", help="write the full report JSON here")
+    args = parser.parse_args()
+    if args.format is None:
+        args.format = "csv" if args.path.lower().endswith(".csv") else "jsonl"
+
+    report = asyncio.run(run(args))
+
+    print(
+        f"{report['collection']}: {report['rows']} rows, "
+        f"{report['inserted']} inserted, {report['rejected']} rejected"
+        f"{' (dry run)' if report['dry_run'] else ''}"
+    )
+    for error in report["errors"][:20]:
+        print(f"  line {error['line']}: {'; '.join(error['errors'])}")
+    if report["rejected"] > 20:
+        print(f"  ... {report['rejected'] - 20} more")
+
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report, file, indent=2)
+    sys.exit(1 if report["rejected"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Shared fixtures: an in-memory MongoDB (mongomock-motor) behind the engines
+the application uses.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Fresh in-memory database wired into db_instance"""
+    mongomock = pytest.importorskip("mongomock")
+    from mongomock_motor import AsyncMongoMockClient
+    from odmantic import AIOEngine
+
+    from core.database.database import db_instance
+
+    # mongomock has no sessions; ODMantic only uses them for ordering
+    mongomock.ignore_feature("session")
+
+    # PyMongo 4.11+ passes `sort` to bulk updates, which mongomock predates
+    add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+    def add_update_without_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+
+    monkeypatch.setattr(
+        mongomock.collection.BulkOperationBuilder,
+        "add_update",
+        add_update_without_sort,
+    )
+
+    class _NoSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def end_session(self):
+            pass
+
+    client = AsyncMongoMockClient()
+
+    async def start_session(*args, **kwargs):
+        return _NoSession()
+
+    client.start_session = start_session
+    saved = (db_instance.client, db_instance.engine, db_instance.catalog_engine)
+    db_instance.client = client
+    db_instance.engine = AIOEngine(client=client, database="tests")
+    db_instance.catalog_engine = db_instance.engine
+    yield db_instance.engine
+    db_instance.client, db_instance.engine, db_instance.catalog_engine = saved
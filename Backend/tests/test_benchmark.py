@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmark import Recorder, compare, summarize
+
+
+def _stats(**overrides):
+    stats = {
+        "requests": 100,
+        "errors": 0,
+        "error_rate": 0.0,
+        "throughput_rps": 100.0,
+        "p50_ms": 5.0,
+        "p95_ms": 10.0,
+        "p99_ms": 12.0,
+        "max_ms": 15.0,
+    }
+    stats.update(overrides)
+    return stats
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.is_success = 200 <= status_code < 300
+
+
+def test_non_2xx_are_errors_not_samples():
+    recorder = Recorder()
+    recorder.recording = True
+
+    class Client:
+        def __init__(self, codes):
+            self.codes = iter(codes)
+
+        async def request(self, method, url, **kwargs):
+            return _Response(next(self.codes))
+
+    async def main():
+        client = Client([200, 201, 429, 429, 500])
+        for _ in range(5):
+            await recorder.request(client, "POST /x", "POST", "/x")
+
+    asyncio.run(main())
+    stats = summarize(recorder, duration=1.0)["POST /x"]
+    assert stats["requests"] == 5
+    assert stats["errors"] == 3
+    assert stats["error_rate"] == 0.6
+    assert stats["throughput_rps"] == 2.0
+    assert stats["statuses"] == {"200": 1, "201": 1, "429": 2, "500": 1}
+
+
+def test_compare_fails_on_error_rate_regression():
+    baseline = {"routes": {"POST /x": _stats()}}
+    # Faster and "busier", but mostly failing
+    results = {"routes": {"POST /x": _stats(p95_ms=1.0, error_rate=0.9)}}
+    assert not compare(results, baseline, max_regression=0.1)
+    assert compare({"routes": {"POST /x": _stats()}}, baseline, 0.1)
+
+
+def test_compare_fails_when_a_route_is_no_longer_reached():
+    baseline = {"routes": {"POST /x": _stats(), "GET /me": _stats()}}
+    results = {"routes": {"POST /x": _stats()}}
+    assert not compare(results, baseline, max_regression=0.1)
+
+
+def test_in_process_scenarios_are_not_throttled():
+    pytest.importorskip("mongomock_motor")
+    from benchmark import SCENARIOS, setup_in_process_app
+
+    app = setup_in_process_app()
+    recorder = Recorder()
+    recorder.recording = True
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", follow_redirects=True
+        ) as client:
+            # More auth requests than one IP's burst allows
+            for _ in range(15):
+                await asyncio.gather(
+                    *(scenario(client, recorder) for scenario in SCENARIOS.values())
+                )
+
+    asyncio.run(main())
+    routes = summarize(recorder, duration=1.0)
+    assert "GET /users/me" in routes
+    for route, stats in routes.items():
+        assert stats["errors"] == 0, (route, stats["statuses"])
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from odmantic import ObjectId
+
+from core.apis.schemas.requests.booking_schema import BookingCreate
+from core.controller.booking_controller import BookingController
+from core.models.booking_model import Booking, BookingStatus
+from core.models.seat_claim_model import SeatClaim
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen, SeatLayout
+from core.services.seat_inventory import ShowtimeNotFoundError, seat_inventory
+
+
+def _showtime(screen):
+    start = datetime.utcnow() + timedelta(days=1)
+    return Showtime(
+        movie_id=ObjectId(),
+        theater_id=screen.theater_id,
+        screen_id=screen.id,
+        start_time=start,
+        end_time=start + timedelta(hours=2),
+        base_price=200,
+    )
+
+
+def test_seat_is_sold_once_across_workers(engine):
+    controller = BookingController()
+    screen = Screen(
+        theater_id=ObjectId(),
+        name="Screen 1",
+        capacity=4,
+        layout=SeatLayout(rows=1, columns=4),
+    )
+    showtime = _showtime(screen)
+    request = BookingCreate(showtime_id=str(showtime.id), seats=["A1", "A2"])
+
+    async def main():
+        await engine.configure_database([SeatClaim])
+        await engine.save_all([screen, showtime])
+        first = await controller.create_booking(str(ObjectId()), request)
+
+        # Another worker loaded its seat map before the first booking
+        seat_inventory.peek(showtime.id).release(first["id"])
+        with pytest.raises(HTTPException) as conflict:
+            await controller.create_booking(str(ObjectId()), request)
+        assert conflict.value.status_code == 409
+
+        # Once the first hold is gone, its claims can be taken over
+        await engine.get_collection(Booking).update_one(
+            {"_id": ObjectId(first["id"])},
+            {"$set": {"status": BookingStatus.EXPIRED.value}},
+        )
+        seat_inventory.evict(showtime.id)
+        return await controller.create_booking(str(ObjectId()), request)
+
+    assert asyncio.run(main())["seats"] == ["A1", "A2"]
+
+
+def test_failed_inventory_load_drops_its_lock(engine):
+    async def main():
+        with pytest.raises(ShowtimeNotFoundError):
+            await seat_inventory.get(str(ObjectId()))
+
+    asyncio.run(main())
+    assert seat_inventory._locks == {}
@@ -0,0 +1,62 @@
+import asyncio
+import json
+from datetime import datetime
+
+from odmantic import ObjectId
+
+from core.models.movie_model import Movie
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen
+from core.services.bulk_import import bulk_importer
+
+
+def _show(movie, screen, start, end):
+    return {
+        "movie_id": str(movie.id),
+        "theater_id": str(screen.theater_id),
+        "screen_id": str(screen.id),
+        "start_time": f"2026-11-01T{start}:00",
+        "end_time": f"2026-11-01T{end}:00",
+        "base_price": 200,
+    }
+
+
+def test_showtime_import_applies_the_schedule_checks(engine):
+    movie = Movie(
+        title="Long film",
+        description="x",
+        language="en",
+        duration_minutes=120,
+        release_date=datetime(2026, 1, 1),
+    )
+    screen = Screen(theater_id=ObjectId(), name="Screen 1", capacity=100)
+    existing = Showtime(
+        movie_id=movie.id,
+        theater_id=screen.theater_id,
+        screen_id=screen.id,
+        start_time=datetime(2026, 11, 1, 10),
+        end_time=datetime(2026, 11, 1, 12),
+        base_price=200,
+    )
+    rows = [
+        _show(movie, screen, "12:05", "14:05"),  # inside the cleaning gap
+        _show(movie, screen, "13:00", "14:00"),  # shorter than the movie
+        _show(movie, screen, "15:00", "17:00"),
+        _show(movie, screen, "17:10", "19:10"),  # overlaps line 3, same batch
+        _show(movie, screen, "16:00", "18:00"),  # overlaps line 3, next batch
+    ]
+
+    async def chunks():
+        yield "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+    async def main():
+        await engine.save_all([movie, screen, existing])
+        return await bulk_importer.run("showtimes", chunks(), batch_size=2)
+
+    report = asyncio.run(main())
+    assert report["inserted"] == 1
+    assert {error["line"] for error in report["errors"]} == {1, 2, 4, 5}
+    messages = {error["line"]: error["errors"][0] for error in report["errors"]}
+    assert str(existing.id) in messages[1]
+    assert "shorter than the movie" in messages[2]
+    assert "line 3" in messages[4]
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from commons.cache import TTLCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache("test")
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value"] * 5
+    assert calls == 1
+
+
+def test_cancelled_load_does_not_hang_waiters():
+    cache = TTLCache("test")
+
+    async def main():
+        loading = asyncio.Event()
+
+        async def slow():
+            loading.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            return "value"
+
+        first = asyncio.create_task(cache.get_or_load("k", slow))
+        await loading.wait()
+        waiter = asyncio.create_task(cache.get_or_load("k", fast))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # The waiter loads the key itself instead of hanging
+        assert await asyncio.wait_for(waiter, timeout=1) == "value"
+        # And the key is not stuck as "loading"
+        assert await asyncio.wait_for(cache.get_or_load("k", fast), 1) == "value"
+
+    asyncio.run(main())
+
+
+def test_failed_load_reaches_waiters_and_is_retried():
+    cache = TTLCache("test")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("down")
+
+    async def main():
+        results = await asyncio.gather(
+            cache.get_or_load("k", fail),
+            cache.get_or_load("k", fail),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        async def ok():
+            return 1
+
+        assert await cache.get_or_load("k", ok) == 1
+
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from odmantic import ObjectId
+
+from core.apis.schemas.requests.booking_schema import BookingCreate
+from core.controller.booking_controller import BookingController
+from core.models.booking_model import Booking, BookingStatus
+from core.models.seat_claim_model import SeatClaim
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen, SeatLayout
+from core.services.hold_expiry import HoldExpiryScheduler
+from core.services.seat_inventory import seat_inventory
+from commons.metrics import metrics
+
+
+def test_only_bookings_that_expired_give_their_seats_back(engine):
+    controller = BookingController()
+    screen = Screen(
+        theater_id=ObjectId(),
+        name="Screen 1",
+        capacity=4,
+        layout=SeatLayout(rows=1, columns=4),
+    )
+    start = datetime.utcnow() + timedelta(days=1)
+    showtime = Showtime(
+        movie_id=ObjectId(),
+        theater_id=screen.theater_id,
+        screen_id=screen.id,
+        start_time=start,
+        end_time=start + timedelta(hours=2),
+        base_price=200,
+    )
+    scheduler = HoldExpiryScheduler()
+
+    async def main():
+        await engine.configure_database([SeatClaim])
+        await engine.save_all([screen, showtime])
+        unpaid, paid = [
+            await controller.create_booking(
+                str(ObjectId()),
+                BookingCreate(showtime_id=str(showtime.id), seats=seats),
+            )
+            for seats in (["A1", "A2"], ["A3", "A4"])
+        ]
+        # Paid between the deadline and the expiry batch
+        await engine.get_collection(Booking).update_one(
+            {"_id": ObjectId(paid["id"])},
+            {"$set": {"status": BookingStatus.CONFIRMED.value}},
+        )
+        deadline = datetime.utcnow().timestamp()
+        await scheduler._expire(
+            [
+                (unpaid["id"], str(showtime.id), deadline),
+                (paid["id"], str(showtime.id), deadline),
+            ]
+        )
+        claims = engine.get_collection(SeatClaim).find({}, {"seat": 1})
+        return sorted([doc["seat"] async for doc in claims])
+
+    assert asyncio.run(main()) == ["A3", "A4"]
+    inventory = seat_inventory.peek(str(showtime.id))
+    assert inventory.unavailable(["A1", "A2", "A3", "A4"]) == ["A3", "A4"]
+    assert scheduler.expired_total == 1
+
+    rendered = metrics.render()
+    assert "hold_expiry_queue_depth " in rendered
+    assert "hold_expiry_last_lag_seconds " in rendered
@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from starlette.responses import PlainTextResponse
+
+from commons.metrics import UNMATCHED_ROUTE, Metrics, MetricsMiddleware
+
+
+class Throttle:
+    """Answers POST /users/login with a 429 before routing, like the limiter"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/users/login":
+            response = PlainTextResponse("slow down", status_code=429)
+            return await response(scope, receive, send)
+        await self.app(scope, receive, send)
+
+
+def test_throttled_requests_are_labelled_with_their_route():
+    registry = Metrics()
+    router = APIRouter()
+
+    @router.post("/login")
+    async def login():
+        return {}
+
+    @router.get("/{user_id}")
+    async def get_user(user_id: str):
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/users")
+    app.add_middleware(Throttle)
+    app.add_middleware(MetricsMiddleware, registry=registry)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            assert (await c.post("/users/login")).status_code == 429
+            assert (await c.get("/users/42")).status_code == 200
+            assert (await c.get("/nowhere")).status_code == 404
+
+    asyncio.run(main())
+    assert registry.http_responses.values == {
+        ("/users/login", "POST", 429): 1,
+        ("/users/{user_id}", "GET", 200): 1,
+        (UNMATCHED_ROUTE, "GET", 404): 1,
+    }
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from odmantic import AIOEngine
+
+from core.controller import movie_controller
+from core.controller.movie_controller import (
+    MovieController,
+    movie_cache,
+    movie_list_cache,
+)
+from core.database.database import db_instance
+from core.models.movie_model import Movie
+
+
+def test_refill_after_write_ignores_lagging_secondary(engine):
+    # A "secondary" that never receives the update
+    secondary = AIOEngine(client=db_instance.client, database="tests_secondary")
+    db_instance.catalog_engine = secondary
+    movie_cache.clear()
+    movie_list_cache.clear()
+    controller = MovieController()
+    movie = Movie(
+        title="Old title",
+        description="x",
+        language="en",
+        duration_minutes=120,
+        release_date=datetime(2026, 1, 1),
+    )
+
+    async def main():
+        await engine.save(movie)
+        await secondary.get_collection(Movie).insert_one(movie.model_dump_doc())
+        assert (await controller.get_movie(str(movie.id)))["title"] == "Old title"
+        assert (await controller.list_movies())[0]["title"] == "Old title"
+
+        await controller.update_movie(str(movie.id), {"title": "New title"})
+
+        assert (await controller.get_movie(str(movie.id)))["title"] == "New title"
+        assert (await controller.list_movies())[0]["title"] == "New title"
+
+    asyncio.run(main())
+
+
+def test_movie_ids_share_one_entry_and_misses_are_not_kept(engine, monkeypatch):
+    monkeypatch.setattr(movie_controller, "MOVIE_CACHE_MISS_TTL_SECONDS", 0)
+    movie_cache.clear()
+    controller = MovieController()
+    movie = Movie(
+        title="Late arrival",
+        description="x",
+        language="en",
+        duration_minutes=120,
+        release_date=datetime(2026, 1, 1),
+    )
+
+    async def main():
+        with pytest.raises(HTTPException) as missing:
+            await controller.get_movie(str(movie.id).upper())
+        assert missing.value.status_code == 404
+
+        # Created through another worker, whose cache write we never see
+        await engine.save(movie)
+        assert (await controller.get_movie(str(movie.id).upper()))["title"]
+        assert (await controller.get_movie(str(movie.id)))["title"]
+
+    asyncio.run(main())
+    assert movie_cache.metrics()["size"] == 1
@@ -0,0 +1,76 @@
+import asyncio
+
+from core.controller.user_controller import UserController
+from core.models.user_model import User, UserStatus
+from core.services.otp_store import otp_store
+from commons.auth import get_password_hash
+
+
+def test_existing_mixed_case_account_logs_in_and_resets(engine, monkeypatch):
+    controller = UserController()
+    issued = []
+    issue = otp_store.issue
+
+    async def capture(email, *args, **kwargs):
+        issued.append(await issue(email, *args, **kwargs))
+        return issued[-1]
+
+    monkeypatch.setattr(otp_store, "issue", capture)
+    # Stored as given at sign-up, before any normalisation
+    user = User(
+        first_name="John",
+        last_name="Doe",
+        email="John.Doe@example.com",
+        mobile_number="9876543210",
+        hashed_password=get_password_hash("OldPassword123"),
+        status=UserStatus.ACTIVE,
+    )
+
+    async def login(password):
+        return await controller.login_user(
+            {"email": "John.Doe@example.com", "password": password}
+        )
+
+    async def main():
+        await engine.get_collection(User).insert_one(user.model_dump_doc())
+        assert (await login("OldPassword123")).status_code == 200
+
+        await controller.forgot_password("John.Doe@example.com")
+        await controller.reset_password(
+            {
+                "email": "John.Doe@example.com",
+                "otp": issued[0],
+                "new_password": "NewPassword123",
+            }
+        )
+        return await login("NewPassword123")
+
+    assert asyncio.run(main()).status_code == 200
+
+
+def test_issued_otp_is_never_logged(engine, monkeypatch, caplog):
+    controller = UserController()
+    issued = []
+    issue = otp_store.issue
+
+    async def capture(email, *args, **kwargs):
+        issued.append(await issue(email, *args, **kwargs))
+        return issued[-1]
+
+    monkeypatch.setattr(otp_store, "issue", capture)
+    user = User(
+        first_name="Asha",
+        last_name="Rao",
+        email="asha@example.com",
+        mobile_number="9876543210",
+        hashed_password="x",
+    )
+
+    async def main():
+        await engine.get_collection(User).insert_one(user.model_dump_doc())
+        await controller.forgot_password("asha@example.com")
+
+    with caplog.at_level("DEBUG"):
+        asyncio.run(main())
+    assert "OTP issued" in caplog.text
+    assert issued[0] not in caplog.text
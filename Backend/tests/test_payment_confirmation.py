@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from odmantic import ObjectId
+
+from core.models.booking_model import Booking, BookingStatus
+from core.models.rollup_model import RevenueRollup
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Theater
+from core.models.transaction_model import Transaction
+from core.services.payment_confirmation import PaymentConfirmationPipeline
+from core.services.revenue_rollup import revenue_rollups
+
+
+def test_booking_paid_twice_is_rolled_up_once(engine):
+    theater = Theater(
+        owner_id=ObjectId(), name="Plaza", location="Pune", address="MG Road"
+    )
+    showtime = Showtime(
+        movie_id=ObjectId(),
+        theater_id=theater.id,
+        screen_id=ObjectId(),
+        start_time=datetime(2026, 11, 1, 10),
+        end_time=datetime(2026, 11, 1, 12),
+        base_price=200,
+    )
+    booking = Booking(
+        user_id=ObjectId(),
+        showtime_id=showtime.id,
+        seats=["A1", "A2"],
+        total_amount=400,
+        expires_at=datetime.utcnow() + timedelta(minutes=10),
+    )
+    payments = [
+        Transaction(booking_id=booking.id, user_id=booking.user_id, amount=400)
+        for _ in range(2)
+    ]
+    pipeline = PaymentConfirmationPipeline()
+
+    async def main():
+        # As in production: a reconcile upsert can't duplicate a rollup
+        await engine.configure_database([RevenueRollup])
+        await engine.save_all([theater, showtime, booking, *payments])
+        callbacks = [
+            {"transaction_id": str(payment.id), "status": "SUCCESS"}
+            for payment in payments
+        ]
+        results = await pipeline.confirm_batch(callbacks)
+        # The gateway delivers the first callback again later
+        results += await pipeline.confirm_batch(callbacks[:1])
+        # Reconciling agrees with the increments: the duplicate is no revenue
+        await revenue_rollups.reconcile(days=1)
+        rollups = [doc async for doc in engine.get_collection(RevenueRollup).find()]
+        return results, rollups
+
+    results, rollups = asyncio.run(main())
+    assert [result["ok"] for result in results] == [True, False, True]
+    assert "needs a refund" in results[1]["error"]
+    assert len(rollups) == 1
+    assert (rollups[0]["bookings"], rollups[0]["seats_sold"]) == (1, 2)
+    assert rollups[0]["revenue"] == 400
+
+
+def test_submitted_callbacks_are_answered_whether_or_not_running(engine):
+    pipeline = PaymentConfirmationPipeline(window_seconds=0)
+    process = pipeline._process
+    in_flight = asyncio.Event()
+
+    async def slow_process(callbacks):
+        in_flight.set()
+        await asyncio.sleep(0.05)
+        return await process(callbacks)
+
+    pipeline._process = slow_process
+    callback = {"transaction_id": str(ObjectId()), "status": "SUCCESS"}
+
+    async def main():
+        # Not started yet
+        before = await asyncio.wait_for(pipeline.submit(callback), 1)
+
+        await pipeline.start()
+        submitted = asyncio.create_task(pipeline.submit(callback))
+        await in_flight.wait()
+        # Shutting down while that batch is being written
+        await pipeline.stop()
+        during = await asyncio.wait_for(submitted, 1)
+
+        after = await asyncio.wait_for(pipeline.submit(callback), 1)
+        return before, during, after
+
+    results = asyncio.run(main())
+    assert [result["error"] for result in results] == ["Transaction not found"] * 3
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import httpx
+from fastapi import FastAPI
+
+from commons.metrics import metrics
+from commons.rate_limit import Bucket, MemoryRateLimitBackend, RateLimitMiddleware
+
+
+def _app():
+    app = FastAPI()
+
+    @app.post("/users/login")
+    async def login():
+        return {}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        paths={"/users/login": "login"},
+        backend=MemoryRateLimitBackend(),
+        ip_bucket=Bucket(1000, 1000),
+        email_bucket=Bucket(1, 2),
+        enabled=True,
+    )
+    return app
+
+
+def _login(client, padding=""):
+    body = json.dumps({"email": "a@example.com", "password": "x", "pad": padding})
+    return client.post(
+        "/users/login", content=body, headers={"content-type": "application/json"}
+    )
+
+
+def test_padded_body_cannot_skip_the_email_bucket():
+    async def main():
+        transport = httpx.ASGITransport(app=_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            statuses = [(await _login(c)).status_code for _ in range(3)]
+            padded = await _login(c, padding="x" * 70_000)
+            return statuses, padded.status_code
+
+    statuses, padded = asyncio.run(main())
+    assert statuses == [200, 200, 429]
+    assert padded == 413
+    rendered = metrics.render()
+    assert "rate_limit_limited_total 1" in rendered
+    assert "rate_limit_too_large_total 1" in rendered
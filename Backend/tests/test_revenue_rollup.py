@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from odmantic import AIOEngine, ObjectId
+
+from core.database.database import db_instance
+from core.models.booking_model import Booking, BookingStatus
+from core.models.rollup_model import RevenueRollup
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Screen, Theater
+from core.models.transaction_model import Transaction, TransactionStatus
+from core.services.revenue_rollup import revenue_rollups
+from core.services.schedule_index import local_date
+
+
+def test_reconcile_ignores_lagging_secondary(engine):
+    # A "secondary" that has the catalog but not the latest booking
+    secondary = AIOEngine(client=db_instance.client, database="tests_secondary")
+    db_instance.catalog_engine = secondary
+    theater = Theater(
+        owner_id=ObjectId(), name="Plaza", location="Pune", address="MG Road"
+    )
+    screen = Screen(theater_id=theater.id, name="Screen 1", capacity=100)
+    showtime = Showtime(
+        movie_id=ObjectId(),
+        theater_id=theater.id,
+        screen_id=screen.id,
+        start_time=datetime.utcnow() + timedelta(days=1),
+        end_time=datetime.utcnow() + timedelta(days=1, hours=2),
+        base_price=200,
+    )
+    booking = Booking(
+        user_id=ObjectId(),
+        showtime_id=showtime.id,
+        seats=["A1", "A2"],
+        total_amount=400,
+        status=BookingStatus.CONFIRMED,
+    )
+    payment = Transaction(
+        booking_id=booking.id,
+        user_id=booking.user_id,
+        amount=400,
+        status=TransactionStatus.SUCCESS,
+    )
+    # Already incremented by the confirmation
+    rollup = RevenueRollup(
+        theater_id=theater.id,
+        screen_id=screen.id,
+        movie_id=showtime.movie_id,
+        day=local_date(showtime.start_time).isoformat(),
+        owner_id=theater.owner_id,
+        shows=1,
+        capacity=100,
+        bookings=1,
+        seats_sold=2,
+        revenue=400,
+        updated_at=datetime.utcnow() - timedelta(minutes=1),
+    )
+
+    async def main():
+        await engine.save_all([theater, screen, showtime, booking, payment, rollup])
+        for model in (theater, screen, showtime):
+            await secondary.get_collection(type(model)).insert_one(model.model_dump_doc())
+        result = await revenue_rollups.reconcile(days=1)
+        doc = await engine.get_collection(RevenueRollup).find_one({})
+        return result, doc
+
+    result, doc = asyncio.run(main())
+    assert result["corrected"] == 0
+    assert (doc["bookings"], doc["seats_sold"], doc["revenue"]) == (1, 2, 400)
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+from odmantic import ObjectId
+from pymongo.errors import AutoReconnect
+
+from core.models.movie_model import Movie
+from core.models.showtime_model import Showtime
+from core.models.theater_model import Theater
+from core.services import schedule_index as schedule_index_module
+from core.services.schedule_index import ScheduleIndex, local_date
+
+
+def _catalog():
+    movie = Movie(
+        title="Dune",
+        description="Sand",
+        language="English",
+        duration_minutes=155,
+        release_date=datetime.utcnow(),
+    )
+    theater = Theater(
+        owner_id=ObjectId(),
+        name="Galaxy",
+        location="Pune",
+        address="MG Road",
+    )
+    start = datetime.utcnow() + timedelta(days=1)
+    showtime = Showtime(
+        movie_id=movie.id,
+        theater_id=theater.id,
+        screen_id=ObjectId(),
+        start_time=start,
+        end_time=start + timedelta(hours=3),
+        base_price=200,
+    )
+    return movie, theater, showtime
+
+
+def _listed(index, showtime):
+    day = local_date(showtime.start_time)
+    return json.loads(index.search("Pune", day))["movies"]
+
+
+def test_updates_made_during_a_rebuild_survive_the_swap(engine):
+    movie, theater, showtime = _catalog()
+    index = ScheduleIndex()
+    load = index._load
+
+    async def load_then_write():
+        fresh = await load()
+        # Scheduled after the rebuild read the showtimes
+        index.upsert_showtime(showtime)
+        return fresh
+
+    index._load = load_then_write
+
+    async def main():
+        await engine.save_all([movie, theater])
+        await index.rebuild()
+
+    asyncio.run(main())
+    [listed] = _listed(index, showtime)
+    assert listed["theaters"][0]["showtimes"][0]["showtime_id"] == str(showtime.id)
+
+
+def test_change_stream_opens_first_restarts_and_applies_deletes(engine, monkeypatch):
+    movie, theater, showtime = _catalog()
+    monkeypatch.setattr(schedule_index_module, "SCHEDULE_STREAM_RETRY_SECONDS", 0)
+    index = ScheduleIndex()
+    events = []
+    load = index._load
+
+    async def record_load():
+        events.append("rebuild")
+        return await load()
+
+    index._load = record_load
+
+    class Stream:
+        def __init__(self, changes, resume_after):
+            self.changes = changes
+            self.resume_token = {"_data": str(len(events))}
+            events.append(("watch", resume_after))
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if self.changes is None:
+                await connection_lost.wait()
+                raise AutoReconnect("connection reset")
+            if self.changes:
+                return self.changes.pop(0)
+            await asyncio.Event().wait()
+
+    connection_lost = asyncio.Event()
+    streams = [
+        None,
+        [
+            {
+                "ns": {"coll": Movie.__collection__},
+                "documentKey": {"_id": movie.id},
+            }
+        ],
+    ]
+
+    def watch(pipeline, full_document=None, resume_after=None):
+        return Stream(streams.pop(0), resume_after)
+
+    monkeypatch.setattr(engine.database, "watch", watch)
+
+    async def main():
+        await engine.save_all([movie, theater, showtime])
+        await index.start()
+        assert _listed(index, showtime)
+        connection_lost.set()
+        for _ in range(100):
+            if not streams and not _listed(index, showtime):
+                break
+            await asyncio.sleep(0)
+        await index.stop()
+
+    asyncio.run(main())
+    assert events[:2] == [("watch", None), "rebuild"]
+    # Reopened from where the failed stream stopped
+    assert events[2] == ("watch", {"_data": "0"})
+    assert _listed(index, showtime) == []
@@ -0,0 +1,10 @@
+from core.services.seat_allocator import allocate
+from core.services.seat_inventory import SeatMap, ShowtimeInventory
+
+
+def test_seat_type_matches_the_layout_in_any_case():
+    seat_map = SeatMap(2, 4, {"B2": "PREMIUM", "B3": "PREMIUM"})
+    inventory = ShowtimeInventory("showtime", seat_map)
+
+    assert allocate(inventory, 2, "premium") == [["B2", "B3"]]
+    assert allocate(inventory, 2, "Premium") == [["B2", "B3"]]
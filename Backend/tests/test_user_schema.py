@@ -0,0 +1,14 @@
+import pytest
+from pydantic import ValidationError
+
+from core.apis.schemas.requests.user_schema import UserUpdate
+
+
+def test_update_rejects_non_digit_mobile_number():
+    with pytest.raises(ValidationError):
+        UserUpdate(mobile_number="abcdefghijk")
+
+
+def test_update_accepts_formatted_or_missing_mobile_number():
+    assert UserUpdate(mobile_number="+91 98765-43210").mobile_number
+    assert UserUpdate(first_name="Asha").mobile_number is None